@@ -30,4 +30,7 @@ from ._solvers import *
 from ._discrete_funcs import *
 from ._frequency_domain import *
 from ._system_props import *
+from ._state_array import *
+from ._parametric_state import *
+from ._model_storage import *
 from ._kalman_ops import *
@@ -22,6 +22,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 import numpy as np
+from scipy.linalg import qr, norm
 
 __all__ = ['haroldsvd', 'haroldker', 'pair_complex_numbers',
            'e_i', 'matrix_slice']
@@ -445,3 +446,121 @@ def matrix_slice(M, corner_shape, corner='nw'):
         p, m = x - z, y - w
 
     return M[:p, :m], M[:p, m:], M[p:, :m], M[p:, m:]
+
+
+def _block_arnoldi(A, B, tol=None, complete=False):
+    """
+    Computes an orthonormal basis of the Krylov subspace
+
+    .. math::
+
+        \\mathcal{K}(A, B) = \\operatorname{span}\\{B, AB, A^2B, \\ldots\\}
+
+    via the block Arnoldi iteration. Each new block is orthogonalized twice
+    against the current basis and its rank is revealed via the column
+    pivoted QR decomposition. The directions that are numerically already in
+    the basis, i.e., with pivots that are small compared to the largest
+    Krylov vector norm seen so far or the norm of ``A``, are deflated and the iteration stops as
+    soon as no new directions are found. Hence, the matrix powers are never formed and the
+    cost is :math:`O(n^2 r)` with :math:`r` being the dimension of the
+    subspace.
+
+    Parameters
+    ----------
+    A : (n, n) array_like
+        Square matrix
+    B : (n, m) array_like
+        The starting block
+    tol : float, optional
+        The relative threshold for the pivots. A new direction is accepted
+        if its pivot is larger than ``tol`` times the largest column norm of
+        the blocks, before the orthogonalization, generated so far. For
+        the blocks after the first one, the 1-norm of ``A`` is also taken
+        into account. If omitted, ``max(n, m) * eps * 100`` is used.
+    complete : bool, optional
+        If True, the basis is completed to an orthogonal matrix and only
+        this matrix and the dimension of the subspace are returned.
+
+    Returns
+    -------
+    Q : (n, r) ndarray
+        The orthonormal basis of the Krylov subspace. If ``complete`` is
+        True, it is the (n, n) orthogonal matrix whose leading r columns
+        span the Krylov subspace.
+    H : (r, r) ndarray
+        The block upper Hessenberg matrix :math:`Q^T A Q`. Returned only if
+        ``complete`` is False.
+    blocks : list
+        The sizes of each block. The first entry is the rank of ``B``.
+        Returned only if ``complete`` is False.
+    r : int
+        The dimension of the Krylov subspace. Returned only if ``complete``
+        is True.
+
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    B = np.asarray(B, dtype=float)
+    B = B.reshape(-1, 1) if B.ndim == 1 else B
+    n, m = B.shape
+    if tol is None:
+        tol = max(n, m) * np.spacing(1.) * 100
+
+    Q = np.zeros((n, n))
+    blocks = []
+    r = 0
+    V = B.copy()
+    v_norm = 0.
+    while r < n:
+        # Running scale; otherwise the noise in a tiny block passes as new.
+        # After the first block, A can not be resolved better than its norm.
+        v_norm = max(v_norm, norm(V, axis=0).max(),
+                     norm(A, 1) if r > 0 else 0.)
+        for _ in range(2):
+            V -= Q[:, :r] @ (Q[:, :r].T @ V)
+        q, R, _ = qr(V, mode='economic', pivoting=True)
+        rank = min(np.count_nonzero(np.abs(np.diag(R)) > tol*v_norm), n - r)
+        if rank == 0:
+            break
+        Q[:, r:r+rank] = q[:, :rank]
+        blocks += [rank]
+        r += rank
+        V = A @ q[:, :rank]
+
+    if complete:
+        if 0 < r < n:
+            Q[:, r:] = qr(Q[:, :r])[0][:, r:]
+        elif r == 0:
+            Q = np.eye(n)
+        return Q, r
+
+    Q = Q[:, :r]
+    H = Q.T @ A @ Q
+    # Clean the numerical noise below the block subdiagonal
+    if blocks:
+        offsets = np.cumsum([0] + blocks)
+        for ind in range(len(blocks)-2):
+            H[offsets[ind+2]:, offsets[ind]:offsets[ind+1]] = 0.
+
+    return Q, H, blocks
+
+
+def _hessenberg_charpoly(H):
+    """
+    Computes the characteristic polynomial coefficients of an upper
+    Hessenberg matrix via La Budde's recursion over the leading principal
+    submatrices, i.e., without computing the eigenvalues. The coefficients
+    are returned in decreasing powers with the leading coefficient one.
+    """
+    H = np.atleast_2d(np.asarray(H, dtype=float))
+    n = H.shape[0]
+    # Row k holds the charpoly of the leading k x k block right aligned
+    P = np.zeros((n+1, n+1))
+    P[0, -1] = 1.
+    sub = np.diag(H, -1)
+    for i in range(n):
+        P[i+1, :-1] = P[i, 1:]
+        P[i+1] -= H[i, i]*P[i]
+        if i > 0:
+            w = H[i-1::-1, i] * np.cumprod(sub[i-1::-1])
+            P[i+1] -= w @ P[i-1::-1]
+    return P[n]
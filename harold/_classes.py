@@ -24,21 +24,34 @@ THE SOFTWARE.
 
 import numpy as np
 
-from scipy.linalg import eigvals, block_diag, qz, norm, qr
+from scipy.linalg import (eigvals, eig, solve, block_diag, qz, norm, qr,
+                          schur, hessenberg)
 from scipy.linalg.lapack import dgebal
+from scipy.sparse import bmat, diags, issparse
+from scipy.sparse.linalg import splu, eigs, LinearOperator
 from tabulate import tabulate
 from itertools import zip_longest, chain
 
 from ._polynomial_ops import (haroldpoly, haroldpolyadd, haroldpolydiv,
                               haroldpolymul, haroldcompanion,
-                              haroldtrimleftzeros, haroldlcm)
+                              haroldtrimleftzeros, haroldlcm,
+                              _pad_polynomial_matrix,
+                              _unpad_polynomial_matrix,
+                              _polynomial_matrix_convolve)
 
 from ._aux_linalg import e_i, haroldsvd
 from ._global_constants import _KnownDiscretizationMethods
-from copy import deepcopy
+from copy import copy
+from collections import OrderedDict
+import hashlib
 
-__all__ = ['Transfer', 'State', 'state_to_transfer', 'transfer_to_state',
-           'transmission_zeros']
+__all__ = ['Transfer', 'State', 'DescriptorState', 'state_to_transfer',
+           'transfer_to_state', 'transmission_zeros',
+           'transmission_zeros_batch', 'set_conversion_cache_size']
+
+# The global LRU cache of the model conversions keyed by the model contents
+_conversion_cache = OrderedDict()
+_conversion_cache_size = 0
 
 
 class Transfer:
@@ -131,10 +144,48 @@ class Transfer:
         method if applicable) because a model without a sampling period
         doesn't make sense for analysis. If you don't care, then make up
         a number, say, a million, since you don't care.
+
+    The coefficient arrays are read-only and shared with the models derived
+    from this one, e.g., ``-G`` reuses the denominators. Setting the ``num``
+    or ``den`` properties replaces the arrays instead of modifying them.
     """
+    # Model banks can be huge hence no per-instance __dict__
+    __slots__ = ('_isgain', '_isSISO', '_isstable', '_DiscretizedWith',
+                 '_DiscretizationMatrix', '_PrewarpFrequency',
+                 '_SamplingPeriod', '_SamplingSet', '_num', '_den', '_shape',
+                 '_p', '_m', '_padded', '_converted',
+                 '_repr_type', 'poles', '_zeros')
 
     def __init__(self, num, den=None, dt=False):
+        num, den, shape, isgain = self.validate_arguments(num, den)
+        # The arrays of the caller might have been passed through
+        self._setup(*_readonly(num, den, copy=True), shape, isgain, dt)
 
+    @classmethod
+    def _from_validated(cls, num, den, shape=None, isgain=None, dt=False):
+        """
+        Internal constructor that skips ``validate_arguments``. The data
+        should already be regularized, i.e., 2D float arrays for SISO and
+        list of lists of 2D float arrays for MIMO models with no noncausal
+        entries. If not given, the shape and the static gain flag are read
+        off from the data.
+        """
+        if shape is None:
+            shape = ((len(num), len(num[0])) if isinstance(num, list)
+                     else (1, 1))
+        if isgain is None:
+            if isinstance(den, list):
+                isgain = max([x.size for x in sum(den, [])]) == 1
+            else:
+                isgain = den.size == 1
+        G = cls.__new__(cls)
+        G._setup(num, den, shape, isgain, dt)
+        return G
+
+    def _setup(self, num, den, shape, isgain, dt):
+        """
+        Sets up the instance from the regularized data.
+        """
         # Initialization Switch and Variable Defaults
 
         self._isgain = False
@@ -144,8 +195,8 @@ class Transfer:
         self._DiscretizationMatrix = None
         self._PrewarpFrequency = 0.
         self._SamplingPeriod = False
-        (self._num, self._den,
-         self._shape, self._isgain) = self.validate_arguments(num, den)
+        self._num, self._den = _readonly(num), _readonly(den)
+        self._shape, self._isgain = shape, isgain
         self._p, self._m = self._shape
         if self._shape == (1, 1):
             self._isSISO = True
@@ -335,11 +386,14 @@ class Transfer:
         else:
             self._SamplingSet = 'R'
             self._SamplingPeriod = None
+        # The converted model carries the sampling period
+        self._converted = None
 
     @num.setter
     def num(self, value):
 
-        user_num, _, user_shape = validate_arguments(value, self._den)[:3]
+        user_num, _, user_shape = self.validate_arguments(value,
+                                                          self._den)[:3]
 
         if not user_shape == self._shape:
             raise IndexError('Once created, the shape of the transfer '
@@ -348,13 +402,13 @@ class Transfer:
                              'the system has {2}x{3}.'
                              ''.format(*user_shape+self._shape))
         else:
-            self._num = user_num
+            self._num = _readonly(user_num, copy=True)
             self._recalc()
 
     @den.setter
     def den(self, value):
 
-        user_den, user_shape = validate_arguments(self._num, value)[1:3]
+        user_den, user_shape = self.validate_arguments(self._num, value)[1:3]
 
         if not user_shape == self._shape:
             raise IndexError('Once created, the shape of the transfer '
@@ -363,7 +417,7 @@ class Transfer:
                              'the system has {2}x{3}.'
                              ''.format(*user_shape+self._shape))
         else:
-            self._den = user_den
+            self._den = _readonly(user_den, copy=True)
             self._recalc()
 
     @DiscretizedWith.setter
@@ -417,26 +471,43 @@ class Transfer:
         """
         Internal bookkeeping routine to readjust the class properties
         """
+        # Invalidate the padded coefficient arrays and the conversion
+        self._padded = None
+        self._converted = None
+
+        # The zeros are computed when they are asked for
+        self._zeros = None
+
         if self._isgain:
             self.poles = np.array([])
-            self.zeros = np.array([])
+            self._zeros = np.array([])
         else:
             if self._isSISO:
                 self.poles = eigvals(haroldcompanion(self._den))
-                if self._num.size == 1:
-                    self.zeros = np.array([])
-                else:
-                    self.zeros = eigvals(haroldcompanion(self._num))
             else:
-                # Create a dummy statespace and check the zeros there
-                zzz = transfer_to_state(self._num, self._den,
-                                        output='matrices')
-                self.zeros = transmission_zeros(*zzz)
-                self.poles = eigvals(zzz[0])
+                # The state realization is kept as the conversion result
+                # and also used for the zeros
+                self.poles = transfer_to_state(self).poles
 
         self._set_stability()
         self._set_representation()
 
+    @property
+    def zeros(self):
+        """
+        The transmission zeros of the model. They are computed at the first
+        access and kept until the model data is modified.
+        """
+        if self._zeros is None:
+            if self._isSISO:
+                if self._num.size == 1:
+                    self._zeros = np.array([])
+                else:
+                    self._zeros = eigvals(haroldcompanion(self._num))
+            else:
+                self._zeros = transfer_to_state(self).zeros
+        return self._zeros
+
     def _set_stability(self):
         if self._SamplingSet == 'Z':
             self._isstable = all(1 > abs(self.poles))
@@ -446,20 +517,35 @@ class Transfer:
     def _set_representation(self):
         self._repr_type = 'Transfer'
 
+    @property
+    def _polymatrix(self):
+        """
+        Returns the numerator and the denominator entries as zero padded
+        ``(p, m, deg+1)`` arrays such that the MIMO operations can be
+        performed without looping over the entries. See
+        ``_pad_polynomial_matrix`` for the layout. Computed once per data.
+        """
+        if self._padded is None:
+            if self._isSISO:
+                num, den = [[self._num]], [[self._den]]
+            else:
+                num, den = self._num, self._den
+            self._padded = (_pad_polynomial_matrix(num)[0],
+                            _pad_polynomial_matrix(den)[0])
+        return self._padded
+
     # =================================
     # Transfer class arithmetic methods
     # =================================
 
     def __neg__(self):
         if not self._isSISO:
-            newnum = [[None]*self._m for n in range(self._p)]
-            for i in range(self._p):
-                for j in range(self._m):
-                    newnum[i][j] = -self._num[i][j]
+            newnum = _unpad_polynomial_matrix(-self._polymatrix[0])
         else:
             newnum = -1*self._num
 
-        return Transfer(newnum, self._den, self._SamplingPeriod)
+        return Transfer._from_validated(newnum, self._den, self._shape,
+                                        self._isgain, self._SamplingPeriod)
 
     def __add__(self, other):
         # Addition to a Transfer object is possible via four types
@@ -513,11 +599,20 @@ class Transfer:
                         np.convolve(self._num.flatten(), mults[0]),
                         np.convolve(other.num.flatten(), mults[1]))
                     if np.count_nonzero(newnum) == 0:
-                        return Transfer(0, 1)
+                        return Transfer(0, 1, dt=self._SamplingPeriod)
                     else:
-                        return Transfer(newnum, lcm)
+                        return Transfer._from_validated(
+                            np.atleast_2d(newnum), np.atleast_2d(lcm),
+                            dt=self._SamplingPeriod)
 
                 else:
+                    # If the denominators match entrywise or both systems
+                    # have common denominators, then the padded arrays are
+                    # used and the entry loops are skipped.
+                    padded_sum = self._add_padded(other)
+                    if padded_sum is not None:
+                        return padded_sum
+
                     # Create empty num and den holders.
                     newnum = [[None]*self._m for n in range(self._p)]
                     newden = [[None]*self._m for n in range(self._p)]
@@ -543,7 +638,7 @@ class Transfer:
                                     )
                                 )
 
-                            newden[row][col] = lcm
+                            newden[row][col] = np.atleast_2d(lcm)
 
                         # Test whether we have at least one numerator entry
                         # that is nonzero. Otherwise return a zero MIMO tf
@@ -551,11 +646,13 @@ class Transfer:
                                 nonzero_num[row, col] = True
 
                     if any(nonzero_num.ravel()):
-                        return Transfer(newnum, newden,
-                                        dt=self._SamplingPeriod)
+                        return Transfer._from_validated(
+                            newnum, newden, self._shape,
+                            dt=self._SamplingPeriod)
                     else:
                         # Numerators all cancelled to zero hence 0-gain MIMO
-                        return Transfer(np.zeros(self._shape).tolist())
+                        return Transfer(np.zeros(self._shape).tolist(),
+                                        dt=self._SamplingPeriod)
             else:
                 return other + transfer_to_state(self)
 
@@ -587,6 +684,45 @@ class Transfer:
 
     def __rsub__(self, other): return -self + other
 
+    def _add_padded(self, other):
+        """
+        Adds two MIMO Transfer() objects of the same shape via their padded
+        coefficient arrays. If the denominators are identical entrywise, the
+        numerators are simply added. If both systems have a single common
+        denominator, the numerators are brought to the LCM of the two
+        denominators. Otherwise, returns None and the entries are handled
+        individually.
+        """
+        (n1, d1), (n2, d2) = self._polymatrix, other._polymatrix
+        k = max(d1.shape[-1], d2.shape[-1])
+        d1 = np.pad(d1, ((0, 0), (0, 0), (k-d1.shape[-1], 0)), 'constant')
+        d2 = np.pad(d2, ((0, 0), (0, 0), (k-d2.shape[-1], 0)), 'constant')
+
+        if np.array_equal(d1, d2):
+            den = d1
+        elif (np.all(d1 == d1[:1, :1]) and np.all(d2 == d2[:1, :1])):
+            lcm, mults = haroldlcm(haroldtrimleftzeros(d1[0, 0]),
+                                   haroldtrimleftzeros(d2[0, 0]))
+            n1 = _polynomial_matrix_convolve(n1, np.ravel(mults[0]))
+            n2 = _polynomial_matrix_convolve(n2, np.ravel(mults[1]))
+            den = np.broadcast_to(np.ravel(lcm), d1.shape[:2] +
+                                  (np.size(lcm),))
+        else:
+            return None
+
+        k = max(n1.shape[-1], n2.shape[-1])
+        num = (np.pad(n1, ((0, 0), (0, 0), (k-n1.shape[-1], 0)), 'constant') +
+               np.pad(n2, ((0, 0), (0, 0), (k-n2.shape[-1], 0)), 'constant'))
+
+        if not np.any(num):
+            # Numerators all cancelled to zero hence 0-gain MIMO
+            return Transfer(np.zeros(self._shape).tolist(),
+                            dt=self._SamplingPeriod)
+
+        return Transfer._from_validated(_unpad_polynomial_matrix(num),
+                                        _unpad_polynomial_matrix(den),
+                                        self._shape, dt=self._SamplingPeriod)
+
     def __mul__(self, other):
         # Multiplication with a Transfer object is possible via four types
         # 1. Another shape matching State()
@@ -627,77 +763,15 @@ class Transfer:
                         return State(self.num.dot(other.num),
                                      dt=self._SamplingPeriod)
 
-                if self._isSISO:
-                    return Transfer(
-                            haroldpolymul(self._num.flatten(),
-                                          other.num.flatten()),
-                            haroldpolymul(self._den.flatten(),
-                                          other.den.flatten()),
-                            dt=self._SamplingPeriod)
+                if self._isSISO and other._isSISO:
+                    return Transfer._from_validated(
+                            np.atleast_2d(haroldpolymul(self._num.flatten(),
+                                                        other.num.flatten())),
+                            np.atleast_2d(haroldpolymul(self._den.flatten(),
+                                                        other.den.flatten())),
+                            (1, 1), dt=self._SamplingPeriod)
                 else:
-                    # Bah.. Here we go!
-                    # Same as SISO but over all rows/cols:
-                    # Also if the result would be a SISO extra steps
-                    # such as stripping off the list of lists
-
-                    # So we have a (p x k) and (k x m) shapes hence
-                    # the temporary size variables
-                    t_p = self._p
-                    t_k = self._m
-                    t_m = other.shape[1]
-
-                    newnum = [[None]*t_m for n in range(t_p)]
-                    newden = [[None]*t_m for n in range(t_p)]
-
-                    # Here we have again a looping fun:
-                    # What we do is to rely on the Transfer()
-                    # __add__ method for the SISO case recursively.
-
-                    # Suppose we have a multiplication of a 1x5 Transfer
-                    # multiplied with a 5x1 Transfer
-
-                    #                [1]
-                    #  [a b c d e] * [2]
-                    #                [3]
-                    #                [4]
-                    #                [5]
-
-                    # What we do here is to form each a1,b2,...e5
-                    # and convert each of them to a temporary Transfer
-                    # object and then add --> a1 + b2 + c3 + d4 + e5
-                    # such that possible common poles don't get spurious
-                    # multiplicities.
-
-                    # Recursion part is the fact that we are already
-                    # inside a Transfer() method but forming temporary
-                    # Transfer()objects within. Fingers crossed...
-
-                    for row in range(t_p):
-                        for col in range(t_m):
-                            # Zero out the temporary Transfer()
-                            t_G = Transfer(0, 1)
-
-                            # for all elements in row/col multiplication
-                            for elem in range(t_k):
-
-                                t_num = haroldpolymul(self._num[row][elem],
-                                                      other.num[elem][col])
-
-                                t_den = haroldpolymul(self._den[row][elem],
-                                                      other.den[elem][col])
-
-                                t_G += Transfer(t_num, t_den)
-                            # Add the resulting arrays to the containers.
-                            newnum[row][col] = t_G.num
-                            newden[row][col] = t_G.den
-
-                    # If the resulting shape is SISO, strip off the lists
-                    if (t_p, t_m) == (1, 1):
-                        newnum = newnum[0][0]
-                        newden = newden[0][0]
-
-                    # Finally return the result.
-                    return Transfer(newnum, newden, dt=self._SamplingPeriod)
+                    return self._mul_padded(other)
 
             elif isinstance(other, State):
                 return transfer_to_state(self) * other
@@ -725,6 +799,68 @@ class Transfer:
                             '{0} with a state representation '
                             '(yet).'.format(type(other).__name__))
 
+    def _mul_padded(self, other):
+        """
+        Multiplies two Transfer() objects of which at least one is MIMO.
+
+        All entrywise products of the (p x k) and (k x m) entries are formed
+        at once on the padded coefficient arrays. Then for every (row, col)
+        entry, the k many terms are grouped by their denominators; the terms
+        with identical denominators are summed directly and only the distinct
+        denominators are brought to their LCM. The terms with zero numerators
+        are skipped such that no spurious poles are introduced.
+        """
+        (n1, d1), (n2, d2) = self._polymatrix, other._polymatrix
+        t_p, t_m = self._p, other.shape[1]
+        # (p, k, m, deg+1) arrays of the individual terms
+        t_num = _polynomial_matrix_convolve(n1[:, :, None, :],
+                                            n2[None, :, :, :])
+        t_den = _polynomial_matrix_convolve(d1[:, :, None, :],
+                                            d2[None, :, :, :])
+        nonzero = np.any(t_num, axis=-1)
+
+        newnum = [[None]*t_m for n in range(t_p)]
+        newden = [[None]*t_m for n in range(t_p)]
+
+        for row in range(t_p):
+            for col in range(t_m):
+                # Group the terms with the same denominator
+                groups = {}
+                for elem in np.flatnonzero(nonzero[row, :, col]):
+                    den = haroldtrimleftzeros(t_den[row, elem, col])
+                    # Normalize such that the LCM multipliers are consistent
+                    num = t_num[row, elem, col] / den[0]
+                    den = den / den[0]
+                    key = den.tobytes()
+                    if key in groups:
+                        groups[key][0] = haroldpolyadd(groups[key][0], num)
+                    else:
+                        groups[key] = [num, den]
+
+                if not groups:
+                    newnum[row][col], newden[row][col] = np.array([[0.]]), \
+                                                         np.array([[1.]])
+                    continue
+
+                nums, dens = zip(*groups.values())
+                if len(dens) == 1:
+                    num, den = nums[0], dens[0]
+                else:
+                    den, mults = haroldlcm(*dens)
+                    num = haroldpolyadd(*[haroldpolymul(x, y)
+                                          for x, y in zip(nums, mults)])
+
+                newnum[row][col] = np.atleast_2d(haroldtrimleftzeros(num))
+                newden[row][col] = np.atleast_2d(den)
+
+        # If the resulting shape is SISO, strip off the lists
+        if (t_p, t_m) == (1, 1):
+            newnum = newnum[0][0]
+            newden = newden[0][0]
+
+        return Transfer._from_validated(newnum, newden, (t_p, t_m),
+                                        dt=self._SamplingPeriod)
+
     def __rmul__(self, other):
         # Notice that if other is a State or Transfer, it will be handled
         # by other's __mul__() method. Hence we only take care of the
@@ -754,12 +890,26 @@ class Transfer:
 
     # ================================================================
     # __getitem__ to provide input-output selection of a tf
-    #
-    # TODO: How to validate strides
     # ================================================================
 
-#    def __getitem__(self,num_or_slice):
-#        print('Lalala I"m not listening lalala')
+    def __getitem__(self, num_or_slice):
+        """
+        Selects the subsystem from the given outputs and inputs via
+        ``G[rows, cols]``. Integers, slices, lists and boolean masks are
+        accepted. The coefficient arrays are shared with this model.
+        """
+        rows, cols = _io_index(num_or_slice, self._shape)
+        rows, cols = np.arange(self._p)[rows], np.arange(self._m)[cols]
+        if self._isSISO:
+            num, den = self._num, self._den
+        else:
+            num = [[self._num[r][c] for c in cols] for r in rows]
+            den = [[self._den[r][c] for c in cols] for r in rows]
+            if (len(rows), len(cols)) == (1, 1):
+                num, den = num[0][0], den[0][0]
+
+        return Transfer._from_validated(num, den, (len(rows), len(cols)),
+                                        dt=self._SamplingPeriod)
 
     def __setitem__(self, *args):
         raise ValueError('To change the data of a subsystem, set directly\n'
@@ -1371,10 +1521,55 @@ class State:
     method if applicable) because a model without a sampling period
     doesn't make sense for analysis. If you don't care, then make up
     a number, say, a million, since you don't care.
+
+    The system matrices are read-only and shared with the models derived
+    from this one, e.g., ``-G`` reuses A and B. Setting the matrix
+    properties replaces the arrays instead of modifying them.
+
+    The factorizations of the A matrix (real Schur, Hessenberg and the
+    eigendecomposition) are computed once when needed and kept on the model
+    for the other analysis functions. They are shared with the derived
+    models that keep the same A matrix and discarded if A is set.
     """
+    # Model banks can be huge hence no per-instance __dict__
+    __slots__ = ('_SamplingPeriod', '_SamplingSet', '_DiscretizedWith',
+                 '_DiscretizationMatrix', '_PrewarpFrequency', '_isSISO',
+                 '_isgain', '_isstable', '_a', '_b', '_c', '_d', '_shape',
+                 '_p', '_m', '_converted', '_factors', '_repr_type', 'poles',
+                 '_zeros')
 
     def __init__(self, a, b=None, c=None, d=None, dt=False):
-
+        self._factors = {}
+        *abcd, shape, isgain = self.validate_arguments(a, b, c, d)
+        # The arrays of the caller might have been passed through
+        self._setup(*_readonly(*abcd, copy=True), shape, isgain, dt)
+
+    @classmethod
+    def _from_validated(cls, a, b, c, d, shape=None, isgain=None, dt=False,
+                        factors=None):
+        """
+        Internal constructor that skips ``validate_arguments``. The system
+        matrices should already be compatible 2D float arrays. For static
+        gains, ``a, b, c`` can be given as None. If not given, the shape and
+        the static gain flag are read off from the data. If the A matrix is
+        taken from another model, its ``_factors`` can be passed to share
+        the factorizations.
+        """
+        if a is None:
+            a, b, c = np.array([]), np.array([]), np.array([])
+        if shape is None:
+            shape = d.shape
+        if isgain is None:
+            isgain = a.size == 0
+        G = cls.__new__(cls)
+        G._factors = {} if factors is None else factors
+        G._setup(a, b, c, d, shape, isgain, dt)
+        return G
+
+    def _setup(self, a, b, c, d, shape, isgain, dt):
+        """
+        Sets up the instance from the regularized data.
+        """
         self._SamplingPeriod = False
         self._DiscretizedWith = None
         self._DiscretizationMatrix = None
@@ -1383,9 +1578,8 @@ class State:
         self._isgain = False
         self._isstable = False
 
-        *abcd, self._shape, self._isgain = self.validate_arguments(a, b, c, d)
-
-        self._a, self._b, self._c, self._d = abcd
+        self._a, self._b, self._c, self._d = _readonly(a, b, c, d)
+        self._shape, self._isgain = shape, isgain
         self._p, self._m = self._shape
 
         if self._shape == (1, 1):
@@ -1594,7 +1788,8 @@ class State:
             np.zeros_like(self._c),
             np.zeros_like(self._d)
             )[0]
-        self._a = value
+        self._a = _readonly(value, copy=True)
+        self._factors = {}
         self._recalc()
 
     @b.setter
@@ -1605,7 +1800,7 @@ class State:
             np.zeros_like(self._c),
             np.zeros_like(self._d)
             )[1]
-        self._b = value
+        self._b = _readonly(value, copy=True)
         self._recalc()
 
     @c.setter
@@ -1616,7 +1811,7 @@ class State:
             value,
             np.zeros_like(self._d)
             )[2]
-        self._c = value
+        self._c = _readonly(value, copy=True)
         self._recalc()
 
     @d.setter
@@ -1627,7 +1822,7 @@ class State:
             np.zeros_like(self._c),
             value
             )[3]
-        self._d = value
+        self._d = _readonly(value, copy=True)
         self._recalc()
 
     @SamplingPeriod.setter
@@ -1645,6 +1840,8 @@ class State:
         else:
             self._SamplingSet = 'R'
             self._SamplingPeriod = None
+        # The converted model carries the sampling period
+        self._converted = None
 
     @DiscretizedWith.setter
     def DiscretizedWith(self, value):
@@ -1695,16 +1892,69 @@ class State:
                 self._PrewarpFrequency = value
 
     def _recalc(self):
+        self._converted = None
+        # The zeros are computed when they are asked for
+        self._zeros = None
         if self._isgain:
             self.poles = []
-            self.zeros = []
+            self._zeros = []
         else:
-            self.zeros = transmission_zeros(self._a, self._b, self._c, self._d)
-            self.poles = eigvals(self._a)
+            self.poles = self._factorization('eigvals')
 
         self._set_stability()
         self._set_representation()
 
+    @property
+    def zeros(self):
+        """
+        The transmission zeros of the model. They are computed at the first
+        access and kept until the model data is modified.
+        """
+        if self._zeros is None:
+            self._zeros = transmission_zeros(self._a, self._b, self._c,
+                                             self._d)
+        return self._zeros
+
+    def _factorization(self, kind):
+        """
+        Returns the requested factorization of the A matrix and keeps it for
+        the subsequent calls. The results are read-only arrays.
+
+        Parameters
+        ----------
+        kind : str
+            One of the following
+
+            - ``'eigvals'`` : The eigenvalues of A
+            - ``'eig'`` : The eigenvalues and the eigenvectors ``w, V``
+            - ``'schur'`` : The real Schur form ``T, Z`` with ``A = Z T Z^T``
+            - ``'hessenberg'`` : The Hessenberg form ``H, Q`` with
+              ``A = Q H Q^T``
+
+        """
+        f = self._factors
+        if kind not in f:
+            a = self._a
+            if kind == 'eigvals':
+                # Reuse the more expensive ones if they are around
+                if 'eig' in f:
+                    f[kind] = f['eig'][0]
+                elif 'schur' in f:
+                    f[kind] = _readonly(_real_schur_eigvals(f['schur'][0]))
+                else:
+                    f[kind] = _readonly(eigvals(a))
+            elif kind == 'eig':
+                f[kind] = _readonly(*eig(a))
+            elif kind == 'schur':
+                f[kind] = _readonly(*schur(a, output='real'))
+            elif kind == 'hessenberg':
+                f[kind] = _readonly(*hessenberg(a, calc_q=True))
+            else:
+                raise ValueError('I don\'t know the factorization "{}". It '
+                                 'should be one of "eigvals", "eig", "schur",'
+                                 ' "hessenberg".'.format(kind))
+        return f[kind]
+
     def _set_stability(self):
         if self._SamplingSet == 'Z':
             self._isstable = all(1 > np.abs(self.poles))
@@ -1720,10 +1970,13 @@ class State:
 
     def __neg__(self):
         if self._isgain:
-            return State(-self._d, dt=self._SamplingPeriod)
+            return State._from_validated(None, None, None, -self._d,
+                                         dt=self._SamplingPeriod)
         else:
             newC = -1. * self._c
-            return State(self._a, self._b, newC, self._d, self._SamplingPeriod)
+            return State._from_validated(self._a, self._b, newC, self._d,
+                                         self._shape, False,
+                                         self._SamplingPeriod, self._factors)
 
     def __add__(self, other):
         # Addition to a State object is possible via four types
@@ -1768,15 +2021,16 @@ class State:
                 # First get the static gain case out of the way.
                 if self._isgain:
                     if other._isgain:
-                        return State(self.d + other.d,
-                                     dt=self._SamplingPeriod)
+                        return State._from_validated(None, None, None,
+                                                     self.d + other.d,
+                                                     dt=self._SamplingPeriod)
                     else:
-                        return State(other.a,
-                                     other.b,
-                                     other.c,
-                                     self.d + other.d,
-                                     dt=self._SamplingPeriod
-                                     )
+                        return State._from_validated(other.a,
+                                                     other.b,
+                                                     other.c,
+                                                     self.d + other.d,
+                                                     dt=self._SamplingPeriod
+                                                     )
                 else:
                     if other._isgain:  # And self is not? Swap, come again
                         return other + self
@@ -1788,7 +2042,9 @@ class State:
                 addb = np.vstack((self._b, other.b))
                 addc = np.hstack((self._c, other.c))
                 addd = self._d + other.d
-                return State(adda, addb, addc, addd)
+                return State._from_validated(adda, addb, addc, addd,
+                                             self._shape, False,
+                                             dt=self._SamplingPeriod)
 
             else:
                 return self + transfer_to_state(other)
@@ -1804,11 +2060,11 @@ class State:
                 return self + float(other)
 
             if self._shape == other.shape:
-                return State(self._a,
-                             self._b,
-                             self._c,
-                             self._d + other,
-                             dt=self._SamplingPeriod)
+                return State._from_validated(self._a,
+                                             self._b,
+                                             self._c,
+                                             self._d + other,
+                                             dt=self._SamplingPeriod)
             else:
                 raise IndexError('Addition of systems requires their '
                                  'shape to match but the system shapes '
@@ -1862,23 +2118,24 @@ class State:
                 # First get the static gain case out of the way.
                 if self._isgain:
                     if other._isgain:
-                        return State(self.d.dot(other.d),
-                                     dt=self._SamplingPeriod)
+                        return State._from_validated(None, None, None,
+                                                     self.d.dot(other.d),
+                                                     dt=self._SamplingPeriod)
                     else:
-                        return State(other.a,
-                                     other.b,
-                                     self.d.dot(other.c),
-                                     self.d.dot(other.d),
-                                     dt=self._SamplingPeriod
-                                     )
+                        return State._from_validated(other.a,
+                                                     other.b,
+                                                     self.d.dot(other.c),
+                                                     self.d.dot(other.d),
+                                                     dt=self._SamplingPeriod
+                                                     )
                 else:
                     if other._isgain:  # And self is not? Swap, come again
-                        return State(self.a,
-                                     self.b.dot(other.d),
-                                     self.c,
-                                     self.d.dot(other.d),
-                                     dt=self._SamplingPeriod
-                                     )
+                        return State._from_validated(self.a,
+                                                     self.b.dot(other.d),
+                                                     self.c,
+                                                     self.d.dot(other.d),
+                                                     dt=self._SamplingPeriod
+                                                     )
 
                 # Now, we are sure that there are no empty arrays in the
                 # system matrices hence concatenation should be OK.
@@ -1889,8 +2146,8 @@ class State:
                 multb = np.vstack((self._b.dot(other.d), other.b))
                 multc = np.hstack((self._c, self._d.dot(other.c)))
                 multd = self._d.dot(other.d)
-                return State(multa, multb, multc, multd,
-                             dt=self._SamplingPeriod)
+                return State._from_validated(multa, multb, multc, multd,
+                                             dt=self._SamplingPeriod)
 
         elif isinstance(other, Transfer):
                 return self * transfer_to_state(other)
@@ -1922,14 +2179,16 @@ class State:
         # rejection is executed
         if isinstance(other, (int, float)):
             if self._isgain:
-                return State(self.d * other, dt=self._SamplingPeriod)
+                return State._from_validated(None, None, None,
+                                             self.d * other,
+                                             dt=self._SamplingPeriod)
             else:
-                return State(self._a,
-                             self._b,
-                             self._c * other,
-                             self._d * other,
-                             dt=self._SamplingPeriod
-                             )
+                return State._from_validated(self._a,
+                                             self._b,
+                                             self._c * other,
+                                             self._d * other,
+                                             dt=self._SamplingPeriod
+                                             )
         elif isinstance(other, type(np.array([0.]))):
             # It still might be a scalar inside an array
             if other.size == 1:
@@ -1949,12 +2208,26 @@ class State:
 
     # ================================================================
     # __getitem__ to provide input-output selection of an ss
-    #
-    # TODO: How to validate strides
     # ================================================================
 
     def __getitem__(self, num_or_slice):
-        print('La la')
+        """
+        Selects the subsystem from the given outputs and inputs via
+        ``G[rows, cols]``. Integers, slices, lists and boolean masks are
+        accepted. The A matrix is shared with this model and for integers
+        and slices the B, C, D matrices are views of the original ones. The
+        result is not minimized, see ``minimal_realization``.
+        """
+        rows, cols = _io_index(num_or_slice, self._shape)
+        d = self._d[rows, :][:, cols]
+        if self._isgain:
+            return State._from_validated(None, None, None, d,
+                                         dt=self._SamplingPeriod)
+
+        return State._from_validated(self._a, self._b[:, cols],
+                                     self._c[rows, :], d, d.shape, False,
+                                     dt=self._SamplingPeriod,
+                                     factors=self._factors)
 
     def __setitem__(self, *args):
         raise ValueError('To change the data of a subsystem, set directly\n'
@@ -2118,6 +2391,299 @@ class State:
             return a, b, c, d, d.shape, Gain_flag
 
 
+class DescriptorState:
+    """
+    DescriptorState() is the generalized state representation of the
+    descriptor systems of the form
+
+    .. math::
+
+        \\begin{align}
+            E\\dot{x} &= Ax + Bu \\\\
+                   y &= Cx + Du
+        \\end{align}
+
+    where :math:`E` is allowed to be singular. Typically, models derived
+    from differential-algebraic equations (DAEs) come with a structured,
+    (and possibly singular) :math:`E` matrix and inverting it to obtain a
+    State() model ruins the structure and the conditioning of the data.
+    Hence, the matrices are kept as they are and the computations are
+    performed on the pencil :math:`sE - A` instead. ::
+
+        >>>> G = DescriptorState([[-1,0],[0,-2]], [[1],[1]], [[1,1]],
+                                 e=[[1,0],[0,0]])
+        >>>> G.poles
+        array([-1.+0.j])
+
+    The arguments are the same as the State() arguments and the :math:`E`
+    matrix is given as the fifth argument or via the ``e`` keyword. If
+    omitted, the identity matrix is assumed. Static gains are not accepted
+    since they don't have any descriptor structure; use State() instead.
+
+    The poles are the finite generalized eigenvalues of the pencil
+    :math:`(A, E)` computed via the QZ decomposition. Similarly, the zeros
+    are the finite generalized eigenvalues of the Rosenbrock system pencil.
+
+    .. note:: For nonsquare systems, the zeros are computed only if
+        :math:`E` is invertible. Otherwise an empty array is returned.
+    """
+
+    def __init__(self, a, b, c, d=None, e=None, dt=False):
+
+        self._SamplingPeriod = False
+        self._isSISO = False
+        self._isgain = False
+        self._isstable = False
+
+        (self._a, self._b, self._c, self._d, self._e,
+         self._shape) = self.validate_arguments(a, b, c, d, e)
+        self._p, self._m = self._shape
+
+        if self._shape == (1, 1):
+            self._isSISO = True
+
+        self.SamplingPeriod = dt
+        self._recalc()
+
+    @property
+    def a(self):
+        """
+        If this property is called ``G.a`` then returns the matrix data.
+        Alternatively, if this property is set then the provided value is
+        first validated with the existing system shape and number of states.
+        """
+        return self._a
+
+    @property
+    def b(self):
+        """
+        If this property is called ``G.b`` then returns the matrix data.
+        Alternatively, if this property is set then the provided value is
+        first validated with the existing system shape and number of states.
+        """
+        return self._b
+
+    @property
+    def c(self):
+        """
+        If this property is called ``G.c`` then returns the matrix data.
+        Alternatively, if this property is set then the provided value is
+        first validated with the existing system shape and number of states.
+        """
+        return self._c
+
+    @property
+    def d(self):
+        """
+        If this property is called ``G.d`` then returns the matrix data.
+        Alternatively, if this property is set then the provided value is
+        first validated with the existing system shape.
+        """
+        return self._d
+
+    @property
+    def e(self):
+        """
+        If this property is called ``G.e`` then returns the descriptor
+        matrix. Alternatively, if this property is set then the provided
+        value is first validated with the existing number of states.
+        """
+        return self._e
+
+    @property
+    def SamplingPeriod(self):
+        """
+        If this property is called ``G.SamplingPeriod`` then returns the
+        sampling period data. If this property is set to ``False``, the model
+        is assumed to be a continuous model. Otherwise, a discrete time model
+        is assumed. Upon changing this value, relevant system properties are
+        recalculated.
+        """
+        return self._SamplingPeriod
+
+    @property
+    def SamplingSet(self):
+        """
+        If this property is called ``G.SamplingSet`` then returns the
+        set ``Z`` or ``R`` for discrete and continous models respectively.
+        This is a read only property and cannot be set. Instead an appropriate
+        setting should be given to the ``SamplingPeriod`` property.
+        """
+        return self._SamplingSet
+
+    @property
+    def NumberOfStates(self):
+        """
+        A read only property that holds the number of states.
+        """
+        return self._a.shape[0]
+
+    @property
+    def NumberOfInputs(self):
+        """
+        A read only property that holds the number of inputs.
+        """
+        return self._m
+
+    @property
+    def NumberOfOutputs(self):
+        """
+        A read only property that holds the number of outputs.
+        """
+        return self._p
+
+    @property
+    def shape(self):
+        """
+        A read only property that holds the shape of the system as a tuple
+        such that the result is ``(# of outputs , # of inputs)``.
+        """
+        return self._shape
+
+    @property
+    def matrices(self):
+        """
+        A read only property that returns the model matrices in the order
+        ``A, B, C, D, E``.
+        """
+        return self._a, self._b, self._c, self._d, self._e
+
+    @a.setter
+    def a(self, value):
+        self._a = self.validate_arguments(value, self._b, self._c, self._d,
+                                          self._e)[0]
+        self._recalc()
+
+    @b.setter
+    def b(self, value):
+        self._b = self.validate_arguments(self._a, value, self._c, self._d,
+                                          self._e)[1]
+        self._recalc()
+
+    @c.setter
+    def c(self, value):
+        self._c = self.validate_arguments(self._a, self._b, value, self._d,
+                                          self._e)[2]
+        self._recalc()
+
+    @d.setter
+    def d(self, value):
+        self._d = self.validate_arguments(self._a, self._b, self._c, value,
+                                          self._e)[3]
+        self._recalc()
+
+    @e.setter
+    def e(self, value):
+        self._e = self.validate_arguments(self._a, self._b, self._c, self._d,
+                                          value)[4]
+        self._recalc()
+
+    @SamplingPeriod.setter
+    def SamplingPeriod(self, value):
+        if value:
+            self._SamplingSet = 'Z'
+            if type(value) is bool:  # integer 1 != True
+                self._SamplingPeriod = 0.
+            elif isinstance(value, (int, float)):
+                self._SamplingPeriod = float(value)
+            else:
+                raise TypeError('SamplingPeriod must be a real scalar.'
+                                'But looks like a \"{0}\" is given.'.format(
+                                 type(value).__name__))
+        else:
+            self._SamplingSet = 'R'
+            self._SamplingPeriod = None
+
+    def _recalc(self):
+        a, b, c, d, e = self.matrices
+        self.poles = _generalized_finite_eigvals(a, e)
+
+        p, m = self._shape
+        if p == m:
+            M = np.block([[a, b], [c, d]])
+            N = block_diag(e, np.zeros((p, m)))
+            self.zeros = _generalized_finite_eigvals(M, N)
+        elif np.linalg.matrix_rank(e) == e.shape[0]:
+            self.zeros = transmission_zeros(np.linalg.solve(e, a),
+                                            np.linalg.solve(e, b), c, d)
+        else:
+            self.zeros = np.zeros((0, 1))
+
+        self._set_stability()
+        self._set_representation()
+
+    def _set_stability(self):
+        if self._SamplingSet == 'Z':
+            self._isstable = all(1 > np.abs(self.poles))
+        else:
+            self._isstable = all(0 > np.real(self.poles))
+
+    def _set_representation(self):
+        self._repr_type = 'DescriptorState'
+
+    def __repr__(self):
+        if self._SamplingSet == 'R':
+            desc_text = '\n Continous-time descriptor represantation\n'
+        else:
+            desc_text = ('Discrete-time descriptor represantation with: '
+                         'sampling time: %.3f \n' % self.SamplingPeriod)
+
+        desc_text += (' {0} input(s) and {1} output(s)\n'.format(
+                                                    self.NumberOfInputs,
+                                                    self.NumberOfOutputs))
+        pole_zero_table = zip_longest(np.real(self.poles),
+                                      np.imag(self.poles),
+                                      np.real(self.zeros),
+                                      np.imag(self.zeros)
+                                      )
+
+        desc_text += '\n' + tabulate(pole_zero_table,
+                                     headers=['Poles(real)',
+                                              'Poles(imag)',
+                                              'Zeros(real)',
+                                              'Zeros(imag)'])
+        return desc_text
+
+    @staticmethod
+    def validate_arguments(a, b, c, d, e, verbose=False):
+        """
+
+        An internal command to validate whether given arguments to a
+        DescriptorState() instance are valid and compatible.
+
+        The A, B, C, D matrices are passed through the State() validator
+        and then the E matrix is checked for compatibility with A.
+
+        """
+        if b is None or c is None:
+            raise ValueError('A descriptor model needs at least the A, B and '
+                             'C matrices. For static gains, use State() '
+                             'instead.')
+
+        *abcd, shape, _ = State.validate_arguments(a, b, c, d,
+                                                   verbose=verbose)
+        a = abcd[0]
+
+        if e is None:
+            if verbose:
+                print('E is None, hence I assumed an identity matrix.')
+            e = np.eye(a.shape[0])
+        else:
+            try:
+                e = np.atleast_2d(np.array(e, dtype='float'))
+            except ValueError:
+                raise ValueError('The E matrix argument couldn\'t '
+                                 'be converted to a 2D array of real'
+                                 ' numbers.')
+
+        if e.shape != a.shape:
+            raise ValueError('E matrix must have the same shape with the A '
+                             'matrix. I need ({0[0]:d},{0[1]:d}) but got '
+                             '({1[0]:d},{1[1]:d}).'.format(a.shape, e.shape))
+
+        return (*abcd, e, shape)
+
+
 def state_to_transfer(*state_or_abcd, output='system'):
     """
     Given a State() object of a tuple of A,B,C,D array-likes, converts
@@ -2129,9 +2695,12 @@ def state_to_transfer(*state_or_abcd, output='system'):
     modifications.
 
 
-    The algorithm is to first get the minimal realization of the State()
-    representation. Then implements the conversion ala Varga,Sima 1981
-    which can be summarized as iterating over every row/cols of B and C
+    If A is diagonalizable with a well-conditioned eigenvector matrix, all
+    p x m entries are obtained from a single eigendecomposition: the common
+    denominator is formed from the eigenvalues and each numerator is the
+    sum of the residues times the leave-one-out pole polynomials which are
+    shared by all entries. Otherwise, the conversion ala Varga,Sima 1981 is
+    used which can be summarized as iterating over every row/cols of B and C
     to get SISO Transfer representations via c*(sI-A)^(-1)*b+d
 
     Parameters
@@ -2159,6 +2728,17 @@ def state_to_transfer(*state_or_abcd, output='system'):
         raise ValueError('The output can either be "system" or "matrices".\n'
                          'I don\'t know any option as "{0}"'.format(output))
 
+    if output == 'system' and isinstance(state_or_abcd[0], State):
+        return _cached_conversion(state_or_abcd[0], _state_to_transfer)
+
+    return _state_to_transfer(*state_or_abcd, output=output)
+
+
+def _state_to_transfer(*state_or_abcd, output='system'):
+    """
+    The conversion routine of state_to_transfer() without the caching and
+    the argument check.
+    """
     # If a discrete time system is given this will be modified to the
     # SamplingPeriod later.
     ZR = None
@@ -2186,12 +2766,30 @@ def state_to_transfer(*state_or_abcd, output='system'):
 
     p, m = C.shape[0], B.shape[1]
     n = np.shape(A)[0]
+
+    # Try all entries at once with a single eigendecomposition
+    nums, entry_den = _state_to_transfer_polynomials(A, B, C)
+    if nums is not None:
+        num_list = [[haroldpolyadd(nums[r, c], D[r, c]*entry_den)
+                     for c in range(m)] for r in range(p)]
+        den_list = [[entry_den]*m for rows in range(p)]
+        if (p, m) == (1, 1):
+            num_list = num_list[0][0]
+            den_list = den_list[0][0]
+
+        if output == 'polynomials':
+            return (num_list, den_list)
+        return Transfer._from_validated(*_as_2d_entries(num_list, den_list),
+                                        (p, m), dt=ZR)
+
     pp = eigvals(A)
 
-    entry_den = np.real(haroldpoly(pp))
+    entry_den = haroldpoly(pp)
     # Allocate some list objects for num and den entries
     num_list = [[None]*m for rows in range(p)]
     den_list = [[entry_den]*m for rows in range(p)]
+    # The zeros of all channels with the shared reductions
+    zeros_list = transmission_zeros_batch(A, B, C)
 
     for rowind in range(p):  # All rows of C
         for colind in range(m):  # All columns of B
@@ -2202,7 +2800,7 @@ def state_to_transfer(*state_or_abcd, output='system'):
             # the result should be a real polynomial, we can get
             # away with it (on paper)
 
-            zz = transmission_zeros(A, b, c, np.array([[0]]))
+            zz = zeros_list[rowind][colind]
 
             # For finding k of a G(s) we compute
             #          pole polynomial evaluated at s0
@@ -2234,7 +2832,7 @@ def state_to_transfer(*state_or_abcd, output='system'):
             if zz.size == 0:
                 entry_num = entry_gain
             else:
-                entry_num = np.real(haroldpoly(zz))
+                entry_num = haroldpoly(zz)
                 entry_num = np.convolve(entry_gain, entry_num)
 
             entry_num = haroldpolyadd(entry_num, dentimesD)
@@ -2247,7 +2845,162 @@ def state_to_transfer(*state_or_abcd, output='system'):
 
     if output is 'polynomials':
         return (num_list, den_list)
-    return Transfer(num_list, den_list, ZR)
+    return Transfer._from_validated(*_as_2d_entries(num_list, den_list),
+                                    (p, m), dt=ZR)
+
+
+def _as_2d_entries(num, den):
+    """
+    Brings the 1D polynomial entries of the conversion results to the 2D
+    float arrays of the Transfer() convention.
+    """
+    if isinstance(num, list):
+        return ([[np.atleast_2d(np.real(x)).astype(float) for x in row]
+                 for row in num],
+                [[np.atleast_2d(np.real(x)).astype(float) for x in row]
+                 for row in den])
+    return (np.atleast_2d(np.real(num)).astype(float),
+            np.atleast_2d(np.real(den)).astype(float))
+
+
+def _state_to_transfer_polynomials(A, B, C):
+    """
+    Computes the numerators of C(sI-A)^(-1)B and the common denominator
+    det(sI-A) from a single eigendecomposition of A.
+
+    With A = V diag(l) V^(-1), every entry is the partial fraction sum
+    sum_k r_k/(s-l_k) hence its numerator is sum_k r_k prod_(i!=k)(s-l_i).
+    The leave-one-out products are formed once and reused for all entries.
+    The coefficients that are below the accumulated rounding error bound
+    of this sum are set to zero.
+
+    If the eigenvector matrix is ill-conditioned (A is close to a defective
+    matrix), the residues are not reliable and ``(None, None)`` is returned.
+
+    Returns
+    -------
+    nums : ndarray
+        (p, m, n) array of numerator coefficients
+    den : ndarray
+        The common denominator with n+1 coefficients
+
+    """
+    n = A.shape[0]
+    lam, V = eig(A)
+    if np.linalg.cond(V) > 1/np.sqrt(np.spacing(1.)):
+        return None, None
+
+    den = haroldpoly(lam)
+    P = np.array([haroldpoly(np.delete(lam, k)) for k in range(n)],
+                 dtype=complex)
+    # Residues of every entry (p, m, n)
+    R = (C @ V)[:, None, :] * solve(V, B).T[None, :, :]
+    nums = np.real(R @ P)
+    bound = np.abs(R) @ np.abs(P)
+    nums[np.abs(nums) <= n*100*np.spacing(1.)*bound] = 0.
+
+    return nums, den
+
+
+def _gilbert_realization(num, den, p, m, tol=None):
+    """
+    Computes the Gilbert realization of a strictly proper MIMO transfer
+    matrix with monic denominators.
+
+    The roots of all denominators are collected and the ones closer than
+    ``tol`` (relative to their magnitude) are identified as the same pole.
+    For each distinct pole, the residue matrix is formed from
+    num(l)/den'(l) and factorized with SVD, discarding the singular values
+    below ``sqrt(eps)`` times the largest residue of all poles. Hence, the
+    poles cancelled by the numerators do not contribute any states.
+
+    Returns None if any entry has a repeated pole, since then the residues
+    do not describe the system.
+    """
+    if tol is None:
+        tol = np.sqrt(np.spacing(1.))
+
+    # Collect (pole, row, col, residue) for the nonzero entries
+    poles, owners, residues = [], [], []
+    for r in range(p):
+        for c in range(m):
+            nm = haroldtrimleftzeros(np.ravel(num[r][c]))
+            dn = haroldtrimleftzeros(np.ravel(den[r][c]))
+            if dn.size < 2 or not np.any(nm):
+                continue
+            rts = np.roots(dn)
+            dist = np.abs(rts[:, None] - rts[None, :]) + np.eye(rts.size)
+            if np.any(dist < tol*np.maximum(1., np.abs(rts))[:, None]):
+                return None
+            poles += [rts]
+            owners += [(r, c)]*rts.size
+            residues += [np.polyval(nm, rts) / np.polyval(np.polyder(dn),
+                                                            rts)]
+
+    if not poles:
+        return None
+
+    poles, residues = np.concatenate(poles), np.concatenate(residues)
+    scale = tol*np.maximum(1., np.abs(poles))
+    isreal = np.abs(poles.imag) <= scale
+    if (np.count_nonzero(~isreal & (poles.imag > 0)) !=
+            np.count_nonzero(~isreal & (poles.imag < 0))):
+        return None
+
+    # Cluster the real and the upper half plane poles over all entries; the
+    # lower half plane ones are their conjugates and realized with them.
+    # Each pole is compared with every cluster since the roots of different
+    # entries differ in the last digits and the sorting interleaves them.
+    keep = np.flatnonzero(isreal | (poles.imag > 0))
+    keep = keep[np.argsort(poles[keep].real, kind='stable')]
+    centers, clusters = [], []
+    for ind in keep:
+        if centers:
+            dist = np.abs(np.array(centers) - poles[ind])
+            nearest = np.argmin(dist)
+            if dist[nearest] < scale[ind]:
+                clusters[nearest].append(ind)
+                continue
+        centers += [poles[ind]]
+        clusters += [[ind]]
+
+    rtol = tol*np.abs(residues).max()
+    A_blocks, B_blocks, C_blocks = [], [], []
+    for members in clusters:
+        R = np.zeros((p, m), dtype=complex)
+        for ind in members:
+            r, c = owners[ind]
+            if R[r, c] != 0.:
+                # Same entry twice in a cluster, not simple
+                return None
+            R[r, c] = residues[ind]
+        lam = np.mean(poles[members])
+
+        if np.all(isreal[members]):
+            U, S, Vh = np.linalg.svd(np.real(R))
+            rank = np.count_nonzero(S > rtol)
+            A_blocks += [lam.real*np.eye(rank)]
+            B_blocks += [S[:rank, None]*Vh[:rank, :]]
+            C_blocks += [U[:, :rank]]
+        elif not np.any(isreal[members]):
+            # The conjugate is realized together with this one
+            U, S, Vh = np.linalg.svd(R)
+            rank = np.count_nonzero(S > rtol)
+            V = S[:rank, None]*Vh[:rank, :]
+            Ir = np.eye(rank)
+            A_blocks += [np.block([[lam.real*Ir, -lam.imag*Ir],
+                                   [lam.imag*Ir, lam.real*Ir]])]
+            B_blocks += [np.vstack((V.real, V.imag))]
+            C_blocks += [np.hstack((2*U[:, :rank].real,
+                                    -2*U[:, :rank].imag))]
+        else:
+            # Real and complex poles in the same cluster, ill-conditioned
+            return None
+
+    A = block_diag(*A_blocks)
+    if A.size == 0:
+        return None
+    return A, np.vstack(B_blocks), np.hstack(C_blocks)
 
 
 def transfer_to_state(*tf_or_numden, output='system'):
@@ -2263,9 +3016,16 @@ def transfer_to_state(*tf_or_numden, output='system'):
     For SISO systems, the algorithm is returning the controllable
     companion form.
 
-    For MIMO systems a variant of the algorithm given in Section 4.4 of
-    W.A. Wolowich, Linear Multivariable Systems (1974). The denominators
-    are equaled with haroldlcm() Least Common Multiple function.
+    For MIMO systems, if every entry has only simple poles, the Gilbert
+    realization is used: the residue matrices of the distinct poles are
+    factorized with SVD and each pole contributes as many states as the
+    rank of its residue. This gives a minimal realization directly. The
+    complex conjugate poles are realized as real 2x2 blocks.
+
+    Otherwise, a variant of the algorithm given in Section 4.4 of
+    W.A. Wolowich, Linear Multivariable Systems (1974) is used. The
+    denominators are equaled with haroldlcm() Least Common Multiple
+    function and the result is not necessarily minimal.
 
 
 
@@ -2289,6 +3049,18 @@ def transfer_to_state(*tf_or_numden, output='system'):
         raise ValueError('The output can either be "system" or "polynomials".'
                          '\nI don\'t know any option as "{0}"'.format(output))
 
+    if (output == 'system' and len(tf_or_numden) == 1 and
+            isinstance(tf_or_numden[0], Transfer)):
+        return _cached_conversion(tf_or_numden[0], _transfer_to_state)
+
+    return _transfer_to_state(*tf_or_numden, output=output)
+
+
+def _transfer_to_state(*tf_or_numden, output='system'):
+    """
+    The conversion routine of transfer_to_state() without the caching and
+    the argument check.
+    """
     # mildly check if we have a transfer,state, or (num,den)
     if len(tf_or_numden) > 1:
         num, den = tf_or_numden[:2]
@@ -2297,9 +3069,13 @@ def transfer_to_state(*tf_or_numden, output='system'):
         return tf_or_numden[0]
     else:
         try:
-            G = deepcopy(tf_or_numden[0])
+            G = tf_or_numden[0]
             num = G.num
             den = G.den
+            # The MIMO entries are replaced below hence copy the lists
+            if not G._isSISO:
+                num = [list(x) for x in num]
+                den = [list(x) for x in den]
             m, p = G.NumberOfInputs, G.NumberOfOutputs
             it_is_gain = G._isgain
         except AttributeError:
@@ -2405,9 +3181,14 @@ def transfer_to_state(*tf_or_numden, output='system'):
                     num[x][y] = np.array([1/den[x][y][0, 0]])*num[x][y]
                     den[x][y] = np.array([1/den[x][y][0, 0]])*den[x][y]
 
+        # If all poles are simple, go for the minimal Gilbert realization
+        gilbert = _gilbert_realization(num, den, p, m)
+        if gilbert is not None:
+            A, B, C = gilbert
+
         # OK first check if the denominator is common in all entries
-        if all([np.array_equal(den[x][y], den[0][0])
-                for x in range(len(den)) for y in range(len(den[0]))]):
+        elif all([np.array_equal(den[x][y], den[0][0])
+                  for x in range(len(den)) for y in range(len(den[0]))]):
 
             # Nice, less work. Off to realization. Decide rows or cols?
             if p >= m:  # Tall or square matrix => Right Coprime Fact.
@@ -2489,18 +3270,165 @@ def transfer_to_state(*tf_or_numden, output='system'):
             if factorside == 'l':
                 A, B, C = A.T, C.T, B.T
 
+    if output == 'matrices':
+        return A, B, C, D
+
     try:  # if the arg was a Transfer object
         is_ct = tf_or_numden[0].SamplingSet is 'R'
-        if is_ct:
-            return (A, B, C, D) if output == 'matrices' else State(A, B, C, D)
-        else:
-            return (A, B, C, D) if output == 'matrices' else \
-                                    State(A, B, C, D, G.SamplingPeriod)
+        dt = False if is_ct else G.SamplingPeriod
     except AttributeError:  # the arg was num,den
-        return (A, B, C, D) if output == 'matrices' else State(A, B, C, D)
+        dt = False
+
+    # Full cancellations lead to gains, let State() sort them out
+    if A is None or np.size(A) == 0:
+        return State(A, B, C, D, dt)
+
+    return State._from_validated(*[np.atleast_2d(np.asarray(x, dtype=float))
+                                   for x in (A, B, C, D)], dt=dt)
+
+
+def _io_index(num_or_slice, shape):
+    """
+    Regularizes the ``[rows, cols]`` index of a model such that the
+    selections are always 2D. Integers are turned into single element
+    slices to keep the selections as views.
+    """
+    if not isinstance(num_or_slice, tuple) or len(num_or_slice) != 2:
+        raise IndexError('I need two indices for the selection, one for the '
+                         'outputs and one for the inputs, e.g., G[1, 0] or '
+                         'G[:, [0, 2]]. I received {0}.'.format(num_or_slice))
+    idx = []
+    for ind, n in zip(num_or_slice, shape):
+        if isinstance(ind, (int, np.integer)):
+            if not -n <= ind < n:
+                raise IndexError('The index {0} is out of bounds for the '
+                                 'system shape {1}.'.format(ind, shape))
+            ind = slice(ind % n, ind % n + 1)
+        elif not isinstance(ind, slice):
+            ind = np.arange(n)[ind]
+        if np.arange(n)[ind].size == 0:
+            raise IndexError('The selection {0} leads to an empty '
+                             'system.'.format(num_or_slice))
+        idx += [ind]
+    return idx
+
+
+def _real_schur_eigvals(T):
+    """
+    Reads off the eigenvalues of a matrix in the standardized real Schur
+    form. The 2x2 blocks have equal diagonal entries and off-diagonal entries
+    with opposite signs, i.e., ``a +- j sqrt(-bc)``.
+    """
+    w = np.diag(T).astype(complex)
+    for k in np.flatnonzero(np.diag(T, -1)):
+        im = np.sqrt(np.abs(T[k, k+1] * T[k+1, k]))
+        w[k] += 1j*im
+        w[k+1] -= 1j*im
+    return w if np.any(w.imag) else w.real
+
+
+def _readonly(*arrays, copy=False):
+    """
+    Marks the given arrays, or the arrays inside the (nested) lists, as
+    read-only such that they can be shared between the models safely.
+    Returns the arguments for convenience.
+
+    If ``copy`` is True, the copies of the arrays, in new lists, are marked
+    and returned instead. This is needed for the data that is not owned by
+    the library, i.e., the arrays given by the user.
+    """
+    if copy:
+        arrays = [[_readonly(y, copy=True) for y in x]
+                  if isinstance(x, list) else
+                  x.copy() if isinstance(x, np.ndarray) else x
+                  for x in arrays]
+    for x in arrays:
+        if isinstance(x, list):
+            _readonly(*x)
+        elif isinstance(x, np.ndarray):
+            x.flags.writeable = False
+    return arrays[0] if len(arrays) == 1 else tuple(arrays)
+
+
+def set_conversion_cache_size(size):
+    """
+    Sets the size of the global conversion cache.
+
+    Every State() and Transfer() model keeps its last conversion result
+    obtained via ``state_to_transfer`` or ``transfer_to_state`` until its
+    data is modified hence converting the same object repeatedly, e.g., in
+    mixed arithmetic, is free. In addition, a global least-recently-used
+    cache keyed by a hash of the model data can be enabled such that the
+    conversions of distinct but identical models are also reused. By
+    default this cache is disabled.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of conversions kept. If 0, the cache is disabled
+        and cleared.
+
+    """
+    global _conversion_cache_size
+    if not isinstance(size, (int, np.integer)) or size < 0:
+        raise ValueError('The cache size should be a nonnegative integer '
+                         'but I received {0}.'.format(size))
+    _conversion_cache_size = int(size)
+    while len(_conversion_cache) > _conversion_cache_size:
+        _conversion_cache.popitem(last=False)
+
 
+def _model_fingerprint(G):
+    """
+    Computes a hash of the model kind, sampling period and data arrays.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update('{0}{1}'.format(type(G).__name__, G.SamplingPeriod).encode())
+    if isinstance(G, State):
+        arrays = G.matrices
+    elif G._isSISO:
+        arrays = [G.num, G.den]
+    else:
+        arrays = sum(G.num, []) + sum(G.den, [])
+
+    for x in arrays:
+        x = np.ascontiguousarray(x, dtype=float)
+        h.update(repr(x.shape).encode())
+        h.update(x.tobytes())
+    return h.digest()
 
-def transmission_zeros(A, B, C, D):
+
+def _cached_conversion(G, converter):
+    """
+    Returns the converted model of G via the converter function. The result
+    is looked up in the model itself and then in the global cache, if
+    enabled. A shallow copy is returned such that setting the properties of
+    the result does not modify the cached model.
+    """
+    H = G._converted
+    if H is None:
+        if _conversion_cache_size > 0:
+            key = _model_fingerprint(G)
+            H = _conversion_cache.get(key, None)
+            if H is not None:
+                _conversion_cache.move_to_end(key)
+
+        if H is None:
+            H = converter(G)
+            # transfer_to_state returns the matrices for static gains
+            if not isinstance(H, (State, Transfer)):
+                return H
+            if _conversion_cache_size > 0:
+                _conversion_cache[key] = H
+                while len(_conversion_cache) > _conversion_cache_size:
+                    _conversion_cache.popitem(last=False)
+
+        G._converted = H
+
+    return copy(H)
+
+
+def transmission_zeros(A, B, C, D, sigma=None, k=6):
     """
     Computes the transmission zeros of a (A,B,C,D) system matrix quartet.
 
@@ -2508,18 +3436,45 @@ def transmission_zeros(A, B, C, D):
               Misra, van Dooren, Varga 1994 but skipping the descriptor matrix
               which in turn becomes Emami-Naeini, van Dooren 1979.
 
+    For large, possibly sparse, models computing all zeros is not feasible.
+    If ``sigma`` is given, only the ``k`` zeros closest to ``sigma`` are
+    computed as the eigenvalues of the Rosenbrock system pencil
+
+    .. math::
+
+        \begin{bmatrix} A & B \\ C & D \end{bmatrix} - s
+        \begin{bmatrix} I & 0 \\ 0 & 0 \end{bmatrix}
+
+    with the shift-invert mode of ``scipy.sparse.linalg.eigs``. The pencil
+    is factorized once with a sparse LU decomposition at ``sigma`` hence
+    the matrices can be given as ``scipy.sparse`` matrices. This mode is
+    only available for square systems, i.e., with equal number of inputs
+    and outputs. Choosing ``sigma`` as a point on the imaginary axis around
+    the bandwidth of interest finds the zeros affecting that frequency band.
+
     Parameters
     ----------
-    A,B,C,D : ndarray
+    A,B,C,D : ndarray or sparse matrix
         The input data matrices with (nxn), (nxm), (p,n), (p,m) shapes.
+        Sparse matrices are only accepted if ``sigma`` is given.
+    sigma : {float, complex}, optional
+        The shift around which the zeros are sought. It should not be a zero
+        itself.
+    k : int, optional
+        The number of zeros to compute around ``sigma``. The default is 6.
+        If the system has less finite zeros, all of them are returned.
 
     Returns
     -------
     z : ndarray
         The array of computed transmission zeros. The array is returned
-        empty if no transmission zeros are found.
+        empty if no transmission zeros are found. If ``sigma`` is given,
+        the zeros are sorted with respect to their distance to ``sigma``.
 
     """
+    if sigma is not None:
+        return _sparse_transmission_zeros(A, B, C, D, sigma, k)
+
     n, (p, m) = A.shape[0], D.shape
     r = np.linalg.matrix_rank(D)
     # Trivially zero, transmission zero doesn't make sense
@@ -2560,6 +3515,165 @@ def transmission_zeros(A, B, C, D):
     return z
 
 
+def transmission_zeros_batch(A, B, C, D=None):
+    """
+    Computes the transmission zeros of all SISO channels
+    :math:`(A, b_j, c_i, d_{ij})` of a (A,B,C,D) system matrix quartet.
+
+    Instead of calling ``transmission_zeros`` for every channel, for each
+    input, the pair :math:`(A, b_j)` is brought to the controller-Hessenberg
+    form :math:`(H, \beta e_1)` once and shared by all the outputs. Then, if
+    :math:`d_{ij}` is nonzero, the zeros are the eigenvalues of the
+    Hessenberg matrix :math:`H - \beta e_1 c_i / d_{ij}`. Otherwise, the
+    first row and the last column of the system pencil are deflated and
+    the zeros are the finite generalized eigenvalues of the remaining
+    :math:`n \times n` pencil.
+
+    Parameters
+    ----------
+    A,B,C : ndarray
+        The input data matrices with (nxn), (nxm), (p,n) shapes.
+    D : ndarray, optional
+        The (p,m) feedthrough matrix. If omitted, it is taken as zero.
+
+    Returns
+    -------
+    z : list
+        The list of lists such that ``z[i][j]`` holds the array of the
+        zeros of the channel from the j-th input to the i-th output.
+
+    """
+    A, B, C = np.atleast_2d(A, B, C)
+    n, (p, m) = A.shape[0], (C.shape[0], B.shape[1])
+    D = np.zeros((p, m)) if D is None else np.atleast_2d(D)
+    E = np.eye(n, k=1)
+    z = [[np.zeros((0, 1))]*m for _ in range(p)]
+
+    for col in range(m):
+        if not np.any(B[:, col]):
+            continue
+        # Rotate b to beta*e1 and then the Hessenberg form keeps e1 intact
+        Q, R = qr(B[:, [col]])
+        H, Q1 = hessenberg(Q.T @ A @ Q, calc_q=True)
+        beta, CT = R[0, 0], C @ (Q @ Q1)
+
+        for row in range(p):
+            if not np.any(C[row, :]):
+                continue
+            if D[row, col] != 0.:
+                M = H.copy()
+                M[0, :] -= beta * CT[row, :] / D[row, col]
+                zz = eigvals(M)
+            else:
+                zz = _generalized_finite_eigvals(np.r_[H[1:, :],
+                                                       CT[[row], :]], E)
+            z[row][col] = np.real_if_close(zz)
+
+    return z
+
+
+def _sparse_transmission_zeros(A, B, C, D, sigma, k):
+    """
+    Computes the k zeros closest to sigma with the shift-invert iteration
+    on the Rosenbrock pencil. See ``transmission_zeros``.
+
+    The infinite eigenvalues of the pencil form Jordan chains as long as the
+    relative degrees and the iteration would return perturbed copies of them
+    instead of the zeros. Hence, the state part of the shift-inverted pencil
+    is orthogonally projected onto the output-nulling subspace, which is
+    invariant and holds the finite zeros. Its orthogonal complement is the
+    strongly reachable subspace of the dual system, which is small and
+    computed with sparse products only.
+    """
+    n, (p, m) = A.shape[0], D.shape
+    if p != m:
+        raise ValueError('The zeros around a shift can only be computed for '
+                         'square systems but the system has {} outputs and {}'
+                         ' inputs.'.format(p, m))
+
+    M = bmat([[A, B], [C, D]], format='csc')
+    e = np.r_[np.ones(n), np.zeros(m)]
+
+    dtype = complex if np.iscomplexobj(sigma) and np.imag(sigma) else float
+    try:
+        lu = splu((M - sigma*diags(e)).astype(dtype).tocsc())
+    except RuntimeError:
+        raise ValueError('The system pencil is singular at sigma={}. It is '
+                         'probably a zero itself, try a slightly different '
+                         'shift.'.format(sigma))
+
+    B, C, D = [x.toarray() if issparse(x) else np.asarray(x)
+               for x in (B, C, D)]
+    # The orthogonal complement of the output-nulling subspace
+    W = _strongly_reachable_basis(A.T, C.T, B.T, D.T)
+    nz = n - W.shape[1]
+    k = min(k, nz)
+    if k == 0:
+        return np.zeros(0)
+
+    # ARPACK needs k < n - 1 ; small problems are solved densely
+    if k >= n - 1:
+        A = A.toarray() if issparse(A) else np.asarray(A)
+        z = np.ravel(transmission_zeros(A, B, C, D))
+        return np.real_if_close(z[np.argsort(np.abs(z - sigma))][:k])
+
+    # Orthogonal projector onto the output-nulling subspace
+    def _proj(x):
+        return x - W @ (W.T @ x)
+
+    # The eigenvalues of (M - sigma*E)^-1 E are 1/(z - sigma) on the range
+    # of the projector and the rest is mapped to the origin.
+    def _matvec(x):
+        return _proj(lu.solve(np.r_[_proj(np.ravel(x)), np.zeros(m)])[:n])
+
+    op = LinearOperator((n, n), matvec=_matvec, dtype=dtype)
+    theta = eigs(op, k=k, which='LM', return_eigenvectors=False)
+    z = sigma + 1/theta
+    z = z[np.argsort(np.abs(z - sigma))]
+    # Clean the rounding noise off the real zeros
+    z.imag[np.abs(z.imag) < 100*np.spacing(np.maximum(1., np.abs(z)))] = 0.
+    return np.real_if_close(z)
+
+
+def _strongly_reachable_basis(A, B, C, D):
+    """
+    Computes an orthonormal basis of the strongly reachable subspace, i.e.,
+    the limit of the nondecreasing sequence of subspaces
+
+    .. math::
+
+        \\mathcal{T}_{k+1} = \\{Ax + Bu \\mid x \\in \\mathcal{T}_k,
+        \\ Cx + Du = 0\\}
+
+    starting from :math:`\\mathcal{T}_0 = 0`. Only the products of ``A``
+    with the basis are needed hence ``A`` can be sparse.
+
+    The new directions are normalized before they are orthogonalized
+    against the basis since :math:`A` can be badly scaled, e.g., companion
+    matrices.
+    """
+    n = A.shape[0]
+    tol = np.sqrt(np.spacing(1.))
+    cd_tol = tol * max(norm(C), norm(D), 1.)
+    V = np.zeros((n, 0))
+    for _ in range(n):
+        _, S, vh = np.linalg.svd(np.hstack((C @ V, D)))
+        Z = vh[np.count_nonzero(S > cd_tol):].T
+        if Z.size == 0:
+            break
+        Y = np.hstack((np.asarray(A @ V), B)) @ Z
+        nrm = norm(Y, axis=0)
+        Y = Y[:, nrm > 0] / nrm[nrm > 0]
+        for _ in range(2):
+            Y -= V @ (V.T @ Y)
+        U, S, _ = np.linalg.svd(Y, full_matrices=False)
+        rank = np.count_nonzero(S > tol)
+        if rank == 0:
+            break
+        V = np.hstack((V, U[:, :rank]))
+    return V
+
+
 def _tzeros_reduce(A, B, C, D):
     """
     Basic deflation loop until we get a full row rank feedthrough matrix.
@@ -2604,6 +3718,20 @@ def _tzeros_reduce(A, B, C, D):
     return A, B, C, D
 
 
+def _generalized_finite_eigvals(A, E):
+    """
+    Computes the finite generalized eigenvalues of the square pencil
+    :math:`A - \\lambda E` via the complex QZ decomposition. The
+    eigenvalues with numerically zero :math:`\\beta` values are at infinity
+    and hence discarded.
+    """
+    AA, EE, *_ = qz(A, E, output='complex')
+    alpha, beta = np.diag(AA), np.diag(EE)
+    tol = max(A.shape) * np.spacing(max(norm(A, 1), norm(E, 1))) * 100
+    finite = np.abs(beta) > tol
+    return alpha[finite] / beta[finite]
+
+
 def _state_or_abcd(arg, n=4):
     """
     Tests the argument for being a State() object or any number of
@@ -23,56 +23,121 @@ THE SOFTWARE.
 """
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg import qz, solve_triangular
 
-from ._classes import State, Transfer
-from ._system_funcs import staircase, minimal_realization
+from ._classes import State, Transfer, DescriptorState
+from ._polynomial_ops import _rational_matrix_eval
 
 __all__ = ['frequency_response', 'bode_plot', 'nyquist_plot']
 
 
-def _State_frequency_response_generator(mA, mb, sc, f):
+def _State_frequency_response_generator(H, B, C, f):
     """
     This is the low level function to generate the frequency response
-    values for a state space representation. The realization must be
-    strictly in the observable Hessenberg form.
+    values for a state space representation. The A matrix should be brought
+    to the upper Hessenberg form ``H = Q^T A Q`` beforehand and B, C should
+    be given as ``Q^T B`` and ``C Q``.
 
-    Implements the inner loop of Misra, Patel SIMAX 1988 Algo. 3.1 in
-    batches of B matrices instead of looping over every column of B.
+    Then at every frequency only a Hessenberg system needs to be solved
+    which is O(n^2) instead of O(n^3) (Laub, IEEE TAC 1981). The elimination
+    is performed for a chunk of frequencies at once with partial pivoting
+    between the neighboring rows hence the Python loops only run over the
+    states.
 
     Parameters
     ----------
 
-    mA : array_like {n x n}
+    H : array_like {n x n}
         The A matrix of the realization in the upper Hessenberg form
-    mb : array_like {n x m}
-        The B vector of the realization
-    sc : float
-        The only nonzero coefficient of the o'ble-Hessenberg form
+    B : array_like {n x m}
+        The transformed B matrix
+    C : array_like {p x n}
+        The transformed C matrix
     f  : array_like
         The frequency grid
 
     Returns
     -------
     r  : complex-valued numpy array
+        The response with the shape (len(f), p, m)
 
     """
+    n, m = B.shape
+    r = np.empty((f.size, C.shape[0], m), dtype=complex)
+    Hb = np.hstack((-H, B)).astype(complex)
+    diag = np.arange(n)
+    # Limit the working array to about 64 MB
+    chunk = max(1, 2**22 // (n*(n+m)))
+
+    for start in range(0, f.size, chunk):
+        s = 1j*f[start:start+chunk]
+        X = np.repeat(Hb[None, :, :], s.size, axis=0)
+        X[:, diag, diag] += s[:, None]
+
+        # Bring [sI - H, B] to upper triangular form
+        for k in range(n-1):
+            top, bot = X[:, k, k:], X[:, k+1, k:]
+            swap = np.abs(bot[:, 0]) > np.abs(top[:, 0])
+            if swap.any():
+                top[swap], bot[swap] = bot[swap], top[swap].copy()
+            bot -= (bot[:, [0]] / top[:, [0]]) * top
+
+        # Back substitution in place of the B part
+        Y = X[:, :, n:]
+        for k in range(n-1, -1, -1):
+            if k < n-1:
+                Y[:, k, :] -= (X[:, [k], k+1:n] @ Y[:, k+1:, :])[:, 0, :]
+            Y[:, k, :] /= X[:, k, [k]]
+
+        r[start:start+chunk] = C @ Y
+
+    return r
+
+
+def _Descriptor_frequency_response_generator(A, B, C, E, f):
+    """
+    This is the low level function to generate the frequency response
+    values for a descriptor representation.
 
-    nn, m = mA.shape[0], mb.shape[1]
-    r = np.empty((f.size, m), dtype=complex)
-    Ab = np.hstack((-mA, mb)).astype(complex)
-    X = np.empty_like(Ab)
+    The pencil is reduced once to the complex generalized Schur form
+    :math:`Q^H(A, E)Z = (T_A, T_E)` such that, at every frequency point,
+    only a triangular system with the matrix :math:`j\\omega T_E - T_A`
+    needs to be solved instead of inverting :math:`j\\omega E - A`.
 
-    imag_indices = np.diag_indices(nn)
+    Parameters
+    ----------
+
+    A, B, C, E : array_like {(n x n), (n x m), (p x n), (n x n)}
+        The descriptor system matrices
+    f  : array_like
+        The frequency grid
+
+    Returns
+    -------
+    r  : complex-valued numpy array
+        The response with the shape (len(f), p, m)
+
+    """
+    AA, EE, Q, Z = qz(A, E, output='complex')
+    Bt = Q.conj().T @ B
+    Ct = C @ Z
+    r = np.empty((f.size, C.shape[0], B.shape[1]), dtype=complex)
 
     for ind, val in enumerate(f):
-        X[:, :] = Ab  # Working copy
-        X[imag_indices] += val*1j
-        for x in range(1, nn):
-            X[x] -= (X[x, x-1] / X[x-1, x-1]) * X[x-1]
+        r[ind, :, :] = Ct @ solve_triangular(val*1j*EE - AA, Bt)
 
-        r[ind, :] = X[-1, -m:]/X[-1, -1-m]
+    return r
 
-    return r*sc
+
+def _State_frequency_response(G, w):
+    """
+    Evaluates the response of a dynamic State() model on the grid ``w`` via
+    the cached Hessenberg form of its A matrix. Returns the (len(w), p, m)
+    shaped array.
+    """
+    H, Q = G._factorization('hessenberg')
+    r = _State_frequency_response_generator(H, Q.T @ G.b, G.c @ Q, w)
+    return r + G.d
 
 
 def frequency_response(G, custom_grid=None, high=None, low=None, samples=None,
@@ -82,12 +147,13 @@ def frequency_response(G, custom_grid=None, high=None, low=None, samples=None,
     Computes the frequency response matrix of a State() or Transfer()
     object.
 
-    The State representations are always checked for minimality and,
-    if any, unobservable/uncontrollable modes are removed.
+    For State representations, the Hessenberg form of the A matrix is
+    computed once and kept on the model hence the subsequent calls on the
+    same model only pay for the evaluations.
 
     Parameters
     ----------
-    G: State of Transfer
+    G: State, DescriptorState or Transfer
         The realization for which the frequency response is computed
     custom_grid : array_like
         An array of sorted positive numbers denoting the frequencies
@@ -116,10 +182,10 @@ def frequency_response(G, custom_grid=None, high=None, low=None, samples=None,
     # better argument parsing.
     ############################################################
 
-    if not isinstance(G, (State, Transfer)):
-        raise ValueError('The argument should either be a State() or '
-                         'Transfer() object. I have found a {0}'
-                         ''.format(type(G).__qualname__))
+    if not isinstance(G, (State, DescriptorState, Transfer)):
+        raise ValueError('The argument should either be a State(), '
+                         'DescriptorState() or Transfer() object. I have '
+                         'found a {0}'.format(type(G).__qualname__))
 
     for x in (input_freq_unit, output_freq_unit):
         if x not in ('Hz', 'rad/s'):
@@ -152,6 +218,10 @@ def frequency_response(G, custom_grid=None, high=None, low=None, samples=None,
         else:
             nat_freq = np.abs(pz_list)
 
+        # A descriptor model might not have any finite poles or zeros
+        if nat_freq.size == 0:
+            nat_freq = np.array([1.])
+
         smallest_pz = np.max([np.min(nat_freq), 1e-7])
         largest_pz = np.max([np.max(nat_freq), smallest_pz+10])
 
@@ -200,68 +270,35 @@ def frequency_response(G, custom_grid=None, high=None, low=None, samples=None,
 
             freq_resp_array = np.rollaxis(freq_resp_array, 0, 3)
 
-    elif G._isSISO:
-        freq_resp_array = np.zeros_like(w, dtype='complex')
+    elif isinstance(G, DescriptorState):
+        a, b, c, d, e = G.matrices
+        freq_resp_array = _Descriptor_frequency_response_generator(
+                                                            a, b, c, e, w)
+        freq_resp_array += d
 
-        if isinstance(G, State):
-            aa, bb, cc = staircase(
-                            *minimal_realization(*G.matrices[:-1]),
-                            form='o',
-                            invert=True
-                            )
-            freq_resp_array = _State_frequency_response_generator(
-                                                        aa, bb, cc[0, -1], w)
+        if G._isSISO:
+            freq_resp_array = freq_resp_array[:, 0, 0]
+        else:
+            # Move the frequency axis to the end to have (row, col, freq)
+            freq_resp_array = np.rollaxis(freq_resp_array, 0, 3)
 
-            if np.any(G.d):
-                freq_resp_array += G.d[0, 0]
+    elif G._isSISO:
+        if isinstance(G, State):
+            freq_resp_array = _State_frequency_response(G, w)[:, 0, :]
 
         else:
             iw = w.flatten()*1j
-            freq_resp_array = (np.polyval(G.num[0], iw) /
-                               np.polyval(G.den[0], iw)
-                               )
+            freq_resp_array = _rational_matrix_eval(*G._polymatrix, iw)[0, 0]
     else:
-        p, m = G.shape
-        freq_resp_array = np.empty((len(w), m, p), dtype='complex')
-
         if isinstance(G, State):
-            aa, bb, cc = minimal_realization(*G.matrices[:-1])
-
-            for rows in range(p):
-                aaa, bbb, ccc = staircase(
-                                          aa, bb, cc[[rows], :],
-                                          form='o', invert=True
-                                          )
-                freq_resp_array[:,
-                                :,
-                                rows] = _State_frequency_response_generator(
-                                                            aaa,
-                                                            bbb,
-                                                            ccc[0, -1],
-                                                            w
-                                                            )
-
-            if np.any(G.d):
-                freq_resp_array += G.d[0, 0].T
-
-            # Currently the shape is (freqs,cols,rows) for broadcasting.
-            # roll axes in the correct places to have (row, col, freq) shape
-            freq_resp_array = np.rollaxis(
-                                          np.rollaxis(freq_resp_array, 0, 3),
-                                          1)
+            # Move the frequency axis to the end to have (row, col, freq)
+            freq_resp_array = np.rollaxis(_State_frequency_response(G, w),
+                                          0, 3)
 
         else:
             iw = w.flatten()*1j
-            freq_resp_array = np.empty((len(w), m, p), dtype='complex')
-            for rows in range(p):
-                for cols in range(m):
-                    freq_resp_array[:, cols, rows] = (
-                            np.polyval(G.num[rows][cols].flatten(), iw) /
-                            np.polyval(G.den[rows][cols].flatten(), iw)
-                            )
-            freq_resp_array = np.rollaxis(
-                                          np.rollaxis(freq_resp_array, 0, 3),
-                                          1)
+            # Evaluate all entries at once via the padded coefficients
+            freq_resp_array = _rational_matrix_eval(*G._polymatrix, iw)
 
     return freq_resp_array, w
 
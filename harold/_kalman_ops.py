@@ -22,18 +22,28 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 import numpy as np
+from numpy.linalg import norm, cond, LinAlgError
+from scipy.linalg import block_diag
 from ._classes import State, _state_or_abcd
-from ._aux_linalg import haroldsvd
+from ._aux_linalg import _block_arnoldi
+
+__all__ = ['kalman_controllability', 'kalman_observability',
+           'kalman_decomposition', 'is_kalman_controllable',
+           'is_kalman_observable']
 
 
 def kalman_controllability(G, compress=False):
     """
-    Computes the Kalman controllability related quantities. The algorithm
-    is the literal computation of the controllability matrix with increasing
-    powers of A. Numerically, this test is not robust and prone to errors if
-    the A matrix is not well-conditioned or its entries have varying order
-    of magnitude as at each additional power of A the entries blow up or
-    converge to zero rapidly.
+    Computes the Kalman controllability related quantities. The
+    controllability matrix is the literal stacking of the blocks with
+    increasing powers of A. Numerically, this matrix is not robust and prone
+    to errors if the A matrix is not well-conditioned or its entries have
+    varying order of magnitude as at each additional power of A the entries
+    blow up or converge to zero rapidly.
+
+    Hence the rank and the transformation matrix are not computed from this
+    matrix but with an orthogonalized block Krylov (Arnoldi) iteration that
+    stops as soon as the rank saturates.
 
     Parameters
     ----------
@@ -51,9 +61,9 @@ def kalman_controllability(G, compress=False):
     Cc : {(n,nxm)} 2D numpy array
         Kalman Controllability Matrix
     T : (n,n) 2D numpy arrays
-        The transformation matrix such that T^T * Cc is row compressed
-        and the number of zero rows at the bottom corresponds to the number
-        of uncontrollable modes.
+        The orthogonal transformation matrix such that T^T * Cc is row
+        compressed and the number of zero rows at the bottom corresponds to
+        the number of uncontrollable modes.
     r: integer
         Numerical rank of the controllability matrix
 
@@ -65,26 +75,31 @@ def kalman_controllability(G, compress=False):
     else:
         A, B = mats
 
-    n = A.shape[0]
-    Cc = B.copy()
-
+    n, m = B.shape
+    Cc = np.empty((n, n*m))
+    Cc[:, :m] = B
     for i in range(1, n):
-        Cc = np.hstack((Cc, np.linalg.matrix_power(A, i).dot(B)))
+        Cc[:, i*m:(i+1)*m] = A @ Cc[:, (i-1)*m:i*m]
+
+    T, r = _block_arnoldi(A, B, complete=True)
 
     if compress:
-        T, S, V, r = haroldsvd(Cc, also_rank=True)
-        return S.dot(V.T), T, r
+        Cc = T.T @ Cc
+        Cc[r:, :] = 0.
 
-    T, *_, r = haroldsvd(Cc, also_rank=True)
     return Cc, T, r
 
 def kalman_observability(G, compress=False):
     """
-    Computes the Kalman observability related objects. The algorithm
-    is the literal computation of the observability matrix with increasing
-    powers of A. Numerically, this test is not robust and prone to errors if
-    the A matrix is not well-conditioned or too big as at each additional
-    power of A the entries blow up or converge to zero rapidly.
+    Computes the Kalman observability related objects. The observability
+    matrix is the literal stacking of the blocks with increasing powers of
+    A. Numerically, this matrix is not robust and prone to errors if the A
+    matrix is not well-conditioned or too big as at each additional power
+    of A the entries blow up or converge to zero rapidly.
+
+    Hence, as in ``kalman_controllability``, the rank and the
+    transformation matrix are computed with a block Krylov iteration on the
+    dual system instead.
 
     Parameters
     ----------
@@ -100,9 +115,9 @@ def kalman_observability(G, compress=False):
     Co : {(n,nxm)} 2D numpy array
         Kalman observability matrix
     T : (n,n) 2D numpy arrays
-        The transformation matrix such that T^T * Cc is row compressed
-        and the number of zero rows on the right corresponds to the number
-        of unobservable modes.
+        The orthogonal transformation matrix such that Co * T is column
+        compressed and the number of zero columns on the right corresponds
+        to the number of unobservable modes.
     r: integer
         Numerical rank of the observability matrix
 
@@ -115,19 +130,21 @@ def kalman_observability(G, compress=False):
     else:
         A, C = mats
 
-    n = A.shape[0]
-    Co = C.copy()
-
+    p, n = C.shape
+    Co = np.empty((n*p, n))
+    Co[:p, :] = C
     for i in range(1, n):
-        Co = np.vstack((Co, C.dot(np.linalg.matrix_power(A, i))))
+        Co[i*p:(i+1)*p, :] = Co[(i-1)*p:i*p, :] @ A
+
+    T, r = _block_arnoldi(A.T, C.T, complete=True)
 
     if compress:
-        T, S, V, r = haroldsvd(Co, also_rank=True)
-        return T.dot(S), V.T, r
+        Co = Co @ T
+        Co[:, r:] = 0.
 
-    *_, T, r = haroldsvd(Co, also_rank=True)
     return Co, T, r
 
+
 def kalman_decomposition(G,compute_T=False,output='system',cleanup_threshold=1e-9):
     """
     By performing a sequence of similarity transformations the State
@@ -160,15 +177,15 @@ def kalman_decomposition(G,compute_T=False,output='system',cleanup_threshold=1e-
 
         Is it Kalman Cont'ble ?  False
         Is it Kalman Obsv'ble ?  False
-        [[ 2.          0.         -1.41421356]
-         [ 7.07106781 -3.         -7.        ]
+        [[ 2.          0.          1.41421356]
+         [-7.07106781 -3.         -7.        ]
          [ 0.          0.          2.        ]]
 
-        [[-1.]
+        [[ 1.]
          [ 0.]
          [ 0.]]
 
-        [[-1.  0.  0.]]
+        [[ 1.  0.  0.]]
 
         The minimal system matrices are:
          [[ 2.]] [[ 1.]] [[ 1.]]
@@ -261,7 +278,7 @@ def kalman_decomposition(G,compute_T=False,output='system',cleanup_threshold=1e-
     if do_separate_obsv:
         To_co = kalman_observability((aco,cco))[1]
         To_uco = kalman_observability((auco,cuco))[1]
-        To = sp.linalg.block_diag(To_co,To_uco)
+        To = block_diag(To_co,To_uco)
     else:
         if not is_kalman_observable((ac,cc)):
             To , r = kalman_observability((ac,cc))[1:]
@@ -296,6 +313,12 @@ def is_kalman_controllable(G):
     Tests the rank of the Kalman controllability matrix and compares it
     with the A matrix size, returns a boolean depending on the outcome.
 
+    For State() models, the Popov-Belevitch-Hautus (PBH) test is tried first
+    with the eigendecomposition of A that is kept on the model, i.e., no
+    left eigenvector of A should be orthogonal to B. If the eigenvalues are
+    not well separated or the decision is borderline, the rank is found
+    with the block Krylov iteration that stops at the rank saturation.
+
     Parameters
     ----------
 
@@ -312,21 +335,22 @@ def is_kalman_controllable(G):
     if sys_flag:
         A = G.a
         B = G.b
+        test_bool = _pbh_test(G, B, left=True)
+        if test_bool is not None:
+            return test_bool
     else:
         A , B = mats
 
-    r = kalman_controllability((A,B))[-1]
-
-    if A.shape[0] > r:
-        return False
-
-    return True
+    return A.shape[0] == _block_arnoldi(A, B, complete=True)[1]
 
 def is_kalman_observable(G):
     """
     Tests the rank of the Kalman observability matrix and compares it
     with the A matrix size, returns a boolean depending on the outcome.
 
+    As in ``is_kalman_controllable``, State() models are first tested with
+    the PBH test, i.e., no eigenvector of A should be in the nullspace of C.
+
     Parameters
     ----------
 
@@ -345,12 +369,53 @@ def is_kalman_observable(G):
     if sys_flag:
         A = G.a
         C = G.c
+        test_bool = _pbh_test(G, C, left=False)
+        if test_bool is not None:
+            return test_bool
     else:
         A , C = mats
 
-    r = kalman_observability((A,C))[-1]
+    return A.shape[0] == _block_arnoldi(A.T, C.T, complete=True)[1]
+
+
+def _pbh_test(G, M, left):
+    """
+    PBH test with the cached eigendecomposition of the A matrix of the State
+    model G. If ``left`` is True, the left eigenvectors are tested against
+    ``M = B`` and otherwise the right eigenvectors against ``M = C``.
+
+    The distance of each eigenvector from the nullspace of M bounds the
+    perturbation of M that makes that mode uncontrollable (unobservable).
+    Returns False if any distance is at the rounding level, True if all are
+    clearly away from it and None if the eigenvectors are not reliable or
+    the decision is borderline.
+    """
+    w, V = G._factorization('eig')
+    n = w.size
+    eps = np.finfo(float).eps
+    scale = max(norm(G.a, 1), norm(M, 1))
+
+    # Eigenvectors of the (nearly) repeated eigenvalues are not unique
+    if n > 1:
+        gaps = np.abs(w[:, None] - w[None, :])
+        gaps[np.diag_indices(n)] = np.inf
+        if gaps.min() < np.sqrt(eps)*scale:
+            return None
+
+    try:
+        if cond(V) > 1/np.sqrt(eps):
+            return None
+        if left:
+            W = np.linalg.inv(V)
+            dist = norm(W @ M, axis=1) / norm(W, axis=1)
+        else:
+            dist = norm(M @ V, axis=0) / norm(V, axis=0)
+    except LinAlgError:
+        return None
 
-    if A.shape[0] > r:
+    if dist.min() <= 100*n*eps*scale:
         return False
+    elif dist.min() > np.sqrt(eps)*scale:
+        return True
 
-    return True
+    return None
@@ -0,0 +1,211 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import struct
+import zipfile
+import numpy as np
+from ._classes import Transfer, State, DescriptorState
+
+__all__ = ['save_models', 'load_models']
+
+# The model kinds in the index table
+_KINDS = (State, Transfer, DescriptorState)
+# Columns of the index table
+_KIND, _N, _P, _M, _DATA_OFS, _DATA_LEN, _DEG_OFS = range(7)
+
+
+def save_models(file, models):
+    """
+    Saves the given State(), DescriptorState() and Transfer() models into a
+    single uncompressed NPZ file.
+
+    Only the system data is stored and not the computed properties such as
+    poles and zeros. All numerical data of all models are concatenated into
+    a single contiguous ``data`` array and an integer ``index`` table holds
+    the kind, size and the location of each model in that array. The
+    polynomial lengths of the Transfer() entries are kept in a separate
+    ``degrees`` array and the sampling periods in ``dt`` (``NaN`` for the
+    continuous time models and ``0.`` for the ones with unspecified sampling
+    period, i.e., ``dt=True``).
+
+    Since the file is not compressed, ``load_models`` can memory-map the
+    ``data`` array and pull out individual models without reading the rest
+    of the file.
+
+    Parameters
+    ----------
+    file : str or file
+        The file name or a writable file object
+    models : iterable
+        The models to be saved
+
+    """
+    models = list(models)
+    index = np.zeros((len(models), 7), dtype=np.int64)
+    dts = np.full(len(models), np.nan)
+    data, degrees = [], []
+    data_ofs, deg_ofs = 0, 0
+
+    for ind, G in enumerate(models):
+        if not isinstance(G, _KINDS):
+            raise TypeError('I can only save State, DescriptorState and '
+                            'Transfer models but the model at index {0} is '
+                            'a {1}.'.format(ind, type(G).__qualname__))
+
+        p, m = G.shape
+        if isinstance(G, Transfer):
+            n = 0
+            if G._isSISO:
+                nums, dens = [G.num], [G.den]
+            else:
+                nums, dens = sum(G.num, []), sum(G.den, [])
+            chunk = []
+            for num, den in zip(nums, dens):
+                num = np.atleast_1d(np.asarray(num, dtype=float).ravel())
+                den = np.atleast_1d(np.asarray(den, dtype=float).ravel())
+                degrees += [num.size, den.size]
+                chunk += [num, den]
+        else:
+            n = G.NumberOfStates
+            chunk = [np.asarray(x, dtype=float).ravel() for x in G.matrices]
+
+        chunk = np.concatenate(chunk) if chunk else np.zeros(0)
+        index[ind] = [_KINDS.index(type(G)), n, p, m, data_ofs, chunk.size,
+                      deg_ofs]
+        data += [chunk]
+        data_ofs += chunk.size
+        deg_ofs = len(degrees)
+
+        if G.SamplingSet == 'Z':
+            dts[ind] = G.SamplingPeriod
+
+    np.savez(file,
+             index=index,
+             dt=dts,
+             degrees=np.array(degrees, dtype=np.int64),
+             data=np.concatenate(data) if data else np.zeros(0))
+
+
+def load_models(file, index=None, mmap=False):
+    """
+    Loads the models saved with ``save_models``.
+
+    Parameters
+    ----------
+    file : str or file
+        The file name or a readable file object. For memory-mapping a file
+        name is required.
+    index : {int, sequence of ints, slice, None}, optional
+        If given, only the requested models are built. If an integer is
+        given, the model itself is returned instead of a list.
+    mmap : bool, optional
+        If True, the data array is memory-mapped instead of read hence only
+        the data of the requested models is read from the disk.
+
+    Returns
+    -------
+    models : {list, State, DescriptorState, Transfer}
+        The loaded models
+
+    """
+    with np.load(file) as f:
+        table, dts, degrees = f['index'], f['dt'], f['degrees']
+        if not mmap:
+            data = f['data']
+
+    if mmap:
+        data = _npz_memmap(file, 'data')
+
+    if index is None:
+        idx = range(len(table))
+    elif isinstance(index, (int, np.integer)):
+        idx = [index]
+    else:
+        idx = np.arange(len(table))[index]
+
+    models = [_build_model(table[x], dts[x], degrees, data) for x in idx]
+
+    if isinstance(index, (int, np.integer)):
+        return models[0]
+    return models
+
+
+def _build_model(row, dt, degrees, data):
+    """
+    Creates the model from the given index table row.
+    """
+    kind, n, p, m = [int(x) for x in row[:_DATA_OFS]]
+    ofs, length = int(row[_DATA_OFS]), int(row[_DATA_LEN])
+    chunk = np.array(data[ofs:ofs+length])
+    # dt=True models carry a zero sampling period
+    dt = False if np.isnan(dt) else (float(dt) if dt else True)
+
+    if _KINDS[kind] is Transfer:
+        lengths = degrees[int(row[_DEG_OFS]):int(row[_DEG_OFS])+2*p*m]
+        splits = np.split(chunk, np.cumsum(lengths)[:-1])
+        nums, dens = splits[::2], splits[1::2]
+        if (p, m) == (1, 1):
+            return Transfer(nums[0], dens[0], dt=dt)
+        num = [[nums[r*m+c] for c in range(m)] for r in range(p)]
+        den = [[dens[r*m+c] for c in range(m)] for r in range(p)]
+        return Transfer(num, den, dt=dt)
+
+    shapes = [(n, n), (n, m), (p, n), (p, m)]
+    if _KINDS[kind] is DescriptorState:
+        shapes += [(n, n)]
+    mats = np.split(chunk, np.cumsum([r*c for r, c in shapes])[:-1])
+    mats = [x.reshape(sh) for x, sh in zip(mats, shapes)]
+
+    if _KINDS[kind] is DescriptorState:
+        return DescriptorState(*mats, dt=dt)
+    if n == 0:
+        return State(mats[3], dt=dt)
+    return State(*mats, dt=dt)
+
+
+def _npz_memmap(file, name):
+    """
+    Memory-maps the array ``name`` of an uncompressed NPZ file by locating
+    the array data inside the zip archive.
+    """
+    with zipfile.ZipFile(file) as zf:
+        info = zf.getinfo(name + '.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError('The file is compressed and cannot be memory-'
+                             'mapped. Use mmap=False instead.')
+
+    with open(file, 'rb') as f:
+        # The local file header has variable sized name and extra fields
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(file, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran else 'C')
@@ -0,0 +1,303 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import numpy as np
+from scipy.linalg import schur, solve_triangular, svd
+from ._classes import State
+from ._state_array import StateArray
+
+__all__ = ['AffineState']
+
+
+class AffineState:
+    """
+    A State() model whose system matrices depend affinely on a parameter
+    vector :math:`\\theta \\in \\mathbb{R}^q`, i.e.,
+
+    .. math::
+
+        A(\\theta) = A_0 + \\sum_{i=1}^{q} \\theta_i A_i
+
+    and similarly for :math:`B, C, D`.
+
+    Each system matrix is given either as a 2D array, if it does not depend
+    on :math:`\\theta`, or as a sequence/3D array of ``q+1`` matrices
+    :math:`[X_0, X_1, \\ldots, X_q]`. All parameter dependent matrices
+    should have the same ``q``.
+
+    The model is evaluated over a grid of parameter values in a vectorized
+    fashion by returning a StateArray(). The frequency responses are
+    computed by reusing the complex Schur form of :math:`A_0` and the
+    low-rank structure of :math:`A_1, \\ldots, A_q` (if any) through the
+    Sherman-Morrison-Woodbury identity hence each frequency point costs only
+    a triangular solve for the whole grid.
+    """
+    def __init__(self, a, b, c, d=None, dt=False):
+        (self._a, self._b, self._c, self._d,
+         self._q, self._n, self._shape) = self.validate_arguments(a, b, c, d)
+        self._dt = dt
+        self._lowrank = None
+
+    @property
+    def a(self):
+        """
+        Returns the ``(q+1, n, n)`` array of the :math:`A_i` matrices.
+        """
+        return self._a
+
+    @property
+    def b(self):
+        """
+        Returns the ``(q+1, n, m)`` array of the :math:`B_i` matrices.
+        """
+        return self._b
+
+    @property
+    def c(self):
+        """
+        Returns the ``(q+1, p, n)`` array of the :math:`C_i` matrices.
+        """
+        return self._c
+
+    @property
+    def d(self):
+        """
+        Returns the ``(q+1, p, m)`` array of the :math:`D_i` matrices.
+        """
+        return self._d
+
+    @property
+    def NumberOfParameters(self):
+        """
+        A read only property that holds the number of parameters ``q``.
+        """
+        return self._q
+
+    @property
+    def NumberOfStates(self):
+        """
+        A read only property that holds the number of states.
+        """
+        return self._n
+
+    @property
+    def shape(self):
+        """
+        A read only property that holds the shape of the model as a tuple.
+        """
+        return self._shape
+
+    @property
+    def nominal(self):
+        """
+        Returns the model at :math:`\\theta = 0` as a State().
+        """
+        return State(self._a[0], self._b[0], self._c[0], self._d[0],
+                     dt=self._dt)
+
+    def _theta(self, theta):
+        theta = np.atleast_2d(np.asarray(theta, dtype=float))
+        if theta.shape[1] != self._q:
+            raise ValueError('The model has {0} parameters but the parameter '
+                             'values have {1} columns.'.format(
+                                self._q, theta.shape[1]))
+        # Prepend the constant 1 for the nominal term
+        return np.hstack((np.ones((theta.shape[0], 1)), theta))
+
+    def evaluate(self, theta):
+        """
+        Evaluates the model at the given parameter values.
+
+        Parameters
+        ----------
+        theta : array_like
+            A 1D array of ``q`` many parameter values or a ``(N, q)`` array
+            for ``N`` many parameter points.
+
+        Returns
+        -------
+        G : {State, StateArray}
+            If ``theta`` is 1D, a State() and otherwise a StateArray() of
+            ``N`` many models.
+
+        """
+        t = self._theta(theta)
+        a, b, c, d = [np.tensordot(t, x, axes=1)
+                      for x in (self._a, self._b, self._c, self._d)]
+        if np.ndim(theta) < 2:
+            return State(a[0], b[0], c[0], d[0], dt=self._dt)
+        return StateArray(a, b, c, d, dt=self._dt)
+
+    def poles(self, theta):
+        """
+        Computes the poles at the given parameter points.
+
+        Parameters
+        ----------
+        theta : array_like
+            A ``(N, q)`` array of parameter points.
+
+        Returns
+        -------
+        p : ndarray
+            The ``(N, n)`` array of poles.
+
+        """
+        t = self._theta(theta)
+        return np.linalg.eigvals(np.tensordot(t, self._a, axes=1))
+
+    def norm(self, theta, p=2, **kwargs):
+        """
+        Computes the system norms at the given parameter points. See
+        ``StateArray.norm`` for the details and the keyword arguments.
+        """
+        return self.evaluate(np.atleast_2d(theta)).norm(p=p, **kwargs)
+
+    def _get_lowrank(self):
+        """
+        Decomposes the parameter dependent part of A into low-rank factors
+        and computes the complex Schur form of A0. These are computed once.
+        """
+        if self._lowrank is None:
+            n = self._n
+            us, vs, owner = [], [], []
+            for ind, x in enumerate(self._a[1:]):
+                if not np.any(x):
+                    continue
+                u, s, vh = svd(x)
+                r = np.count_nonzero(s > n * np.spacing(s[0]))
+                us += [u[:, :r]*s[:r]]
+                vs += [vh[:r, :]]
+                owner += [ind + 1]*r
+            if us:
+                U, Vh = np.hstack(us), np.vstack(vs)
+            else:
+                U, Vh = np.zeros((n, 0)), np.zeros((0, n))
+            T, Z = schur(self._a[0], output='complex')
+            self._lowrank = (U, Vh, np.array(owner, dtype=int), T, Z)
+
+        return self._lowrank
+
+    def frequency_response(self, theta, w):
+        """
+        Computes the frequency responses at the given parameter points.
+
+        The :math:`A_0` matrix is brought to the complex Schur form once.
+        Then, at every frequency, the resolvent of :math:`A_0` is applied
+        to all input matrices and the low-rank factors of
+        :math:`A_1, \\ldots, A_q` via a single triangular solve. The
+        parameter dependent parts are then added via the
+        Sherman-Morrison-Woodbury identity which only requires solving
+        ``r x r`` systems for every parameter point where ``r`` is the total
+        rank of the parameter dependent part. If ``r`` is not small compared
+        to ``n``, the stacked StateArray() computations are used instead.
+
+        Parameters
+        ----------
+        theta : array_like
+            A ``(N, q)`` array of parameter points.
+        w : array_like
+            The frequency grid in rad/s. For discrete models the response is
+            evaluated at :math:`z = e^{j\\omega T}`.
+
+        Returns
+        -------
+        fr : ndarray
+            The complex valued ``(N, p, m, len(w))`` frequency response array.
+
+        """
+        t = self._theta(theta)
+        w = np.atleast_1d(np.asarray(w, dtype=float))
+        U, Vh, owner, T, Z = self._get_lowrank()
+        n, (p, m), r = self._n, self._shape, U.shape[1]
+
+        if 2*r > n:
+            return self.evaluate(t[:, 1:]).frequency_response(w=w)[0]
+
+        N, q1 = t.shape
+        # Parameter dependent B, C, D stacks for the whole grid
+        c = np.tensordot(t, self._c, axes=1)
+        d = np.tensordot(t, self._d, axes=1)
+        # Theta multipliers of the low-rank columns (N, r)
+        th_r = t[:, owner]
+        # Stack [B0, B1, ..., Bq, U] and move to the Schur basis
+        rhs = Z.conj().T @ np.hstack(list(self._b) + [U])
+
+        if self._dt:
+            s = np.exp(1j*w*(self._dt if type(self._dt) is not bool else 0.))
+        else:
+            s = 1j*w
+
+        fr = np.empty((len(w), N, p, m), dtype=complex)
+        eye_n, eye_r = np.eye(n), np.eye(r)
+        for ind, val in enumerate(s):
+            X = Z @ solve_triangular(val*eye_n - T, rhs)
+            RB = X[:, :q1*m].reshape(n, q1, m)
+            RU = X[:, q1*m:]
+            # (N, n, m) resolvent times B(theta)
+            x = np.einsum('kj,ijl->kil', t, RB)
+            if r > 0:
+                VRU = Vh @ RU
+                VRB = np.einsum('ri,kil->krl', Vh, x)
+                lhs = eye_r - th_r[:, :, None] * VRU
+                y = np.linalg.solve(lhs, th_r[:, :, None] * VRB)
+                x = x + RU @ y
+            fr[ind] = c @ x
+
+        fr += d
+        return np.moveaxis(fr, 0, -1)
+
+    @staticmethod
+    def validate_arguments(a, b, c, d):
+        """
+        An internal command to validate whether given arguments to an
+        AffineState() instance are valid and compatible. The constant
+        matrices are padded with zeros for the parameter dependent terms.
+        """
+        mats = [np.asarray(x, dtype=float) if x is not None else None
+                for x in (a, b, c, d)]
+
+        q = set([x.shape[0]-1 for x in mats if x is not None and x.ndim == 3])
+        if len(q) > 1:
+            raise ValueError('All parameter dependent matrices should have '
+                             'the same number of terms. I found {0}.'
+                             ''.format(sorted([x+1 for x in q])))
+        q = q.pop() if q else 0
+
+        n = mats[0].shape[-1]
+        p, m = mats[2].shape[-2], mats[1].shape[-1]
+        if mats[3] is None:
+            mats[3] = np.zeros((p, m))
+
+        for ind, (x, sh) in enumerate(zip(mats, ((n, n), (n, m),
+                                                 (p, n), (p, m)))):
+            if x.ndim not in (2, 3) or x.shape[-2:] != sh:
+                raise ValueError('The {0} matrices should be {1}x{2} but '
+                                 'I received an array of shape {3}.'.format(
+                                    'ABCD'[ind], *sh, x.shape))
+            if x.ndim == 2:
+                padded = np.zeros((q+1,) + sh)
+                padded[0] = x
+                mats[ind] = padded
+
+        return mats + [q, n, (p, m)]
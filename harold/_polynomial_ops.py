@@ -22,14 +22,18 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import warnings
 import numpy as np
-import collections
+import collections.abc
 from scipy.signal import deconvolve
-from scipy.linalg import block_diag, lu
-from ._aux_linalg import haroldsvd, e_i
+from scipy.linalg import block_diag, norm, matrix_balance
+from scipy.fft import next_fast_len
+from ._aux_linalg import (e_i, _block_arnoldi, pair_complex_numbers,
+                          _hessenberg_charpoly)
 
 __all__ = ['haroldlcm', 'haroldgcd', 'haroldcompanion', 'haroldtrimleftzeros',
-           'haroldpoly', 'haroldpolyadd', 'haroldpolymul', 'haroldpolydiv']
+           'haroldpoly', 'haroldpolyadd', 'haroldpolymul', 'haroldpolydiv',
+           'haroldpolymul_batch']
 
 
 def haroldlcm(*args, compute_multipliers=True, cleanup_threshold=1e-9):
@@ -43,14 +47,26 @@ def haroldlcm(*args, compute_multipliers=True, cleanup_threshold=1e-9):
     of LCM and a list, of which entries are the polynomial
     multipliers to arrive at the LCM of each input element.
 
-    For the multiplier computation, a variant of Karcanias, Mitrouli,
+    The LCM is computed via a variant of Karcanias, Mitrouli,
     *System theoretic based characterisation and computation of the
-    least common multiple of a set of polynomials*, Lin Alg App, 381, 2004,
-    is used.
+    least common multiple of a set of polynomials*, Lin Alg App, 381, 2004.
+    However, instead of forming the controllability matrix, the orthogonal
+    Krylov basis is generated via Arnoldi iterations and the iteration is
+    stopped at the rank drop. Then the LCM is the characteristic polynomial
+    of the resulting Hessenberg matrix. The multipliers are obtained by
+    solving the convolution equations in the least squares sense.
+
+    Since the rank drop of the Krylov basis is hard to detect for closely
+    spaced roots, the companion matrices are balanced first and the rank
+    decisions are tried from loose to tight tolerances. The first candidate
+    that is divisible by all arguments is returned. If there is none, a
+    ``RuntimeWarning`` is emitted and the product of the distinct arguments
+    is returned, which is a common multiple but not necessarily the least.
 
     Parameters
     ----------
     args : 1D Numpy array
+        The polynomials. 2D row arrays are also accepted.
     compute_multipliers : boolean, optional
         After the computation of the LCM, this switch decides whether the
         multipliers of the given arguments should be computed or skipped.
@@ -92,124 +108,102 @@ def haroldlcm(*args, compute_multipliers=True, cleanup_threshold=1e-9):
 
     """
     # As typical, it turns out that the minimality and c'ble subspace for
-    # this is done already (Karcanias, Mitrouli, 2004). They also have a
-    # clever extra step for the multipliers thanks to the structure of
-    # adjoint which I completely overlooked.
+    # this is done already (Karcanias, Mitrouli, 2004). The LCM is the
+    # minimal polynomial of b w.r.t. the block diagonal companion matrix.
+    # Instead of the Krylov matrix and repeated rank computations, we run
+    # Arnoldi on it which stops at the rank drop. Then the LCM is the
+    # characteristic polynomial of the resulting Hessenberg matrix.
     if not all([isinstance(x, type(np.array([0]))) for x in args]):
         raise TypeError('Some arguments are not numpy arrays for LCM')
 
+    # Also accept 2D row arrays as in Transfer() entries
+    args = [haroldtrimleftzeros(np.asarray(x, dtype=float).ravel())
+            for x in args]
+
     # Remove if there are constant polynomials but return their multiplier!
     poppedargs = tuple([x for x in args if x.size > 1])
-    # Get the index number of the ones that are popped
-    poppedindex = tuple([ind for ind, x in enumerate(args) if x.size == 1])
-    a = block_diag(*tuple(map(haroldcompanion, poppedargs)))  # Companion A
-    b = np.concatenate(tuple(map(lambda x: e_i(x-1, -1),
-                                 [z.size for z in poppedargs])))  # Companion B
-    c = block_diag(*tuple(map(lambda x: e_i(x-1, 0).T,
-                              [z.size for z in poppedargs])))
-    n = a.shape[0]
-
-    # TODO: Below two lines feel like matlab programming, revisit again
-    C = b
-    i = 1
-    # Computing full c'bility matrix is redundant we just need to see where
-    # the rank drop is (if any!).
-    # Also due matrix power, things grow too quickly.
-    while np.linalg.matrix_rank(C) == C.shape[1] and i <= n:
-        C = np.hstack((C, np.linalg.matrix_power(a, i).dot(b)))
-        i += 1
-    s, v = haroldsvd(C)[1:]
-    temp = s.dot(v)
-    # If not coprime we should "expect" zero rows at the bottom
-
-    if i-1 == n:  # Relatively coprime
-        temp2 = np.linalg.inv(temp[:, :-1])  # Every col until the last
-    else:
-        temp2 = block_diag(np.linalg.inv(temp[:i-1, :i-1]), np.eye(n+1-i))
 
-    lcmpoly = temp2.dot(-temp)[:i-1, -1]
-    # Add monic coefficient and flip
-    lcmpoly = np.append(lcmpoly, 1)[::-1]
+    if len(poppedargs) == 1:
+        lcmpoly = poppedargs[0] / poppedargs[0][0]
+    elif poppedargs:
+        lcmpoly = _lcm_arnoldi(poppedargs)
+    else:
+        lcmpoly = np.array([1.])
 
     if compute_multipliers:
-        a_lcm = haroldcompanion(lcmpoly)
-        b_lcm = np.linalg.pinv(C[:c.shape[1], :-1]).dot(b)
-        c_lcm = c.dot(C[:c.shape[1], :-1])
-
-        # adj(sI-A) formulas with A being a companion matrix
-        # We need an array container so back to list of lists
-        n_lcm = a_lcm.shape[0]
-        # Create a list of lists of lists with zeros
-        adjA = [[[0]*n_lcm for m in range(n_lcm)] for n in range(n_lcm)]
-
-        # looping fun
-        for x in range(n_lcm):
-            # Diagonal terms
-            adjA[x][x][:n_lcm-x] = list(lcmpoly[:n_lcm-x])
-            for y in range(n_lcm):
-                if y < x:  # Upper Triangular terms
-                    adjA[y][x][x-y:] = adjA[x][x][:n_lcm-(x-y)]
-                elif y > x:  # Lower Triangular terms
-                    adjA[y][x][n_lcm-y:n_lcm+1-y+x] = list(
-                                                        -lcmpoly[-x-1:n_lcm+1])
-
-        """
-        Ok, now get C_lcm * adj(sI-A_lcm) * B_lcm
-
-        Since we are dealing with lists we have to fake a matrix multiplication
-        with an evil hack. The reason is that, entries of adj(sI-A_lcm) are
-        polynomials and numpy doesn't have a container for such stuff hence we
-        store them in Python "list" objects and manually perform elementwise
-        multiplication.
-
-        Middle three lines take the respective element of b vector and
-        multiplies the column of list of lists. Hence we actually obtain
-
-                    adj(sI-A_lcm) * blockdiag(B_lcm)
-
-        The resulting row entries are added to each other to get
-        adj(sI-A)*B_lcm. Finally, since we now have a single column we can
-        treat polynomial entries as matrix entries hence multiplied with c
-        matrix properly.
-
-        """
-        mults = c_lcm.dot(
-            np.vstack(
-                tuple(
-                    [haroldpolyadd(*w, trimzeros=False) for w in
-                        tuple(
-                            [
-                              [
-                                [b_lcm[y, 0]*z for z in adjA[y][x]]
-                                for y in range(n_lcm)] for x in range(n_lcm)
-                            ]
-                          )
-                     ]
-                 )
-                 )
-               )
-
-        # If any reinsert lcm polynomial for constant polynomials
-        if not poppedindex == ():
-            dummyindex = 0
-            dummymatrix = np.zeros((len(args), lcmpoly.size))
-            for x in range(len(args)):
-                if x in poppedindex:
-                    dummymatrix[x, :] = lcmpoly
-                    dummyindex += 1
-                else:
-                    dummymatrix[x, 1:] = mults[x-dummyindex, :]
-            mults = dummymatrix
-
+        mults = [_polynomial_quotient(lcmpoly, x) for x in args]
         lcmpoly[abs(lcmpoly) < cleanup_threshold] = 0.
-        mults[abs(mults) < cleanup_threshold] = 0.
+        for x in mults:
+            x[abs(x) < cleanup_threshold] = 0.
         mults = [haroldtrimleftzeros(z) for z in mults]
         return lcmpoly, mults
     else:
+        lcmpoly[abs(lcmpoly) < cleanup_threshold] = 0.
         return lcmpoly
 
 
-def haroldgcd(*args):
+def _lcm_arnoldi(polys, res_tol=1e-8):
+    """
+    Computes the monic LCM of nonconstant polynomials as the characteristic
+    polynomial of the Hessenberg matrix of the block Arnoldi iteration on
+    the balanced block diagonal companion matrix. See ``haroldlcm``.
+    """
+    a = block_diag(*tuple(map(haroldcompanion, polys)))
+    b = np.concatenate(tuple([e_i(z.size-1, -1) for z in polys]))
+    # Similarity keeps the Krylov dimension but fixes the scaling
+    _, (sc, _) = matrix_balance(a, permute=False, separate=True)
+    a, b = a / sc[:, None] * sc[None, :], b / sc[:, None]
+    monics = [x / x[0] for x in polys]
+
+    for tol in (1e-6, 1e-8, 1e-10, 1e-12):
+        H = _block_arnoldi(a, b, tol=tol)[1]
+        lcmpoly = _hessenberg_charpoly(np.triu(H, -1))
+        if all([_division_residual(lcmpoly, x) < res_tol for x in monics]):
+            return lcmpoly
+
+    warnings.warn('The LCM could not be verified to be divisible by all '
+                  'arguments, typically due to high degree polynomials or '
+                  'clustered roots. The product of the distinct arguments '
+                  'is returned instead.', RuntimeWarning)
+    distinct = {x.tobytes(): x for x in monics}
+    return haroldpolymul(*distinct.values())
+
+
+def _division_residual(dividend, divisor):
+    """
+    Returns the root mean square of the coefficientwise relative residual
+    of the division of the polynomials, or ``inf`` if the divisor has a
+    higher degree.
+    """
+    if dividend.size < divisor.size:
+        return np.inf
+    q = _polynomial_quotient(dividend, divisor)
+    w = 1 / np.maximum(np.abs(dividend), np.abs(dividend).max()*1e-14)
+    return norm((np.convolve(divisor, q) - dividend) * w) / np.sqrt(
+                                                            dividend.size)
+
+
+def _polynomial_quotient(dividend, divisor):
+    """
+    Computes the exact quotient of two polynomials, known to be divisible,
+    as the least squares solution of the convolution equations
+    :math:`T(divisor) q = dividend`. Compared to the long division, the
+    error is not accumulated over the coefficients. The equations are
+    scaled with the dividend coefficients to balance the relative errors.
+    """
+    k = dividend.size - divisor.size + 1
+    if divisor.size == 1:
+        return dividend / divisor[0]
+    T = np.zeros((dividend.size, k))
+    for ind in range(k):
+        T[ind:ind+divisor.size, ind] = divisor
+    # Coefficients can differ in orders of magnitude, hence we weigh the
+    # equations to have the relative errors in the same order.
+    w = 1 / np.maximum(np.abs(dividend), np.abs(dividend).max()*1e-14)
+    return np.linalg.lstsq(T * w[:, None], dividend * w, rcond=None)[0]
+
+
+def haroldgcd(*args, also_residual=False, rank_tol=None):
     """
     Takes 1D numpy arrays and computes the numerical greatest common
     divisor polynomial. The polynomials are assumed to be in decreasing
@@ -218,16 +212,38 @@ def haroldgcd(*args):
     Returns a numpy array holding the polynomial coefficients
     of GCD. The GCD does not cancel scalars but returns only monic roots.
     In other words, the GCD of polynomials :math:`2` and :math:`2s+4` is
-    still computed as :math:`1`.
+    still computed as :math:`1`. Zero polynomials are divisible by any
+    polynomial hence they are skipped.
+
+    The degree of the GCD is the rank deficiency of the generalized
+    Sylvester matrix of the arguments, which is detected via its singular
+    values. Then the cofactors are computed from the null space of the
+    Sylvester subresultant matrix of that degree and the GCD is obtained
+    from the cofactors via least squares followed by a few Gauss-Newton
+    refinement steps. Since this is a numerical procedure, the largest
+    relative residual of the factorizations of the arguments can be
+    returned as a certificate of the quality of the result. If this residual
+    is larger than :math:`\sqrt{\varepsilon}`, the computed factor is not
+    trusted; a ``RuntimeWarning`` is emitted and :math:`1` is returned.
 
     Parameters
     ----------
     args : 1D Numpy arrays
+    also_residual : bool, optional
+        If True, the largest relative residual of the divisions of the
+        arguments by the computed GCD is also returned. A small value, say
+        below :math:`10^{-8}`, means that the result is indeed a common
+        divisor.
+    rank_tol : float, optional
+        The relative threshold for the singular values of the Sylvester
+        matrix. If omitted, ``max(S.shape) * eps`` times the largest singular
+        value is used, as in ``numpy.linalg.matrix_rank``.
 
     Returns
     --------
-
     gcdpoly : 1D Numpy array
+    residual : float
+        Returned only if ``also_residual`` is True.
 
     Example
     -------
@@ -240,101 +256,145 @@ def haroldgcd(*args):
         >>>> a
              array([ 1.,  2.])
 
-
-    .. warning:: It uses the LU factorization of the Sylvester matrix.
-                 Use responsibly. It does not check any certificate of
-                 success by any means (maybe it will in the future).
-                 I have played around with ERES method but probably due
-                 to my implementation, couldn't get satisfactory results.
-                 Hence I've switched to matrix-based methods. I am still
-                 interested in better methods though, so please contact
-                 me if you have a working implementation that improves
-                 over this.
-
     """
     if not all([isinstance(x, type(np.array([0]))) for x in args]):
         raise TypeError('Some arguments are not numpy arrays for GCD')
 
-    not_1d_err_msg = ('GCD computations require explicit 1D '
-                      'numpy arrays or\n2D but having one of '
-                      'the dimensions being 1 e.g., (n,1) or (1,n)\narrays.')
-    try:
-        regular_args = [haroldtrimleftzeros(
-                            np.atleast_1d(np.squeeze(x))
-                            ) for x in args]
-    except:
-        raise ValueError(not_1d_err_msg)
-
-    try:
-        dimension_list = [x.ndim for x in regular_args]
-    except AttributeError:
-        raise ValueError(not_1d_err_msg)
+    regular_args = [haroldtrimleftzeros(np.atleast_1d(np.squeeze(x)))
+                    for x in args]
+    # Zero polynomials are neutral
+    regular_args = [x.astype(float) for x in regular_args if np.any(x)]
 
-    # do we have 2d elements?
-    if max(dimension_list) > 1:
-        raise ValueError(not_1d_err_msg)
+    def _return(gcdpoly, res=0.):
+        return (gcdpoly, res) if also_residual else gcdpoly
 
-    degree_list = np.array([x.size - 1 for x in regular_args])
-    max_degree = np.max(degree_list)
-    max_degree_index = np.argmax(degree_list)
+    if not regular_args:
+        return _return(np.array([0.]))
 
-    try:
-        # There are polynomials of lesser degree
-        second_max_degree = np.max(degree_list[degree_list < max_degree])
-    except ValueError:
-        # all degrees are the same
-        second_max_degree = max_degree
+    # If a single item is passed then return it back
+    if len(regular_args) == 1:
+        return _return(regular_args[0])
 
-    n, p, h = max_degree, second_max_degree, len(regular_args) - 1
+    degree_list = np.array([x.size - 1 for x in regular_args])
 
-    # If a single item is passed then return it back
-    if h == 0:
-        return regular_args[0]
+    # Constants have no roots
+    if np.min(degree_list) == 0:
+        return _return(np.array([1.]))
 
-    if n == 0:
-        return np.array([1])
-
-    if n > 0 and p == 0:
-        return regular_args.pop(max_degree_index)
-
-    # pop out the max degree polynomial and zero pad
-    # such that we have n+m columns
-    S = np.array([np.hstack((
-            regular_args.pop(max_degree_index),
-            np.zeros((1, p-1)).squeeze()
-            ))]*p)
-
-    # Shift rows to the left
-    for rows in range(S.shape[0]):
-        S[rows] = np.roll(S[rows], rows)
-
-    # do the same to the remaining ones inside the regular_args
-    for item in regular_args:
-        _ = np.array([np.hstack((item, [0]*(n+p-item.size)))]*(
-                      n+p-item.size+1))
-        for rows in range(_.shape[0]):
-            _[rows] = np.roll(_[rows], rows)
-        S = np.r_[S, _]
-
-    rank_of_sylmat = np.linalg.matrix_rank(S)
-
-    if rank_of_sylmat == min(S.shape):
-        return np.array([1])
+    # Put the max degree polynomial first and get the next max degree
+    max_degree_index = np.argmax(degree_list)
+    f0 = regular_args.pop(max_degree_index)
+    n = f0.size - 1
+    p = max([x.size - 1 for x in regular_args])
+
+    # The generalized Sylvester matrix; p shifts of f0 and n shifts of the
+    # others, each block built via fancy indexing
+    S = np.vstack([_shifted_rows(f0, p, n+p)] +
+                  [_shifted_rows(x, n, n+p) for x in regular_args])
+
+    sv = np.linalg.svd(S, compute_uv=False)
+    tol = max(S.shape) * np.spacing(1.) if rank_tol is None else rank_tol
+    rank = np.count_nonzero(sv > tol*sv[0])
+    # The rank deficiency can be overestimated for high degrees but the GCD
+    # cannot be of higher degree than the arguments
+    gcd_degree = min(n + p - rank, np.min(degree_list))
+
+    polys = [f0] + regular_args
+    if gcd_degree == 0:
+        gcdpoly = np.array([1.])
+        res = 0.
     else:
-        p, l, u = lu(S)
-
-    u[abs(u) < 1e-8] = 0
-    for rows in range(u.shape[0]-1, 0, -1):
-        if not any(u[rows, :]):
-            u = np.delete(u, rows, 0)
-        else:
+        try:
+            gcdpoly, res = _gcd_from_cofactors(polys, gcd_degree)
+        except (ValueError, np.linalg.LinAlgError):
+            gcdpoly, res = None, np.inf
+        if not res <= np.sqrt(np.spacing(1.)):
+            warnings.warn('The computed GCD of degree {0} does not divide '
+                          'the arguments (relative residual {1:.2e}) hence '
+                          'the arguments are considered to be coprime and '
+                          '1 is returned. This typically happens for high '
+                          'degree polynomials where the rank of the '
+                          'Sylvester matrix cannot be reliably '
+                          'detected.'.format(gcd_degree, res),
+                          RuntimeWarning)
+            gcdpoly, res = np.array([1.]), 0.
+
+    return _return(gcdpoly, res)
+
+
+def _gcd_from_cofactors(polys, d, maxiter=10):
+    """
+    Given the GCD degree ``d`` of the polynomials, computes the GCD via the
+    cofactors. For :math:`f_0 = g u_0` and :math:`f_i = g u_i`, we have
+    :math:`f_0 u_i - f_i u_0 = 0` and the cofactors are obtained from the
+    one dimensional null space of the stacked Sylvester subresultant
+    matrices of these equations. Then, the GCD is solved from the
+    convolution equations :math:`g u_i = f_i` in the least squares sense
+    and refined with Gauss-Newton iterations on both the GCD and the
+    cofactors, see Z. Zeng, *The approximate GCD of inexact polynomials*,
+    Proc. ISSAC 2004.
+
+    Returns the monic GCD and the largest relative residual
+    :math:`\\|g u_i - f_i\\|/\\|f_i\\|`.
+    """
+    f0, rest = polys[0], polys[1:]
+    k0 = f0.size - d
+    ks = [x.size - d for x in rest]
+    tot = k0 + sum(ks)
+    M = []
+    col = k0
+    for x, k in zip(rest, ks):
+        blk = np.zeros((f0.size + k - 1, tot))
+        blk[:, :k0] = -_shifted_rows(x, k0, x.size + k0 - 1).T
+        blk[:, col:col+k] = _shifted_rows(f0, k, f0.size + k - 1).T
+        col += k
+        M += [blk]
+    v = np.linalg.svd(np.vstack(M))[2][-1]
+    cofactors = np.split(v, np.cumsum([k0] + ks)[:-1])
+
+    T = np.vstack([_shifted_rows(u, d+1, u.size + d).T for u in cofactors])
+    g = np.linalg.lstsq(T, np.concatenate(polys), rcond=None)[0]
+    g /= g[0]
+
+    # Gauss-Newton on the monic g and the cofactors
+    us = [_polynomial_quotient(f, g) for f in polys]
+    ku = np.cumsum([d] + [u.size for u in us])
+
+    def _residuals(g, us):
+        return [f - np.convolve(g, u) for f, u in zip(polys, us)]
+
+    r = _residuals(g, us)
+    res = max([norm(x)/norm(f) for x, f in zip(r, polys)])
+    for _ in range(maxiter):
+        J = np.zeros((sum([f.size for f in polys]), ku[-1]))
+        row = 0
+        for ind, (f, u) in enumerate(zip(polys, us)):
+            J[row:row+f.size, :d] = _shifted_rows(u, d+1, f.size).T[:, 1:]
+            J[row:row+f.size, ku[ind]:ku[ind+1]] = _shifted_rows(
+                                                    g, u.size, f.size).T
+            row += f.size
+        dx = np.linalg.lstsq(J, np.concatenate(r), rcond=None)[0]
+        g_new = g + np.r_[0., dx[:d]]
+        us_new = [u + dx[ku[ind]:ku[ind+1]] for ind, u in enumerate(us)]
+        r_new = _residuals(g_new, us_new)
+        res_new = max([norm(x)/norm(f) for x, f in zip(r_new, polys)])
+        if res_new >= res:
             break
+        g, us, r, res = g_new, us_new, r_new, res_new
 
-    gcdpoly = np.real(haroldtrimleftzeros(u[-1, :]))
-    # make it monic
-    gcdpoly /= gcdpoly[0]
+    return g, res
 
-    return gcdpoly
+
+def _shifted_rows(poly, k, width):
+    """
+    Returns the ``(k, width)`` array whose rows are the successively right
+    shifted copies of ``poly``, i.e., the Toeplitz block of a Sylvester
+    matrix.
+    """
+    rows = np.zeros((k, width))
+    idx = np.arange(k)[:, None] + np.arange(poly.size)[None, :]
+    rows[np.arange(k)[:, None], idx] = poly
+    return rows
 
 
 def haroldcompanion(somearray):
@@ -422,10 +482,34 @@ def haroldtrimleftzeros(somearray):
 
 def haroldpoly(rootlist):
     """
-    Takes a 1D array-like numerical elements as roots and forms the polynomial
+    Takes a 1D array-like numerical elements as roots and forms the monic
+    polynomial.
+
+    The complex conjugate roots are paired via ``pair_complex_numbers`` and
+    each pair is turned into a real quadratic factor. Together with the real
+    roots as linear factors, the sections are multiplied in a balanced
+    product tree via ``haroldpolymul_batch``. Hence, if the roots are
+    closed under conjugation, the result is real without any cleanup. If
+    the roots cannot be paired, the complex valued polynomial is returned.
+
+    The sections are sorted with respect to the real parts of the roots and
+    then placed in bit-reversed order. This way every subtree holds roots
+    from all over the spectrum and the partial products do not blow up with
+    same-signed coefficients that are later cancelled in the final steps.
+
+    Parameters
+    ----------
+    rootlist : array_like
+        The roots of the polynomial
+
+    Returns
+    -------
+    p : ndarray
+        The coefficients of the monic polynomial in decreasing powers
+
     """
-    if isinstance(rootlist, collections.Iterable):
-        r = np.array([x for x in rootlist], dtype=complex)
+    if isinstance(rootlist, collections.abc.Iterable):
+        r = np.array([x for x in rootlist], dtype=complex).ravel()
     else:
         raise TypeError('The argument must be something iterable,\nsuch as '
                         'list, numpy array, tuple etc. I don\'t know\nwhat '
@@ -435,15 +519,46 @@ def haroldpoly(rootlist):
     n = r.size
     if n == 0:
         return np.ones(1)
-    else:
-        p = np.array([0.+0j for x in range(n+1)], dtype=complex)
-        p[0] = 1  # Monic polynomial
-        p[1] = -rootlist[0]
-        for x in range(1, n):
-            p[x+1] = -p[x]*r[x]
-            for y in range(x, 0, -1):
-                p[y] -= p[y-1] * r[x]
-        return p
+
+    try:
+        # Scale the pairing tolerance with the root magnitudes
+        tol = 1e-9 * max(1., np.max(np.abs(r)))
+        paired = np.atleast_1d(pair_complex_numbers(r, tol=tol))
+    except ValueError:
+        # Not conjugate pairs, multiply the complex linear factors
+        sections = np.ones((n, 2), dtype=complex)
+        sections[:, 1] = -r[np.argsort(np.real(r))][_bit_reversal_order(n)]
+        return haroldpolymul_batch(sections, method='direct')[-n-1:]
+
+    isreal = np.abs(np.imag(paired)) < 1e-9
+    reals = np.real(paired[isreal])
+    cplx = paired[~isreal]
+    nr, nc = reals.size, cplx.size // 2
+
+    # Pad the linear factors to the quadratic width
+    sections = np.zeros((nr + nc, 3))
+    sections[:nr, 1] = 1.
+    sections[:nr, 2] = -reals
+    sections[nr:, 0] = 1.
+    sections[nr:, 1] = -np.real(cplx[0::2] + cplx[1::2])
+    sections[nr:, 2] = np.real(cplx[0::2] * cplx[1::2])
+    order = np.argsort(np.r_[reals, np.real(cplx[0::2])])
+    sections = sections[order][_bit_reversal_order(nr + nc)]
+
+    return haroldpolymul_batch(sections, method='direct')[-n-1:]
+
+
+def _bit_reversal_order(n):
+    """
+    Returns the permutation of ``range(n)`` sorted with respect to the
+    bit-reversed indices, e.g., ``[0, 4, 2, 6, 1, 5, 3, 7]`` for ``n=8``.
+    """
+    bits = max(1, int(np.ceil(np.log2(max(n, 1)))))
+    idx = np.arange(n)
+    key = np.zeros(n, dtype=int)
+    for b in range(bits):
+        key |= ((idx >> b) & 1) << (bits - 1 - b)
+    return np.argsort(key)
 
 
 def haroldpolyadd(*args, trimzeros=True):
@@ -468,7 +583,9 @@ def haroldpolymul(*args, trimzeros=True):
     Simple wrapper around the scipy convolve function
     for polynomial multiplication with multiple args.
     The arguments are passed through the left zero
-    trimming function first.
+    trimming function first. If there are more than two
+    arguments, the product is formed via a balanced
+    product tree with ``haroldpolymul_batch``.
 
     Example: ::
 
@@ -477,13 +594,16 @@ def haroldpolymul(*args, trimzeros=True):
 
 
     """
-    # TODO: Make sure we have 1D arrays for convolution
-    # numpy convolve is too picky.
-
     if trimzeros:
         trimmedargs = tuple(map(haroldtrimleftzeros, args))
     else:
-        trimmedargs = args
+        trimmedargs = tuple([np.atleast_1d(np.asarray(x, dtype=float))
+                             for x in args])
+
+    if len(trimmedargs) > 2:
+        p = haroldpolymul_batch(trimmedargs)
+        # The tree is right aligned hence the padding zeros are on the left
+        return p[p.size - sum([x.size - 1 for x in trimmedargs]) - 1:]
 
     p = trimmedargs[0]
 
@@ -496,6 +616,90 @@ def haroldpolymul(*args, trimzeros=True):
     return p
 
 
+def haroldpolymul_batch(a, b=None, method='auto'):
+    """
+    Batched polynomial multiplication.
+
+    If both ``a`` and ``b`` are given, they are stacked polynomial arrays
+    of shapes ``(..., k1)`` and ``(..., k2)`` with the coefficients in
+    decreasing powers along the last axis, and broadcastable leading axes.
+    Then the entrywise products are returned as a ``(..., k1+k2-1)`` array.
+
+    If only ``a`` is given, it is either a ``(k, deg+1)`` array or a
+    sequence of 1D arrays of possibly different lengths, and the product of
+    all of them is returned. The product is formed via a balanced binary
+    tree; at each level all pairs are multiplied in a single batched call.
+    Hence, e.g., the characteristic polynomial can be rebuilt from hundreds
+    of first- and second-order sections in a few vectorized steps. Since
+    the arguments are right aligned with zero padding, the result might
+    have leading zeros.
+
+    Parameters
+    ----------
+    a : array_like
+        Stacked polynomials
+    b : array_like, optional
+        Stacked polynomials
+    method : str, optional
+        ``'direct'`` loops over the coefficients of the shorter polynomials
+        and accumulates the shifted products. ``'fft'`` uses the real FFT
+        of the zero padded arrays. Note that the FFT errors are relative to
+        the largest coefficient hence tiny coefficients of the products
+        might lose relative accuracy. ``'auto'`` selects the FFT if both
+        polynomials have more than 64 coefficients.
+
+    Returns
+    -------
+    p : ndarray
+        The products
+
+    """
+    if method not in ('auto', 'direct', 'fft'):
+        raise ValueError('The method can be "auto", "direct" or "fft" but I '
+                         'received "{0}".'.format(method))
+
+    if b is None:
+        if isinstance(a, np.ndarray) and a.ndim == 2:
+            stack = a.astype(np.result_type(a, float))
+        else:
+            polys = [np.atleast_1d(np.asarray(x)).ravel() for x in a]
+            k = max([x.size for x in polys])
+            stack = np.zeros((len(polys), k),
+                             dtype=np.result_type(*polys, float))
+            for ind, x in enumerate(polys):
+                stack[ind, k-x.size:] = x
+
+        while stack.shape[0] > 1:
+            if stack.shape[0] % 2:
+                # Pad with the unity polynomial
+                unity = np.zeros((1, stack.shape[1]), dtype=stack.dtype)
+                unity[0, -1] = 1.
+                stack = np.vstack((stack, unity))
+            stack = haroldpolymul_batch(stack[0::2], stack[1::2],
+                                        method=method)
+        return stack[0]
+
+    dtype = np.result_type(a, b, float)
+    a, b = np.asarray(a, dtype=dtype), np.asarray(b, dtype=dtype)
+    k1, k2 = a.shape[-1], b.shape[-1]
+    if method == 'fft' or (method == 'auto' and min(k1, k2) > 64):
+        N = next_fast_len(k1 + k2 - 1)
+        if np.iscomplexobj(a):
+            return np.fft.ifft(np.fft.fft(a, N) * np.fft.fft(b, N),
+                               N)[..., :k1+k2-1]
+        return np.fft.irfft(np.fft.rfft(a, N) * np.fft.rfft(b, N),
+                            N)[..., :k1+k2-1]
+
+    # Loop over the shorter one
+    if k2 > k1:
+        a, b, k1, k2 = b, a, k2, k1
+    shape = np.broadcast(a[..., 0], b[..., 0]).shape
+    res = np.zeros(shape + (k1+k2-1,), dtype=dtype)
+    for ind in range(k2):
+        res[..., ind:ind+k1] += a * b[..., ind, None]
+    return res
+
+
 def haroldpolydiv(dividend, divisor):
     """
     Polynomial division wrapped around scipy deconvolve
@@ -510,3 +714,113 @@ def haroldpolydiv(dividend, divisor):
                                 )
 
     return h_factor, h_remainder
+
+
+def _pad_polynomial_matrix(polys, width=None):
+    """
+    Packs the list of lists of polynomial coefficient arrays, e.g., the
+    num, den properties of a MIMO Transfer(), into a single zero padded
+    array of shape ``(p, m, deg+1)``. The coefficients are right aligned
+    such that the leading zeros of the short entries don't change their
+    values and the padded array can be directly evaluated.
+
+    Returns the padded array and the ``(p, m)`` array of the entry degrees.
+    The mask of the actual coefficients can be recovered via ::
+
+        np.arange(deg+1) >= deg - degrees[:, :, None]
+
+    """
+    flat = [[np.atleast_1d(np.asarray(x, dtype=float).ravel()) for x in row]
+            for row in polys]
+    p, m = len(flat), len(flat[0])
+    lens = np.array([[x.size for x in row] for row in flat], dtype=int)
+    k = lens.max() if width is None else max(width, lens.max())
+    coeffs = np.zeros((p, m, k))
+    for r in range(p):
+        for c in range(m):
+            coeffs[r, c, k-lens[r, c]:] = flat[r][c]
+
+    return coeffs, _polynomial_matrix_degrees(coeffs)
+
+
+def _polynomial_matrix_degrees(coeffs):
+    """
+    Returns the degrees of the entries of a padded polynomial matrix. The
+    zero polynomials are assigned the degree 0.
+    """
+    k = coeffs.shape[-1]
+    nonzero = coeffs != 0.
+    first = np.where(nonzero.any(axis=-1), nonzero.argmax(axis=-1), k-1)
+    return k - 1 - first
+
+
+def _unpad_polynomial_matrix(coeffs):
+    """
+    Converts a padded ``(p, m, deg+1)`` polynomial array back to the list of
+    lists of 2D arrays convention of Transfer() by trimming the leading
+    zeros of each entry.
+    """
+    k = coeffs.shape[-1]
+    degrees = _polynomial_matrix_degrees(coeffs)
+    return [[np.atleast_2d(coeffs[r, c, k-1-degrees[r, c]:])
+             for c in range(coeffs.shape[1])]
+            for r in range(coeffs.shape[0])]
+
+
+def _polynomial_matrix_eval(coeffs, s):
+    """
+    Evaluates every entry of the padded ``(p, m, deg+1)`` polynomial array
+    at the points ``s`` via Horner's scheme applied to the whole array at
+    once. Returns a ``(p, m, len(s))`` array.
+    """
+    s = np.atleast_1d(s)
+    res = np.zeros(coeffs.shape[:2] + s.shape, dtype=np.result_type(
+                                                        coeffs, s, float))
+    for ind in range(coeffs.shape[-1]):
+        res *= s
+        res += coeffs[:, :, ind, None]
+    return res
+
+
+def _polynomial_matrix_convolve(a, b):
+    """
+    Entrywise polynomial multiplication of the padded polynomial arrays
+    ``(p, m, k1)`` and ``(p, m, k2)``. Either of the arguments can also be
+    a 1D array which is then used for all entries.
+    """
+    return haroldpolymul_batch(a, b)
+
+
+def _rational_matrix_eval(num, den, s):
+    """
+    Evaluates the padded rational matrix ``num/den`` given as two
+    ``(p, m, k)`` coefficient arrays at the points ``s``, and returns a
+    ``(p, m, len(s))`` array.
+
+    The distinct denominators are evaluated only once and broadcasted to
+    the entries sharing them. Moreover, to avoid the overflow and the loss
+    of accuracy of Horner's scheme for large :math:`|s|`, both polynomials
+    are padded to the same length and the coefficient reversed polynomials
+    are evaluated at :math:`1/s` at those points. The common :math:`s^k`
+    factors cancel out in the ratio.
+    """
+    s = np.atleast_1d(s)
+    k = max(num.shape[-1], den.shape[-1])
+    num = np.pad(num, ((0, 0), (0, 0), (k-num.shape[-1], 0)), 'constant')
+    den = np.pad(den, ((0, 0), (0, 0), (k-den.shape[-1], 0)), 'constant')
+    p, m = den.shape[:2]
+
+    dens, inv = np.unique(den.reshape(-1, k), axis=0, return_inverse=True)
+    big = np.abs(s) > 1
+    res = np.empty((p*m, s.size), dtype=np.result_type(num, s, float))
+    for mask, pts, flip in ((~big, s[~big], False), (big, 1/s[big], True)):
+        if pts.size == 0:
+            continue
+        nn = num.reshape(1, p*m, k)
+        dd = dens[None, :, :]
+        if flip:
+            nn, dd = nn[..., ::-1], dd[..., ::-1]
+        res[:, mask] = (_polynomial_matrix_eval(nn, pts)[0] /
+                        _polynomial_matrix_eval(dd, pts)[0][inv.ravel()])
+
+    return res.reshape(p, m, s.size)
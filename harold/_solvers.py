@@ -447,10 +447,12 @@ def _solve_discrete_generalized_lyapunov(A, E, Y, tol=1e-12):
     return Q @ Xs @ Q.T
 
 
-def _solve_continuous_lyapunov(A, Y):
+def _solve_continuous_lyapunov(A, Y, schur_form=None):
     '''
             Solves A.T X + X A + Y = 0
 
+    If the real Schur form ``(T, Z)`` of A is already known, it can be
+    given with ``schur_form`` to skip the factorization.
     '''
     mat33 = np.zeros((3, 3), dtype=float)
     mat44 = np.zeros((4, 4), dtype=float)
@@ -509,7 +511,7 @@ def _solve_continuous_lyapunov(A, Y):
     if A.shape[0] < 3:
         return mini_sylvester(A, Y)
 
-    As, S = schur(A, output='real')
+    As, S = schur(A, output='real') if schur_form is None else schur_form
     Ys = S.T @ Y @ S
     n = As.shape[0]
 
@@ -578,9 +580,12 @@ def _solve_continuous_lyapunov(A, Y):
     return S @ Xs @ S.T
 
 
-def _solve_discrete_lyapunov(A, Y):
+def _solve_discrete_lyapunov(A, Y, schur_form=None):
     '''
                  Solves     A.T X A - X + Y = 0
+
+    If the real Schur form ``(T, Z)`` of A is already known, it can be
+    given with ``schur_form`` to skip the factorization.
     '''
     mat33 = np.zeros((3, 3), dtype=float)
     mat44 = np.zeros((4, 4), dtype=float)
@@ -635,7 +640,7 @@ def _solve_discrete_lyapunov(A, Y):
     if A.shape[0] < 3:
         return mini_sylvester(A, Y)
 
-    As, S = schur(A, output='real')
+    As, S = schur(A, output='real') if schur_form is None else schur_form
     Ys = S.T @ Y @ S
 
     # If there are nontrivial entries on the subdiagonal, we have a 2x2 block.
@@ -0,0 +1,466 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import numpy as np
+from ._classes import State
+from ._system_props import system_norm
+
+__all__ = ['StateArray']
+
+
+class StateArray:
+    """
+    A container for a bank of ``k`` many State() models that have the same
+    number of states, inputs and outputs, e.g., the results of a parameter
+    sweep or a Monte Carlo run.
+
+    Instead of creating ``k`` many State() objects, the system matrices are
+    stacked along the first axis into ``(k, n, n)``, ``(k, n, m)``,
+    ``(k, p, n)`` and ``(k, p, m)`` arrays. Then the poles, stability,
+    frequency responses and norms of the whole bank are computed with a few
+    large NumPy calls that operate on these stacks.
+
+    If any of the system matrices is given as a 2D array, it is assumed to
+    be shared by all models and broadcasted to the stack. Any individual
+    model can be extracted as a State() via indexing, e.g., ``G[3]``.
+    """
+    def __init__(self, a, b, c, d=None, dt=False):
+
+        self._SamplingPeriod = False
+        self._isstable = None
+
+        *abcd, self._k, self._n, self._shape = self.validate_arguments(
+                                                                    a, b, c, d)
+        self._a, self._b, self._c, self._d = abcd
+        self._p, self._m = self._shape
+        self._isSISO = self._shape == (1, 1)
+        self._isgain = self._n == 0
+        self.SamplingPeriod = dt
+        self._recalc()
+
+    @classmethod
+    def from_models(cls, models):
+        """
+        Stacks the given State() models into a StateArray. The models should
+        have the same shape, number of states and sampling period.
+
+        Parameters
+        ----------
+        models : iterable of State
+            The models to be stacked
+
+        Returns
+        -------
+        G : StateArray
+            The stacked models
+
+        """
+        models = list(models)
+        if not models:
+            raise ValueError('I need at least one State() model to create '
+                             'a StateArray.')
+        if not all([isinstance(x, State) for x in models]):
+            raise TypeError('StateArray.from_models only accepts State() '
+                            'models.')
+
+        G0 = models[0]
+        for G in models[1:]:
+            if G.a.shape != G0.a.shape or G.shape != G0.shape:
+                raise ValueError('All models should have the same number of '
+                                 'states, inputs and outputs. I found a '
+                                 '{0} model with {1} states and a {2} model '
+                                 'with {3} states.'.format(
+                                    G0.shape, G0.NumberOfStates,
+                                    G.shape, G.NumberOfStates))
+            if G.SamplingPeriod != G0.SamplingPeriod:
+                raise ValueError('All models should have the same sampling '
+                                 'period.')
+
+        # Static gains have empty a matrices of various shapes
+        n, (p, m) = G0.NumberOfStates, G0.shape
+        return cls(np.stack([x.a.reshape(n, n) for x in models]),
+                   np.stack([x.b.reshape(n, m) for x in models]),
+                   np.stack([x.c.reshape(p, n) for x in models]),
+                   np.stack([x.d for x in models]),
+                   dt=G0.SamplingPeriod if G0.SamplingSet == 'Z' else False)
+
+    @property
+    def a(self):
+        """
+        Returns the ``(k, n, n)`` stacked :math:`A` matrices.
+        """
+        return self._a
+
+    @property
+    def b(self):
+        """
+        Returns the ``(k, n, m)`` stacked :math:`B` matrices.
+        """
+        return self._b
+
+    @property
+    def c(self):
+        """
+        Returns the ``(k, p, n)`` stacked :math:`C` matrices.
+        """
+        return self._c
+
+    @property
+    def d(self):
+        """
+        Returns the ``(k, p, m)`` stacked :math:`D` matrices.
+        """
+        return self._d
+
+    @property
+    def SamplingPeriod(self):
+        """
+        If this property is called ``G.SamplingPeriod`` then returns the
+        sampling period data. If this property is set to ``False``, the models
+        are assumed to be continuous models. Otherwise, discrete time models
+        are assumed. Upon changing this value, the stability of the models is
+        rechecked.
+        """
+        return self._SamplingPeriod
+
+    @SamplingPeriod.setter
+    def SamplingPeriod(self, value):
+        if value:
+            self._SamplingSet = 'Z'
+            if type(value) is bool:  # integer 1 != True
+                self._SamplingPeriod = 0.
+            elif isinstance(value, (int, float)):
+                self._SamplingPeriod = float(value)
+            else:
+                raise TypeError('SamplingPeriod must be a real scalar.'
+                                'But looks like a \"{0}\" is given.'.format(
+                                 type(value).__name__))
+        else:
+            self._SamplingSet = 'R'
+            self._SamplingPeriod = None
+
+        if self._isstable is not None:
+            self._set_stability()
+
+    @property
+    def SamplingSet(self):
+        """
+        If this property is called ``G.SamplingSet`` then returns the
+        set ``Z`` or ``R`` for discrete and continous models respectively.
+        This is a read only property and cannot be set. Instead an appropriate
+        setting should be given to the ``SamplingPeriod`` property.
+        """
+        return self._SamplingSet
+
+    @property
+    def NumberOfModels(self):
+        """
+        A read only property that holds the number of stacked models.
+        """
+        return self._k
+
+    @property
+    def NumberOfStates(self):
+        """
+        A read only property that holds the number of states of each model.
+        """
+        return self._n
+
+    @property
+    def NumberOfInputs(self):
+        """
+        A read only property that holds the number of inputs.
+        """
+        return self._m
+
+    @property
+    def NumberOfOutputs(self):
+        """
+        A read only property that holds the number of outputs.
+        """
+        return self._p
+
+    @property
+    def shape(self):
+        """
+        A read only property that holds the shape of each model as a tuple.
+        """
+        return self._shape
+
+    @property
+    def poles(self):
+        """
+        Returns the ``(k, n)`` array of the poles. Each row holds the poles
+        of the corresponding model.
+        """
+        return self._poles
+
+    @property
+    def isstable(self):
+        """
+        Returns the boolean ``(k,)`` array of the stability of the models.
+        """
+        return self._isstable
+
+    def __len__(self):
+        return self._k
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            dt = self._SamplingPeriod if self._SamplingSet == 'Z' else False
+            if self._isgain:
+                return State(self._d[index], dt=dt)
+            return State(self._a[index], self._b[index], self._c[index],
+                         self._d[index], dt=dt)
+
+        abcd = [x[index] for x in (self._a, self._b, self._c, self._d)]
+        if abcd[0].ndim != 3:
+            raise IndexError('StateArray can only be indexed with an integer '
+                             'to get a State() or with a slice, a boolean '
+                             'mask or an integer array to get a StateArray.')
+
+        return StateArray(*abcd, dt=self._SamplingPeriod
+                          if self._SamplingSet == 'Z' else False)
+
+    def __repr__(self):
+        return ('{0} {1} StateArray with {2} models of {3} states.'
+                ''.format('Discrete-time' if self._SamplingSet == 'Z'
+                          else 'Continous-time',
+                          self._shape, self._k, self._n))
+
+    def _recalc(self):
+        if self._isgain:
+            self._poles = np.zeros((self._k, 0), dtype=complex)
+        else:
+            self._poles = np.linalg.eigvals(self._a)
+        self._set_stability()
+
+    def _set_stability(self):
+        if self._SamplingSet == 'Z':
+            self._isstable = np.all(1 > np.abs(self._poles), axis=1)
+        else:
+            self._isstable = np.all(0 > np.real(self._poles), axis=1)
+
+    def frequency_response(self, w=None, samples=1000):
+        """
+        Computes the frequency response of all models at the frequencies
+        ``w`` (in rad/s). For continuous models, the response is evaluated
+        at :math:`s = j\\omega` and for discrete models at
+        :math:`z = e^{j\\omega T}`.
+
+        At every frequency point, the resolvents of all models are solved
+        in a single stacked ``numpy.linalg.solve`` call.
+
+        Parameters
+        ----------
+        w : array_like, optional
+            The frequency grid. If omitted, a logarithmically spaced grid is
+            generated from the slowest and fastest pole of the whole bank.
+        samples : int, optional
+            Number of points of the default grid. Ignored if ``w`` is given.
+
+        Returns
+        -------
+        fr : ndarray
+            The complex valued ``(k, p, m, len(w))`` frequency response array.
+        w : ndarray
+            The frequency grid used.
+
+        """
+        if w is None:
+            w = self._default_grid(samples)
+        else:
+            w = np.atleast_1d(np.asarray(w, dtype=float))
+
+        k, n, (p, m) = self._k, self._n, self._shape
+        fr = np.empty((len(w), k, p, m), dtype=complex)
+        if self._isgain:
+            fr[...] = self._d
+        else:
+            if self._SamplingSet == 'Z':
+                s = np.exp(1j*w*self._SamplingPeriod)
+            else:
+                s = 1j*w
+            eye = np.eye(n)
+            for ind, val in enumerate(s):
+                fr[ind] = self._c @ np.linalg.solve(val*eye - self._a,
+                                                    self._b)
+            fr += self._d
+
+        return np.moveaxis(fr, 0, -1), w
+
+    def _default_grid(self, samples):
+        if self._isgain:
+            return np.logspace(-2, 2, samples)
+
+        if self._SamplingSet == 'Z':
+            dt = self._SamplingPeriod
+            nat_freq = np.abs(np.log(self._poles[self._poles != 0]))/dt
+        else:
+            nat_freq = np.abs(self._poles)
+
+        nat_freq = nat_freq[nat_freq > 0]
+        if nat_freq.size == 0:
+            nat_freq = np.array([1.])
+        low = np.floor(np.log10(max(nat_freq.min(), 1e-7))) - 1
+        high = np.ceil(np.log10(nat_freq.max())) + 1
+        if self._SamplingSet == 'Z':
+            high = min(high, np.log10(np.pi/dt))
+        return np.logspace(low, high, samples)
+
+    def norm(self, p=2, w=None, samples=1000):
+        """
+        Computes the system norms of all models.
+
+        For the :math:`\\mathcal{H}_2` norm, the observability grammians are
+        obtained from the stacked eigendecompositions of the :math:`A`
+        matrices. Since this is only reliable for diagonalizable matrices,
+        the models with badly conditioned eigenvectors are handed over to
+        ``system_norm`` individually.
+
+        For the :math:`\\mathcal{H}_\\infty` norm, the largest singular values
+        of the stacked frequency responses are computed on the given grid and
+        the peak of each model is reported. Hence, this is an estimate from
+        below and its quality depends on the grid. Use ``system_norm`` on the
+        individual models if the exact value is needed.
+
+        Parameters
+        ----------
+        p : {2, Inf}
+            The norm type
+        w : array_like, optional
+            The frequency grid for the :math:`\\mathcal{H}_\\infty` estimate.
+        samples : int, optional
+            Number of points of the default grid. Ignored if ``w`` is given.
+
+        Returns
+        -------
+        n : ndarray
+            The ``(k,)`` array of the norms. Unstable models have infinite
+            norms.
+        omega : ndarray
+            Only returned for :math:`\\mathcal{H}_\\infty` norm. The ``(k,)``
+            array of the frequencies where the peaks are found.
+
+        """
+        if p == 2:
+            return self._h2_norm()
+        elif np.isinf(p):
+            fr, w = self.frequency_response(w=w, samples=samples)
+            sv = np.linalg.svd(np.moveaxis(fr, -1, 1),
+                               compute_uv=False)[..., 0]
+            idx = np.argmax(sv, axis=1)
+            nrm = sv[np.arange(self._k), idx]
+            nrm[~self._isstable] = np.Inf
+            return nrm, w[idx]
+        else:
+            raise ValueError('I can only compute the 2 and Inf norms. The '
+                             'p value {0} is not supported.'.format(p))
+
+    def _h2_norm(self):
+        k, n = self._k, self._n
+        nrm = np.full(k, np.Inf)
+        _is_discrete = self._SamplingSet == 'Z'
+        if _is_discrete:
+            dd = np.einsum('kij,kij->k', self._d, self._d)
+        else:
+            dd = np.zeros(k)
+            # Nonzero feedthrough means infinite H2 norm for CT models
+            nonzero_d = np.any(self._d.reshape(k, -1) != 0, axis=1)
+            nrm[nonzero_d] = np.Inf
+
+        cand = self._isstable if _is_discrete else self._isstable & ~nonzero_d
+        if self._isgain:
+            nrm[cand] = np.sqrt(dd[cand])
+            return nrm
+
+        idx = np.flatnonzero(cand)
+        if idx.size == 0:
+            return nrm
+
+        # With A = V L V^-1, the grammian equation is diagonalized as
+        # L Qt + Qt L = -(CV)^T(CV) and trace(B^T Q B) = trace(Bt^T Qt Bt)
+        lam, V = np.linalg.eig(self._a[idx])
+        bad = np.linalg.cond(V) > 1/np.sqrt(np.spacing(1.))
+        Ct = self._c[idx] @ V
+        Bt = np.linalg.solve(V, self._b[idx].astype(complex))
+        M = np.swapaxes(Ct, 1, 2) @ Ct
+        if _is_discrete:
+            Qt = M / (1 - lam[:, :, None]*lam[:, None, :])
+        else:
+            Qt = -M / (lam[:, :, None] + lam[:, None, :])
+        h2 = np.einsum('kij,kij->k', Bt, Qt @ Bt).real + dd[idx]
+        nrm[idx] = np.sqrt(np.abs(h2))
+
+        for x in idx[bad]:
+            nrm[x] = system_norm(self[int(x)], p=2)
+
+        return nrm
+
+    @staticmethod
+    def validate_arguments(a, b, c, d):
+        """
+        An internal command to validate whether given arguments to a
+        StateArray() instance are valid and compatible. 2D arrays are
+        broadcasted to the number of models.
+
+        It also checks if the lists are 3D numpy arrays or can be converted
+        to such arrays.
+        """
+        mats = [np.asarray(x, dtype=float) if x is not None else None
+                for x in (a, b, c, d)]
+
+        if mats[0].ndim != 3:
+            raise ValueError('The A matrices should be given as a (k, n, n) '
+                             'array but I received a {0}-dimensional array.'
+                             ''.format(mats[0].ndim))
+        k, n, n2 = mats[0].shape
+        if n != n2:
+            raise ValueError('The A matrices should be square. I received '
+                             '{0}x{1} matrices.'.format(n, n2))
+
+        for ind, x in enumerate(mats[1:3], 1):
+            if x.ndim not in (2, 3):
+                raise ValueError('The {0} matrices should be given as a 2D or '
+                                 '3D array.'.format('BC'[ind-1]))
+            mats[ind] = np.broadcast_to(x, (k,) + x.shape[-2:]).copy()
+
+        b, c = mats[1:3]
+        if b.shape[1] != n:
+            raise ValueError('The B matrices should have {0} rows but have '
+                             '{1}.'.format(n, b.shape[1]))
+        if c.shape[2] != n:
+            raise ValueError('The C matrices should have {0} columns but '
+                             'have {1}.'.format(n, c.shape[2]))
+        p, m = c.shape[1], b.shape[2]
+
+        if mats[3] is None:
+            mats[3] = np.zeros((k, p, m))
+        else:
+            d = np.atleast_2d(mats[3])
+            if d.shape[-2:] != (p, m):
+                raise ValueError('The D matrices should be {0}x{1} but are '
+                                 '{2}x{3}.'.format(p, m, *d.shape[-2:]))
+            mats[3] = np.broadcast_to(d, (k, p, m)).copy()
+
+        return mats + [k, n, (p, m)]
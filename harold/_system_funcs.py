@@ -21,11 +21,12 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
+from functools import lru_cache
 import numpy as np
 from numpy.linalg import cond, eig, norm
-from scipy.linalg import svdvals, qr, block_diag
+from scipy.linalg import svdvals, qr, block_diag, get_lapack_funcs
 from ._classes import State
-from ._aux_linalg import haroldsvd, matrix_slice, e_i
+from ._aux_linalg import haroldsvd, matrix_slice
 
 
 """
@@ -68,7 +69,8 @@ def concatenate_state_matrices(G):
 
 
 def staircase(A, B, C,
-              compute_T=False, form='c', invert=False, block_indices=False):
+              compute_T=False, form='c', invert=False, block_indices=False,
+              method='qr'):
     """
     The staircase form is used very often to assess system properties.
     Given a state system matrix triplet A,B,C, this function computes
@@ -131,6 +133,14 @@ def staircase(A, B, C,
         zero rows at the bottom. invert option flips this choice either in
         B or C matrices depending on the "form" switch.
     block_indices : bool, optional
+        Whether the controllable/observable block sizes should be returned
+    method : { 'qr', 'svd' }, optional
+        The rank decisions are made either with the QR decomposition with
+        column pivoting or with the SVD of the subdiagonal blocks. The
+        default ``'qr'`` applies the Householder reflectors only to the
+        trailing parts of the matrices that are affected at each step. The
+        ``'svd'`` option is more reliable for the rank decisions but also
+        more expensive.
 
 
     Returns
@@ -161,110 +171,202 @@ def staircase(A, B, C,
         raise ValueError('The "form" key can only take values'
                          '\"c\" or \"o\" denoting\ncontroller- or '
                          'observer-Hessenberg form.')
+    if method not in {'qr', 'svd'}:
+        raise ValueError('The "method" key can only take values "qr" or '
+                         '"svd" but I have received "{}".'.format(method))
     if form == 'o':
         A, B, C = A.T, C.T, B.T
 
-    n = A.shape[0]
-    ub, sb, vb, m0 = haroldsvd(B, also_rank=True)
-    cble_block_indices = np.empty((1, 0))
+    A0, B0, C0, T, cble_block_indices = (_staircase_qr if method == 'qr'
+                                         else _staircase_svd)(A, B, C,
+                                                              compute_T)
 
-    # Trivially  Uncontrollable Case
-    # Skip the first branch of the loop by making m0 greater than n
-    # such that the matrices are returned as is without any computation
-    if m0 == 0:
-        m0 = n + 1
-        cble_block_indices = np.array([0])
+    if invert:
+        A0 = np.fliplr(np.flipud(A0))
+        B0 = np.flipud(B0)
+        C0 = np.fliplr(C0)
+        if compute_T:
+            T = np.fliplr(T)
 
-    # After these, start the regular case
-    if n > m0:  # If it is not a square system with full rank B
+    if form == 'o':
+        A0, B0, C0 = A0.T, C0.T, B0.T
 
-        A0 = ub.T.dot(A.dot(ub))
+    if compute_T:
+        if block_indices:
+            return A0, B0, C0, T, cble_block_indices
+        else:
+            return A0, B0, C0, T
+    else:
+        if block_indices:
+            return A0, B0, C0, cble_block_indices
+        else:
+            return A0, B0, C0
 
-        # Row compress B and consistent zero blocks with the reported rank
-        B0 = sb.dot(vb)
-        B0[m0:, :] = 0.
-        C0 = C.dot(ub)
-        cble_block_indices = np.append(cble_block_indices, m0)
 
-        if compute_T:
-            P = block_diag(np.eye(n-ub.T.shape[0]), ub.T)
-
-        # Since we deal with submatrices, we need to increase the
-        # default tolerance to reasonably high values that are
-        # related to the original data to get exact zeros
-        tol_from_A = n*norm(A, 1)*np.finfo(float).eps
-
-        # Region of interest
-        m = m0
-        ROI_start = 0
-        ROI_size = 0
-
-        for dummy_row_counter in range(A.shape[0]):
-            ROI_start += ROI_size
-            ROI_size = m
-            h1, h2, h3, h4 = matrix_slice(A0[ROI_start:, ROI_start:],
-                                          (ROI_size, ROI_size))
-            uh3, sh3, vh3, m = haroldsvd(h3, also_rank=True,
-                                         rank_tol=tol_from_A)
-
-            # Make sure reported rank and sh3 are consistent about zeros
-            sh3[sh3 < tol_from_A] = 0.
-
-            # If the resulting subblock is not full row or zero rank
-            if 0 < m < h3.shape[0]:
-                cble_block_indices = np.append(cble_block_indices, m)
-                if compute_T:
-                    P = block_diag(np.eye(n-uh3.shape[1]), uh3.T).dot(P)
-                A0[ROI_start:, ROI_start:] = np.r_[np.c_[h1, h2],
-                                                   np.c_[sh3.dot(vh3),
-                                                         uh3.T.dot(h4)]]
-                A0 = A0.dot(block_diag(np.eye(n-uh3.shape[1]), uh3))
-                C0 = C0.dot(block_diag(np.eye(n-uh3.shape[1]), uh3))
-                # Clean up
-                A0[abs(A0) < tol_from_A] = 0.
-                C0[abs(C0) < tol_from_A] = 0.
-            elif m == h3.shape[0]:
-                cble_block_indices = np.append(cble_block_indices, m)
-                break
-            else:
-                break
+def _staircase_qr(A, B, C, compute_T, tol=None):
+    """
+    Computes the controller-Hessenberg form with the QR decompositions with
+    column pivoting. At each step only the current subdiagonal block is
+    factorized and its Householder reflectors are applied directly, without
+    forming the orthogonal factor, to the trailing rows and columns of the
+    working arrays.
 
-        if invert:
-            A0 = np.fliplr(np.flipud(A0))
-            B0 = np.flipud(B0)
-            C0 = np.fliplr(C0)
-            if compute_T:
-                P = np.flipud(P)
+    If ``tol`` is given, the diagonal entries of the pivoted R factors that
+    are below ``tol`` are also treated as zeros.
 
-        if form == 'o':
-            A0, B0, C0 = A0.T, C0.T, B0.T
+    Returns the transformed matrices, the transformation matrix (None if not
+    requested) and the block sizes.
+    """
+    n, m = B.shape
+    A0 = np.array(A, dtype=float)
+    B0 = np.array(B, dtype=float)
+    C0 = np.array(C, dtype=float)
+    T = np.eye(n) if compute_T else None
+
+    if n == 0 or not np.any(B0):
+        return A0, B0, C0, T, np.array([0])
+
+    # The pivoted R diagonals only bracket the singular values and the
+    # rounding errors pile up over the steps hence a looser tolerance than
+    # the SVD variant for the zero blocks
+    tol_from_A = 100*n*norm(A0, 1)*np.finfo(float).eps
+    tol = 0. if tol is None else tol
+    tol_from_A = max(tol_from_A, tol)
+
+    # First, the B matrix itself
+    (h, tau), R, piv = qr(B0, pivoting=True, mode='raw')
+    r = np.abs(np.diag(R))
+    k = np.count_nonzero(r > max(r[0]*max(n, m)*np.finfo(float).eps, tol))
+    if k == 0:
+        return A0, B0, C0, T, np.array([0])
+    elif k == n:
+        return A0, B0, C0, T, np.array([n])
+
+    # Compress B
+    B0[:, :] = 0.
+    B0[:k, piv] = R[:k]
+    A0 = _apply_householder(h, tau, A0, 'L', 'T')
+    A0 = _apply_householder(h, tau, A0, 'R', 'N')
+    C0 = _apply_householder(h, tau, C0, 'R', 'N')
+    if compute_T:
+        T = _apply_householder(h, tau, T, 'R', 'N')
+    blocks = [k]
+
+    # Region of interest ; the block column [c0:r0] and rows below r0
+    c0, r0 = 0, k
+    while r0 < n:
+        (h, tau), R, piv = qr(A0[r0:, c0:r0], pivoting=True, mode='raw')
+        k = np.count_nonzero(np.abs(np.diag(R)) > tol_from_A)
+        if k == 0:
+            break
 
+        A0[r0:, c0:r0] = 0.
+        A0[r0:r0+k, c0+piv] = R[:k]
+        A0[r0:, r0:] = _apply_householder(h, tau, A0[r0:, r0:], 'L', 'T')
+        A0[:, r0:] = _apply_householder(h, tau, A0[:, r0:], 'R', 'N')
+        C0[:, r0:] = _apply_householder(h, tau, C0[:, r0:], 'R', 'N')
         if compute_T:
-            if block_indices:
-                return A0, B0, C0, P.T, cble_block_indices
-            else:
-                return A0, B0, C0, P.T
-        else:
-            if block_indices:
-                return A0, B0, C0, cble_block_indices
-            else:
-                return A0, B0, C0
+            T[:, r0:] = _apply_householder(h, tau, T[:, r0:], 'R', 'N')
 
-    else:  # Square system B full rank ==> trivially controllable
-        cble_block_indices = np.array([n])
-        if form == 'o':
-            A, B, C = A.T, C.T, B.T
+        blocks += [k]
+        c0, r0 = r0, r0 + k
 
-        if compute_T:
-            if block_indices:
-                return A, B, C, np.eye(n), cble_block_indices
-            else:
-                return A, B, C, np.eye(n)
+    return A0, B0, C0, T, np.array(blocks)
+
+
+def _apply_householder(h, tau, c, side, trans):
+    """
+    Multiplies ``c`` with the orthogonal factor of the Householder
+    reflectors ``(h, tau)`` obtained via ``qr(..., mode='raw')``. The side
+    (``'L'``, ``'R'``) and transpose (``'N'``, ``'T'``) flags are passed to
+    LAPACK ``?ormqr``.
+    """
+    if c.size == 0 or tau.size == 0:
+        return c
+    # Wide blocks have fewer reflectors than columns
+    h = h[:, :tau.size]
+    ormqr, = get_lapack_funcs(('ormqr',), (h,))
+    lwork = ormqr(side, trans, h, tau, c, -1)[1][0]
+    cq, _, info = ormqr(side, trans, h, tau, c, max(1, int(lwork)))
+    if info < 0:
+        raise ValueError('LAPACK reported an illegal value in {}-th '
+                         'argument.'.format(-info))
+    return cq
+
+
+def _staircase_svd(A, B, C, compute_T):
+    """
+    Computes the controller-Hessenberg form with the SVDs of the subdiagonal
+    blocks.
+
+    Returns the transformed matrices, the transformation matrix (None if not
+    requested) and the block sizes.
+    """
+    n = A.shape[0]
+    ub, sb, vb, m0 = haroldsvd(B, also_rank=True)
+    cble_block_indices = np.empty((1, 0))
+
+    # Trivially uncontrollable case
+    if m0 == 0:
+        return A, B, C, np.eye(n) if compute_T else None, np.array([0])
+
+    # Square system B full rank ==> trivially controllable
+    if n <= m0:
+        return A, B, C, np.eye(n) if compute_T else None, np.array([n])
+
+    A0 = ub.T.dot(A.dot(ub))
+
+    # Row compress B and consistent zero blocks with the reported rank
+    B0 = sb.dot(vb)
+    B0[m0:, :] = 0.
+    C0 = C.dot(ub)
+    cble_block_indices = np.append(cble_block_indices, m0)
+
+    P = None
+    if compute_T:
+        P = block_diag(np.eye(n-ub.T.shape[0]), ub.T)
+
+    # Since we deal with submatrices, we need to increase the
+    # default tolerance to reasonably high values that are
+    # related to the original data to get exact zeros
+    tol_from_A = n*norm(A, 1)*np.finfo(float).eps
+
+    # Region of interest
+    m = m0
+    ROI_start = 0
+    ROI_size = 0
+
+    for dummy_row_counter in range(A.shape[0]):
+        ROI_start += ROI_size
+        ROI_size = m
+        h1, h2, h3, h4 = matrix_slice(A0[ROI_start:, ROI_start:],
+                                      (ROI_size, ROI_size))
+        uh3, sh3, vh3, m = haroldsvd(h3, also_rank=True,
+                                     rank_tol=tol_from_A)
+
+        # Make sure reported rank and sh3 are consistent about zeros
+        sh3[sh3 < tol_from_A] = 0.
+
+        # If the resulting subblock is not full row or zero rank
+        if 0 < m < h3.shape[0]:
+            cble_block_indices = np.append(cble_block_indices, m)
+            if compute_T:
+                P = block_diag(np.eye(n-uh3.shape[1]), uh3.T).dot(P)
+            A0[ROI_start:, ROI_start:] = np.r_[np.c_[h1, h2],
+                                               np.c_[sh3.dot(vh3),
+                                                     uh3.T.dot(h4)]]
+            A0 = A0.dot(block_diag(np.eye(n-uh3.shape[1]), uh3))
+            C0 = C0.dot(block_diag(np.eye(n-uh3.shape[1]), uh3))
+            # Clean up
+            A0[abs(A0) < tol_from_A] = 0.
+            C0[abs(C0) < tol_from_A] = 0.
+        elif m == h3.shape[0]:
+            cble_block_indices = np.append(cble_block_indices, m)
+            break
         else:
-            if block_indices:
-                return A, B, C, cble_block_indices
-            else:
-                return A, B, C
+            break
+
+    return A0, B0, C0, None if P is None else P.T, cble_block_indices
 
 
 def cancellation_distance(F, G):
@@ -277,6 +379,10 @@ def cancellation_distance(F, G):
 
     Implements the algorithm given in D.Boley SIMAX vol.11(4) 1990.
 
+    The random completion of the pencil is drawn from a generator with a
+    fixed seed and kept for the subsequent calls with the same sizes hence
+    the results are reproducible.
+
     Parameters
     ----------
 
@@ -305,29 +411,52 @@ def cancellation_distance(F, G):
         a disk in the complex plane whose center is on "e_f" and whose
         radius is bounded by this output.
 
+    """
+    upper2, upper1, e_f, V = _cancellation_bounds(F, G)
+    K = cond(V)
+    lower0 = upper2/(K+1)
+    radius = upper2*K
+
+    return upper2, upper1, lower0, e_f, radius
+
+
+def _cancellation_bounds(F, G):
+    """
+    Computes the upper bounds and the eigenvalue of ``cancellation_distance``
+    without the condition number of the eigenvectors which is only needed
+    for the lower bound. Returns ``upper2, upper1, e_f, V``.
     """
     A = np.c_[F, G].T
     n, m = A.shape
-    B = e_i(n, np.s_[:m])
-    D = e_i(n, np.s_[m:])
-    C = qr(2*np.random.rand(n, n-m) - 1, mode='economic')[0]
+    C = _cancellation_completion(n, n-m)
     evals, V = eig(np.c_[A, C])
-    K = cond(V)
     X = V[:m, :]
     Y = V[m:, :]
 
-    upp0 = [0]*n
-    for x in range(n):
-        upp0[x] = norm((C-evals[x]*D).dot(Y[:, x])) / norm(X[:, x])
+    # || (C - e_x D) y_x || / || x_x || for all eigenpairs at once where D
+    # picks the last n-m rows
+    R = C @ Y
+    R[m:, :] -= Y * evals
+    upp0 = norm(R, axis=0) / norm(X, axis=0)
 
-    f = np.argsort(upp0)[0]
+    f = np.argmin(upp0)
     e_f = evals[f]
     upper1 = upp0[f]
-    upper2 = svdvals(A - e_f*B)[-1]
-    lower0 = upper2/(K+1)
-    radius = upper2*K
+    upper2 = svdvals(A - e_f*np.eye(n, m))[-1]
+
+    return upper2, upper1, e_f, V
 
-    return upper2, upper1, lower0, e_f, radius
+
+@lru_cache(maxsize=32)
+def _cancellation_completion(n, k):
+    """
+    Returns a reproducible (n x k) matrix with orthonormal columns that is
+    used as the generic completion in ``cancellation_distance``.
+    """
+    rng = np.random.RandomState(1990)
+    C = qr(2*rng.rand(n, k) - 1, mode='economic')[0]
+    C.flags.writeable = False
+    return C
 
 
 def minimal_realization(A, B, C, mu_tol=1e-9):
@@ -336,12 +465,18 @@ def minimal_realization(A, B, C, mu_tol=1e-9):
     such that the system is controllable and observable within the
     given tolerance :math:`\\mu`.
 
-    Implements a basic two pass algorithm :
-     1- First distance to mode cancellation is computed then also
-     the Hessenberg form is obtained with the identified o'ble/c'ble
-     block numbers. If staircase form reports that there are no
-     cancellations but the distance is less than the tolerance,
-     distance wins and the respective mode is removed.
+    First, the controllable and then the observable staircase forms are
+    computed once and all the uncontrollable/unobservable blocks, i.e.,
+    the ones behind a subdiagonal block with no pivot larger than the
+    tolerance, are deflated in one step. This costs only a few O(n^3)
+    passes regardless of the number of removed states.
+
+    Then the distance to mode cancellation is checked on the result. If the
+    staircase form has missed a nearly cancelling mode, the remaining modes
+    are removed by the basic algorithm: the Hessenberg form is obtained with
+    the identified o'ble/c'ble block numbers and if staircase form reports
+    that there are no cancellations but the distance is less than the
+    tolerance, distance wins and the respective mode is removed.
 
     Uses ``cancellation_distance()`` and ``staircase()`` for the tests.
 
@@ -363,7 +498,32 @@ def minimal_realization(A, B, C, mu_tol=1e-9):
         instead of the original n where (k <= n)
 
     """
+    A, B, C = _minimal_realization_deflate(A, B, C, mu_tol)
+    return _minimal_realization_peel(A, B, C, mu_tol)
 
+
+def _minimal_realization_deflate(A, B, C, mu_tol):
+    """
+    Removes the uncontrollable and then the unobservable parts of the
+    realization in a single staircase pass each.
+    """
+    A, B, C, _, k = _staircase_qr(A, B, C, False, mu_tol)
+    n = int(sum(k))
+    A, B, C = A[:n, :n], B[:n, :], C[:, :n]
+    if n == 0:
+        return A, B, C
+
+    # Observable part via the dual system
+    A, C, B, _, k = _staircase_qr(A.T, C.T, B.T, False, mu_tol)
+    n = int(sum(k))
+    return A.T[:n, :n], B.T[:n, :], C.T[:, :n]
+
+
+def _minimal_realization_peel(A, B, C, mu_tol):
+    """
+    Removes the nearly cancelling modes one block at a time by checking the
+    cancellation distances.
+    """
     keep_looking = True
     run_out_of_states = False
 
@@ -374,8 +534,8 @@ def minimal_realization(A, B, C, mu_tol=1e-9):
             A, B, C = [(np.empty((1, 0)))]*3
             break
 
-        kc = cancellation_distance(A, B)[0]
-        ko = cancellation_distance(A.T, C.T)[0]
+        kc = _cancellation_bounds(A, B)[0]
+        ko = _cancellation_bounds(A.T, C.T)[0]
 
         if min(kc, ko) > mu_tol:  # no cancellation
             keep_looking = False
@@ -420,7 +580,7 @@ def minimal_realization(A, B, C, mu_tol=1e-9):
                             run_out_of_states = True
                             break
                         else:
-                            kc_mod = cancellation_distance(Ac_mod, Bc_mod)[0]
+                            kc_mod = _cancellation_bounds(Ac_mod, Bc_mod)[0]
 
                     kc = kc_mod
                     # Fake an iterable to fool the sum below
@@ -441,7 +601,7 @@ def minimal_realization(A, B, C, mu_tol=1e-9):
                         run_out_of_states = True
                         break
                     else:
-                        ko_mod = cancellation_distance(Ao_mod, Bo_mod)[0]
+                        ko_mod = _cancellation_bounds(Ao_mod, Bo_mod)[0]
 
                 ko = ko_mod
                 blocks_o = [sum(blocks_o)-Ao_mod.shape[0]]
@@ -23,8 +23,11 @@ THE SOFTWARE.
 """
 import numpy as np
 from ._frequency_domain import frequency_response
-from ._classes import Transfer, State, transfer_to_state
-from ._solvers import lyapunov_eq_solver
+from ._classes import Transfer, State, DescriptorState, transfer_to_state
+from ._solvers import (_solve_continuous_lyapunov,
+                       _solve_discrete_lyapunov,
+                       _solve_continuous_generalized_lyapunov,
+                       _solve_discrete_generalized_lyapunov)
 from ._system_funcs import minimal_realization
 from scipy.linalg import solve, eigvals
 
@@ -47,7 +50,10 @@ def system_norm(state_or_transfer,
     norm are understood.
 
     For :math:`\\mathcal{H}_2` norm, the standard grammian definition via
-    controllability grammian, that can be found elsewhere is used.
+    observability grammian, that can be found elsewhere is used. For
+    DescriptorState() models, the generalized Lyapunov equation is solved
+    directly on the :math:`(A, E)` pencil hence :math:`E` is never inverted.
+    However, :math:`E` should be nonsingular for the norm computations.
 
     Currently, the :math:`\\mathcal{H}_\\infty` norm is computed via
     so-called Boyd-Balakhrishnan-Bruinsma-Steinbuch algorithm (See e.g. [2]).
@@ -66,7 +72,7 @@ def system_norm(state_or_transfer,
 
     Parameters
     ----------
-    state_or_transfer : {State,Transfer}
+    state_or_transfer : {State,DescriptorState,Transfer}
         System for which the norm is computed
     p : {int,Inf}
         Whether the rank of the matrix should also be reported or not.
@@ -104,9 +110,9 @@ def system_norm(state_or_transfer,
         (technically this is a numerical approximation of the supremum).
 
     """
-    if not isinstance(state_or_transfer, (State, Transfer)):
-        raise TypeError('The argument should be a State or Transfer. Instead '
-                        'I received {0}'.format(type(
+    if not isinstance(state_or_transfer, (State, DescriptorState, Transfer)):
+        raise TypeError('The argument should be a State, DescriptorState or '
+                        'Transfer. Instead I received {0}'.format(type(
                                     state_or_transfer).__qualname__))
 
     if isinstance(state_or_transfer, Transfer):
@@ -118,6 +124,34 @@ def system_norm(state_or_transfer,
         raise('The p in p-norm is not an integer or float.'
               'If you tried the string \'inf\', use Numpy.Inf instead')
 
+    if isinstance(now_state, DescriptorState):
+        a, b, c, d, e = now_state.matrices
+        if np.linalg.matrix_rank(e) < e.shape[0]:
+            raise ValueError('The E matrix of the descriptor model is '
+                             'singular. I can only compute the norms of the '
+                             'descriptor models with nonsingular E matrices.')
+
+        if p == 2:
+            if not now_state._isstable:
+                return np.Inf
+
+            if now_state.SamplingSet == 'R':
+                if np.any(d):
+                    return np.Inf
+                x = _solve_continuous_generalized_lyapunov(a, e, c.T.dot(c))
+                return np.sqrt(np.trace(b.T.dot(x.dot(b))))
+            else:
+                x = _solve_discrete_generalized_lyapunov(a, e, c.T.dot(c))
+                return np.sqrt(np.trace(b.T.dot(x.dot(b))+d.T.dot(d)))
+        else:
+            # Hinf norm has no generalized variant yet, carry it to State()
+            return system_norm(State(solve(e, a), solve(e, b), c, d,
+                                     now_state.SamplingPeriod),
+                               p=p, validate=validate, verbose=verbose,
+                               max_iter_limit=max_iter_limit,
+                               hinf_tolerance=hinf_tolerance,
+                               eig_tolerance=eig_tolerance)
+
     # Two norm
     if p == 2:
         # Handle trivial infinities
@@ -131,14 +165,19 @@ def system_norm(state_or_transfer,
         if not now_state._isstable:
             return np.Inf
 
+        # The solver convention is X A + A^T X + Y = 0 hence the
+        # observability grammian is obtained directly with (A, C^T C).
+        # The Schur form of A is kept on the model for the later calls.
+        a, b, c, d = now_state.matrices
+        schur_form = now_state._factorization('schur')
         if now_state.SamplingSet == 'R':
-            a, b, c = now_state.matrices[:3]
-            x = lyapunov_eq_solver(a, b.dot(b.T))
-            return np.sqrt(np.trace(c.dot(x.dot(c.T))))
+            if np.any(d):
+                return np.Inf
+            x = _solve_continuous_lyapunov(a, c.T.dot(c), schur_form)
+            return np.sqrt(np.trace(b.T.dot(x.dot(b))))
         else:
-            a, b, c, d = now_state.matrices
-            x = lyapunov_eq_solver(a, b.dot(b.T), form='d')
-            return np.sqrt(np.trace(c.dot(x.dot(c.T))+d.dot(d.T)))
+            x = _solve_discrete_lyapunov(a, c.T.dot(c), schur_form)
+            return np.sqrt(np.trace(b.T.dot(x.dot(b))+d.T.dot(d)))
 
     elif np.isinf(p):
         if not now_state._isstable:
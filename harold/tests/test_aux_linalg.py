@@ -23,6 +23,8 @@ THE SOFTWARE.
 """
 from harold import (haroldsvd, haroldker, pair_complex_numbers,
                     matrix_slice, e_i)
+from harold._aux_linalg import _block_arnoldi, _hessenberg_charpoly
+import numpy as np
 import numpy.testing as npt
 from scipy.linalg import block_diag, qr, solve
 from numpy import fliplr, flipud, array, zeros, s_
@@ -133,3 +135,27 @@ def test_matrix_slice():
     assert_almost_equal(d, array([[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
     for x in (a, b, c):
         assert_equal(x.size, 0)
+
+
+def test_block_arnoldi():
+    # Uncontrollable last state
+    A = np.diag([1., 2., 3., 4.])
+    B = np.array([[1., 0.], [1., 0.], [0., 1.], [0., 0.]])
+    Q, H, blocks = _block_arnoldi(A, B)
+    assert_equal(Q.shape, (4, 3))
+    assert_equal(blocks, [2, 1])
+    assert_almost_equal(Q.T @ Q, np.eye(3))
+    assert_almost_equal(Q @ H, A @ Q)
+    assert_almost_equal(Q[3], zeros(3))
+    Q, r = _block_arnoldi(A, B, complete=True)
+    assert_equal(r, 3)
+    assert_almost_equal(Q.T @ Q, np.eye(4))
+    assert_almost_equal(np.abs(Q[:, 3]), [0., 0., 0., 1.])
+    Q, r = _block_arnoldi(A, np.zeros((4, 1)), complete=True)
+    assert_equal(r, 0)
+    assert_almost_equal(Q, np.eye(4))
+
+
+def test_hessenberg_charpoly():
+    A = np.array([[1., 2., 3.], [4., 5., 6.], [0., 7., 8.]])
+    assert_almost_equal(_hessenberg_charpoly(A), np.poly(A))
@@ -23,7 +23,11 @@ THE SOFTWARE.
 """
 
 import numpy as np
-from harold import Transfer, State, e_i, haroldcompanion, transmission_zeros
+from harold import (Transfer, State, DescriptorState, e_i, haroldcompanion,
+                    transmission_zeros, frequency_response, system_norm,
+                    state_to_transfer, transfer_to_state,
+                    set_conversion_cache_size, transmission_zeros_batch,
+                    minimal_realization)
 from numpy.testing import (assert_equal, assert_array_equal, assert_raises,
                            assert_almost_equal)
 
@@ -131,11 +135,11 @@ def test_Transfer_algebra():
     F = Transfer(num2, den2)
     H = G + F
     # Flatten list of lists via sum( , []) trick
-    Hnum = [np.array([[-1., 5/3, 10/3]]),
+    Hnum = [np.array([[1., -1., -2.]]),
             np.array([[5., 6., 9.]]),
-            np.array([[1., 0.5, -0.5]]),
-            np.array([[1., 3., 0.75, -0.5]]),
-            np.array([[3., -2.]]),
+            np.array([[2., 1., -1.]]),
+            np.array([[-1/4, -1/6, 1/4, -1/6]]),
+            np.array([[1.5, -1.]]),
             np.array([[5., -4., 3., 16.]])
             ]
 
@@ -153,6 +157,67 @@ def test_Transfer_algebra():
         assert_almost_equal(Hden[x], Hden_computed[x])
 
 
+def test_Transfer_padded_arithmetic():
+    G = Transfer([[[1, 2], [1]], [[3], [1, 0, 0]]],
+                 [[[1, 2, 3], [1, 4]], [[1, 1], [1, 2, 3]]])
+    H = Transfer([[[1], [2]], [[3], [4]]],
+                 [[[1, 2, 3], [1, 4]], [[1, 1], [1, 2, 3]]])
+    num_t, den_t = G._polymatrix
+    assert_equal(num_t.shape, (2, 2, 3))
+    assert_array_equal(den_t[0, 1], [0., 1., 4.])
+    assert_array_equal((-G).num[1][1], [[-1., 0., 0.]])
+    F = G + H
+    assert_array_equal(F.num[0][0], [[1., 3.]])
+    assert_array_equal(F.num[1][1], [[1., 0., 4.]])
+    assert_array_equal(F.den[0][1], [[1., 4.]])
+    F = G - G
+    assert F._isgain
+    assert not np.any(F._polymatrix[0])
+
+    # Cancellations keep the sampling period
+    Gd = Transfer(G.num, G.den, dt=0.1)
+    F = Gd - Gd
+    assert_equal(F.SamplingPeriod, 0.1)
+    F = Gd + Transfer([[[-2, -4], [-2]], [[-6], [-2, 0, 0]]],
+                      [[[2, 4, 6], [2, 8]], [[2, 2], [2, 4, 6]]], dt=0.1)
+    assert F._isgain
+    assert_equal(F.SamplingPeriod, 0.1)
+    gd = Transfer(1, [1, 2], dt=0.1)
+    assert_equal((gd - gd).SamplingPeriod, 0.1)
+
+    # Common denominators
+    F = (Transfer([[[1], [2]], [[3], [4]]], [1, 2, 3]) +
+         Transfer([[[1], [1, 1]], [[3], [4]]], [1, 1]))
+    assert_almost_equal(F.num[0][1], [[1., 3., 7., 5.]])
+    assert_almost_equal(F.den[1][0], [[1., 3., 5., 3.]])
+
+    w = np.array([0.5, 2.])
+    fr = frequency_response(G, w)[0]
+    assert_equal(fr.shape, (2, 2, 2))
+    assert_almost_equal(fr[1, 1], (1j*w)**2/((1j*w)**2 + 2j*w + 3))
+
+
+def test_Transfer_MIMO_multiplication():
+    G = Transfer([[[1, 2], [1]], [[3], [1, 0, 0]]],
+                 [[[1, 2, 3], [1, 4]], [[1, 1], [1, 2, 3]]])
+    H = Transfer([[[1], [2]], [[3], [4]]],
+                 [[[2, 2, 3], [1, 4]], [[1, 1], [1, 2, 3]]])
+    w = np.array([0.3, 1.7, 5.])
+    F = G * H
+    assert_almost_equal(frequency_response(F, w)[0],
+                        np.einsum('ikw,kjw->ijw',
+                                  frequency_response(G, w)[0],
+                                  frequency_response(H, w)[0]))
+    # Zero entries don't introduce spurious poles
+    F = G * np.eye(2)
+    assert_array_equal(F.den[0][1], [[1., 4.]])
+    assert_array_equal(F.num[1][1], [[1., 0., 0.]])
+    # Shared denominators are summed without LCM
+    F = Transfer([[[1], [1]]], [1, 1]) * Transfer([[[1]], [[2]]], [1, 2])
+    assert_array_equal(F.num, [[3.]])
+    assert_array_equal(F.den, [[1., 3., 2.]])
+
+
 def test_State_Instantiations():
     assert_raises(TypeError, State)
     G = State(5)
@@ -215,6 +280,91 @@ def test_State_algebra():
                         2*np.eye(3))
 
 
+def test_DescriptorState():
+    a = np.array([[0., 1.], [-2., -3.]])
+    b = np.array([[0.], [1.]])
+    c = np.array([[1., 0.]])
+    e = np.array([[2., 1.], [0., 1.]])
+    G = State(a, b, c)
+    H = DescriptorState(e @ a, e @ b, c, e=e)
+    assert_almost_equal(np.sort(H.poles.real), [-2., -1.])
+    assert H._isstable
+    assert_array_equal(DescriptorState(a, b, c).e, np.eye(2))
+    assert_raises(ValueError, DescriptorState, a, b, c, 0, np.eye(3))
+    w = np.logspace(-2, 2, 20)
+    assert_almost_equal(frequency_response(H, w)[0],
+                        frequency_response(G, w)[0].ravel())
+    assert_almost_equal(system_norm(H, p=2), np.sqrt(1/12))
+    assert_almost_equal(system_norm(H, p=2), system_norm(G, p=2))
+    # Singular E, one infinite eigenvalue is discarded
+    H = DescriptorState(np.diag([-1., -2., 1.]), np.ones((3, 1)),
+                        np.ones((1, 3)), e=np.diag([1., 1., 0.]))
+    assert_almost_equal(np.sort(H.poles.real), [-2., -1.])
+    assert_raises(ValueError, system_norm, H, 2)
+
+
+def test_state_to_transfer():
+    rng = np.random.RandomState(1)
+    a = rng.randn(6, 6) - 4*np.eye(6)
+    b, c, d = rng.randn(6, 3), rng.randn(2, 6), rng.randn(2, 3)
+    num, den = state_to_transfer(State(a, b, c, d), output='polynomials')
+    for s in (0.5j, 1+2j, -3.):
+        H = c @ np.linalg.solve(s*np.eye(6) - a, b) + d
+        Ht = [[np.polyval(num[r][k], s)/np.polyval(den[r][k], s)
+               for k in range(3)] for r in range(2)]
+        assert_almost_equal(Ht, H)
+    # Structurally zero entries and degree drops are detected
+    num, den = state_to_transfer(State(np.diag([-1., -2.]), np.eye(2),
+                                       np.array([[1., 0.], [1., 1.]])),
+                                 output='polynomials')
+    assert_almost_equal(num[0][1], [0.])
+    assert_almost_equal(num[1][0], [1., 2.])
+    assert_almost_equal(den[0][0], [1., 3., 2.])
+    # Defective A falls back to the per-entry conversion
+    num, den = state_to_transfer(State(np.array([[-1., 1.], [0., -1.]]),
+                                       np.array([[0.], [1.]]),
+                                       np.array([[1., 0.]])),
+                                 output='polynomials')
+    assert_almost_equal(np.ravel(num), [1.])
+    assert_almost_equal(np.ravel(den), [1., 2., 1.])
+
+
+def test_transfer_to_state_gilbert():
+    num = [[[1, 0], [1]], [[1], [3, 1, 2]]]
+    den = [[[1, 2, 5], [1, 1]], [[1, 2, 5], [1, 3, 2]]]
+    G = Transfer(num, den)
+    H = transfer_to_state(G)
+    # 2 for the complex pair and one each for -1 and -2
+    assert H.NumberOfStates == 4
+    assert_almost_equal(H.d, [[0., 0.], [0., 3.]])
+    for s in (0.3j, 1+1j, -0.7):
+        R = H.c @ np.linalg.solve(s*np.eye(4) - H.a, H.b) + H.d
+        T = [[np.polyval(num[r][k], s)/np.polyval(den[r][k], s)
+              for k in range(2)] for r in range(2)]
+        assert_almost_equal(R, T)
+    # Rank one residue gives a single state
+    G = Transfer([[[1], [2], [3]], [[2], [4], [6]]], [[[1, 1]]*3]*2)
+    assert transfer_to_state(G).NumberOfStates == 1
+    # Shared complex pair, whose roots differ in the last digits per entry,
+    # gives as many states as the McMillan degree
+    q = [1, 2, 5]
+    num = [[[1, 2], [3]], [[1, -1], [1, 1]]]
+    den = [[np.polymul(q, [1, 1]), np.polymul(q, [1, 3])],
+           [np.polymul(q, [1, 7]), np.polymul(q, [1, 0.5])]]
+    H = transfer_to_state(Transfer(num, den))
+    assert H.NumberOfStates == 8
+    assert minimal_realization(H.a, H.b, H.c)[0].shape == (8, 8)
+    # The pole at -0.5 is cancelled in the last entry
+    num[1][1] = [2, 1]
+    H = transfer_to_state(Transfer(num, den))
+    assert H.NumberOfStates == 7
+    for s in (0.3j, 1+1j, -0.7):
+        R = H.c @ np.linalg.solve(s*np.eye(7) - H.a, H.b) + H.d
+        T = [[np.polyval(num[r][k], s)/np.polyval(den[r][k], s)
+              for k in range(2)] for r in range(2)]
+        assert_almost_equal(R, T)
+
+
 def test_model_zeros():
     # Test example
     A = np.array(
@@ -277,3 +427,185 @@ def test_model_zeros():
     zs = transmission_zeros(A, B, C, D)
     res = np.array([-6.78662791+0.j,  3.09432022+0.j])
     assert_almost_equal(np.sort(zs), np.sort(res))
+
+
+def test_conversion_cache():
+    G = Transfer([[[1, 1], [1]], [[2], [1, 0]]],
+                 [[[1, 3, 2], [1, 2]], [[1, 1], [1, 3, 2]]])
+    H1, H2 = transfer_to_state(G), transfer_to_state(G)
+    assert H1 is not H2
+    assert H1.a is H2.a
+    # Modifying the data invalidates the conversion
+    G.den = [[[1, 3, 2], [1, 4]], [[1, 1], [1, 3, 2]]]
+    H3 = transfer_to_state(G)
+    assert H3.a is not H1.a
+    assert_almost_equal(np.min(H3.poles.real), -4.)
+    F = state_to_transfer(H1)
+    assert state_to_transfer(H1).num[0][0] is F.num[0][0]
+    # The global cache shares the conversion of identical models
+    set_conversion_cache_size(4)
+    try:
+        G1 = Transfer([1, 2], [1, 3, 5])
+        G2 = Transfer([1, 2], [1, 3, 5])
+        assert transfer_to_state(G1).a is transfer_to_state(G2).a
+    finally:
+        set_conversion_cache_size(0)
+    assert_raises(ValueError, set_conversion_cache_size, -1)
+
+
+def test_from_validated():
+    G = State([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]], 0, 0.1)
+    H = State._from_validated(*G.matrices, dt=0.1)
+    assert H.shape == (1, 1)
+    assert not H._isgain
+    assert H.SamplingSet == 'Z'
+    assert_almost_equal(np.sort(H.poles), [-2., -1.])
+    K = State._from_validated(None, None, None, np.eye(2))
+    assert K._isgain
+    assert K.shape == (2, 2)
+    num, den = Transfer.validate_arguments([[[1], [1, 0]]],
+                                           [[[1, 1], [1, 2]]])[:2]
+    T = Transfer._from_validated(num, den)
+    assert T.shape == (1, 2)
+    assert not T._isgain
+    # Arithmetic results are built without the validation
+    assert_almost_equal((-T).num[0][1], [[-1., 0.]])
+    assert_almost_equal((2*H).c, [[2., 0.]])
+    assert_equal((H + H).SamplingPeriod, 0.1)
+
+
+def test_shared_readonly_data():
+    G = State([[0, 1], [-2, -3]], [[0], [1]], [[1, 0]])
+    H = -G
+    assert H.a is G.a
+    assert H.b is G.b
+    assert not hasattr(G, '__dict__')
+    assert_raises(ValueError, G.a.__setitem__, (0, 0), 5.)
+    # Setting replaces the array, the derived model is untouched
+    G.a = [[0, 1], [-5, -3]]
+    assert_array_equal(H.a, [[0, 1], [-2, -3]])
+    T = Transfer([1, 2], [1, 3, 2])
+    assert (-T).den is T.den
+    assert_raises(ValueError, T.num.__setitem__, (0, 0), 5.)
+    assert_raises(AttributeError, setattr, T, 'foo', 1)
+    # The arrays of the caller are copied, not frozen
+    dd, n1 = np.array([[1., 3., 2.]]), np.array([[1.]])
+    T = Transfer(n1, dd)
+    dd[0, 0] = 5.
+    assert_array_equal(T.den, [[1., 3., 2.]])
+    T = Transfer([[n1, n1]], [[dd, dd]])
+    n1[0, 0] = 2.
+    T.num = [[n1, n1]]
+    n1[0, 0] = 3.
+    assert_array_equal(T.num[0][1], [[2.]])
+    a = np.array([[-1.]])
+    G = State(a, a, a, a)
+    G.b = a
+    a[0, 0] = 2.
+    assert_array_equal(G.a, [[-1.]])
+    assert_array_equal(G.b, [[-1.]])
+
+
+def test_model_indexing():
+    rng = np.random.RandomState(0)
+    G = State(rng.randn(5, 5) - 3*np.eye(5), rng.randn(5, 4),
+              rng.randn(3, 5), rng.randn(3, 4))
+    H = G[1, 2]
+    assert H.shape == (1, 1)
+    assert H.a is G.a
+    assert np.shares_memory(H.b, G.b)
+    assert_array_equal(H.c, G.c[[1], :])
+    assert_array_equal(H.d, [[G.d[1, 2]]])
+    assert G[:, [0, 2]].shape == (3, 2)
+    assert G[-1, 1:].shape == (1, 3)
+    assert G[[True, False, True], 0].shape == (2, 1)
+    assert_raises(IndexError, G.__getitem__, (3, 0))
+    assert_raises(IndexError, G.__getitem__, 1)
+    T = state_to_transfer(G)
+    assert T[:2, 1:].shape == (2, 3)
+    assert_almost_equal(T[1, 2].num, state_to_transfer(H).num)
+    assert T[1, 2].den is T.den[1][2]
+
+
+def test_state_factorizations():
+    rng = np.random.RandomState(1)
+    a = rng.randn(6, 6) - 4*np.eye(6)
+    G = State(a, rng.randn(6, 2), rng.randn(3, 6), rng.randn(3, 2))
+    T, Z = G._factorization('schur')
+    assert_almost_equal(Z @ T @ Z.T, a)
+    assert G._factorization('schur')[0] is T
+    assert not T.flags.writeable
+    H, Q = G._factorization('hessenberg')
+    assert_almost_equal(Q @ H @ Q.T, a)
+    # Subsystems and negation share the cache
+    assert G[1, :]._factors is G._factors
+    assert (-G)._factors is G._factors
+    # Setting A discards it
+    G.a = a.T
+    assert 'schur' not in G._factors
+    assert_raises(ValueError, G._factorization, 'qr')
+    # Frequency response via the Hessenberg form, including D
+    w = np.array([0.1, 1., 10.])
+    f, _ = frequency_response(G, custom_grid=w)
+    for ind, x in enumerate(w):
+        r = G.c @ np.linalg.solve(1j*x*np.eye(6) - G.a, G.b) + G.d
+        assert_almost_equal(f[:, :, ind], r)
+
+
+def test_transmission_zeros_batch():
+    rng = np.random.RandomState(4)
+    A, B, C = rng.randn(6, 6), rng.randn(6, 3), rng.randn(2, 6)
+    D = rng.randn(2, 3)
+    D[0, 0] = 0.
+    B[:, 1] = 0.
+    z = transmission_zeros_batch(A, B, C, D)
+    for r in range(2):
+        for c in range(3):
+            zz = transmission_zeros(A, B[:, [c]], C[[r], :], D[[r], :][:, [c]])
+            assert_almost_equal(np.sort(np.abs(z[r][c])),
+                                np.sort(np.abs(zz)))
+    assert z[0][1].size == 0
+    assert z[0][0].size == 5
+    assert z[1][2].size == 6
+
+    # The zeros are computed on demand and kept
+    G = State(A, B[:, [0]], C[[1], :], D[[1], :][:, [0]])
+    assert G._zeros is None
+    assert_almost_equal(np.sort(np.abs(G.zeros)), np.sort(np.abs(z[1][0])))
+    assert G.zeros is G.zeros
+    G.c = C[[0], :]
+    assert G._zeros is None
+
+
+def test_transmission_zeros_sigma():
+    from scipy.sparse import csc_matrix
+    rng = np.random.RandomState(0)
+    A, B, C = rng.randn(40, 40), rng.randn(40, 2), rng.randn(2, 40)
+    D = np.zeros((2, 2))
+    zd = transmission_zeros(A, B, C, D)
+    zd = zd[np.argsort(np.abs(zd - 0.3))][:4]
+    zs = transmission_zeros(A, B, C, D, sigma=0.3, k=4)
+    assert_almost_equal(np.abs(zs - 0.3), np.abs(zd - 0.3))
+    zs = transmission_zeros(csc_matrix(A), csc_matrix(B), csc_matrix(C), D,
+                            sigma=0.3j, k=2)
+    assert_almost_equal(np.sort(zs.imag), [-0.19219764, 0.19219764])
+    assert_raises(ValueError, transmission_zeros, A, B, C[:1, :], D[:1, :],
+                  sigma=0.)
+    # Relative degree 8 with far zeros; the infinite eigenvalues of the
+    # pencil should not show up and at most the finite zeros are returned
+    G = transfer_to_state(Transfer(np.poly([-50, -60]),
+                                   np.poly(-np.arange(1, 11))))
+    for k in (2, 5):
+        zs = transmission_zeros(*G.matrices, sigma=0., k=k)
+        assert not np.iscomplexobj(zs)
+        assert_almost_equal(zs, [-50., -60.], decimal=6)
+    G = transfer_to_state(Transfer(np.poly([-50, -60]),
+                                   np.poly(-np.arange(1, 13))))
+    assert_almost_equal(transmission_zeros(*G.matrices, sigma=0., k=3),
+                        [-50., -60.], decimal=6)
+    # No finite zeros and the dense fallback
+    G = transfer_to_state(Transfer(1, [1, 3, 3, 1]))
+    assert_equal(transmission_zeros(*G.matrices, sigma=0.).shape, (0,))
+    G = transfer_to_state(Transfer([1, 5, 6], [1, 3, 3, 1]))
+    zs = transmission_zeros(*G.matrices, sigma=0., k=6)
+    assert_almost_equal(zs, [-2., -3.])
@@ -0,0 +1,72 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import numpy as np
+from harold import (State, kalman_controllability, kalman_observability,
+                    kalman_decomposition, is_kalman_controllable,
+                    is_kalman_observable)
+from numpy.testing import assert_almost_equal, assert_array_equal
+
+
+def test_kalman_controllability_observability():
+    G = State([[2, 1, 1], [5, 3, 6], [-5, -1, -4]], [[1], [0], [0]],
+              [[1, 0, 0]], 0)
+    Cc, T, r = kalman_controllability(G)
+    assert r == 2
+    assert_array_equal(Cc, [[1, 2, 4], [0, 5, -5], [0, -5, 5]])
+    assert_almost_equal(T.T @ T, np.eye(3))
+    assert_almost_equal((T.T @ Cc)[2, :], np.zeros(3))
+    Cc_c = kalman_controllability(G, compress=True)[0]
+    assert_almost_equal(Cc_c, T.T @ Cc)
+
+    Co, T, r = kalman_observability(G)
+    assert r == 2
+    assert_array_equal(Co, [[1, 0, 0], [2, 1, 1], [4, 4, 4]])
+    assert_almost_equal((Co @ T)[:, 2], np.zeros(3))
+
+    F = kalman_decomposition(G)
+    assert_almost_equal(F.a[2, :2], [0, 0])
+    assert_almost_equal(F.b[1:, 0], [0, 0])
+
+    # No overflow issues with large powers, 50 states with ||A|| = 100
+    A = np.diag(np.arange(1, 51)*2.)
+    _, T, r = kalman_controllability((A, np.ones((50, 1))))
+    assert r > 0
+    assert_almost_equal(T.T @ T, np.eye(50))
+
+
+def test_is_kalman_controllable_observable():
+    # Distinct eigenvalues, decided by the PBH test
+    G = State(np.diag([-1., -2, -3]), [[1], [1], [0]], [[0, 1, 1]])
+    assert not is_kalman_controllable(G)
+    assert not is_kalman_observable(G)
+    assert 'eig' in G._factors
+    G = State(np.diag([-1., -2, -3]), [[1], [1], [1]], [[1, 1, 1]])
+    assert is_kalman_controllable(G)
+    assert is_kalman_observable(G)
+    # Repeated eigenvalues fall back to the rank tests
+    G = State(np.eye(3), [[1], [1], [0]], [[1, 1, 1]])
+    assert not is_kalman_controllable(G)
+    assert not is_kalman_observable(G)
+    assert is_kalman_controllable((np.eye(2), np.eye(2)))
+    assert not is_kalman_observable((np.eye(2), np.ones((1, 2))))
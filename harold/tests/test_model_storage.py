@@ -0,0 +1,69 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+
+import numpy as np
+from harold import (Transfer, State, DescriptorState, save_models,
+                    load_models)
+from numpy.testing import assert_equal, assert_array_equal, assert_raises
+
+
+def test_save_load_models(tmpdir):
+    fname = str(tmpdir.join('models.npz'))
+    models = [State(np.array([[0., 1.], [-2., -3.]]), np.array([[0.], [1.]]),
+                    np.array([[1., 0.]])),
+              Transfer([[[1, 2], [1]], [[3], [1, 0, 0]]],
+                       [[[1, 2, 3], [1, 4]], [[1, 1], [1, 2, 3]]]),
+              Transfer([1, 2], [1, 2, 3], dt=0.1),
+              State(5, dt=0.2),
+              DescriptorState(-np.eye(2), np.ones((2, 1)), np.ones((1, 2)),
+                              e=np.diag([1., 0.])),
+              Transfer([1], [1, 0.5], dt=True),
+              State(-np.eye(2), np.ones((2, 1)), np.ones((1, 2)), dt=True)]
+    save_models(fname, models)
+    assert_raises(TypeError, save_models, fname, [1])
+
+    for mmap in (False, True):
+        loaded = load_models(fname, mmap=mmap)
+        assert_equal(len(loaded), len(models))
+        for G, H in zip(models, loaded):
+            assert type(G) is type(H)
+            assert_equal(G.SamplingPeriod, H.SamplingPeriod)
+            assert_equal(G.SamplingSet, H.SamplingSet)
+            if isinstance(G, Transfer):
+                num, den = ((G.num, H.num), (G.den, H.den)) if G._isSISO \
+                    else ((sum(G.num, []), sum(H.num, [])),
+                          (sum(G.den, []), sum(H.den, [])))
+                for x, y in zip(*num):
+                    assert_array_equal(x, y)
+                for x, y in zip(*den):
+                    assert_array_equal(x, y)
+            else:
+                for x, y in zip(G.matrices, H.matrices):
+                    assert_array_equal(x, y)
+
+    H = load_models(fname, 2, mmap=True)
+    assert isinstance(H, Transfer)
+    assert_array_equal(H.den, [[1., 2., 3.]])
+    assert_equal(len(load_models(fname, [0, 3])), 2)
@@ -22,11 +22,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
-from harold import haroldgcd, haroldlcm, haroldpoly
+from harold import (haroldgcd, haroldlcm, haroldpoly, haroldpolymul,
+                    haroldpolymul_batch)
+from harold._polynomial_ops import (_pad_polynomial_matrix,
+                                    _rational_matrix_eval)
+import numpy as np
 from numpy import array, eye
 
-from numpy.testing import assert_almost_equal
-from numpy.testing import assert_raises
+from numpy.testing import assert_almost_equal, assert_equal
+from numpy.testing import assert_raises, assert_warns
 
 
 def test_haroldgcd():
@@ -49,6 +53,41 @@ def test_haroldgcd():
     assert_almost_equal(x, array([1, 2]))
 
 
+def test_haroldgcd_high_degree():
+    # Conjugate roots in an annulus, GCD of degree 6 among degree 50+
+    rng = np.random.RandomState(0)
+
+    def roots(k):
+        z = (0.5 + rng.rand(k))*np.exp(1j*np.pi*rng.rand(k))
+        return np.r_[z, z.conj()]
+
+    g = np.poly(roots(3)).real
+    a = np.convolve(g, np.poly(roots(25)).real)
+    b = np.convolve(g, np.poly(roots(24)).real)
+    x, res = haroldgcd(a, b, also_residual=True)
+    assert_almost_equal(x, g)
+    assert res < 1e-10
+    # Coprime and zero polynomials
+    x, res = haroldgcd(array([1., 3.]), array([1., 4.]), array([0.]),
+                       also_residual=True)
+    assert_almost_equal(x, array([1.]))
+    # Unreliable rank detection is not passed on as a common factor
+    g = np.poly(rng.randn(28))
+    a = np.convolve(g, np.poly(rng.randn(28)))
+    b = np.convolve(g, np.poly(rng.randn(28)))
+    x, res = assert_warns(RuntimeWarning, haroldgcd, a, b,
+                          also_residual=True)
+    assert_almost_equal(x, array([1.]))
+    # Overestimated rank deficiencies larger than the argument degrees
+    for seed, d1, d2 in ((68, 39, 26), (3, 50, 50)):
+        rng = np.random.RandomState(seed)
+        g = rng.uniform(-2, -0.1, 3)
+        a = np.poly(np.r_[g, rng.uniform(-2, -0.1, d1-3)])
+        b = np.poly(np.r_[g, rng.uniform(-2, -0.1, d2-3)])
+        x = assert_warns(RuntimeWarning, haroldgcd, a, b)
+        assert_almost_equal(x, array([1.]))
+
+
 def test_haroldlcm():
         # Test the least common multiple
         a, b = haroldlcm(array([1, 3, 0, -4]),
@@ -64,3 +103,90 @@ def test_haroldlcm():
                                  array([1., -3., -12., 20.,  48.]),
                                  array([1., -5., 1., 21., -18.])]):
             assert_almost_equal(b[ind], x)
+
+
+def test_haroldlcm_high_degree():
+    a = np.poly(-np.arange(1, 11))
+    b = np.poly(-np.arange(6, 16))
+    c = array([[2., 4.]])
+    lcm, mults = haroldlcm(a, b, c)
+    assert_almost_equal(lcm / np.poly(-np.arange(1, 16)), np.ones(16))
+    for x, y in zip((a, b, c.ravel()), mults):
+        assert_almost_equal(np.convolve(x, y) / lcm, np.ones(16))
+
+
+def test_haroldlcm_ill_conditioned():
+    # A single argument is its own LCM
+    a = np.poly(-np.arange(1, 21))
+    lcm, mults = haroldlcm(a)
+    assert_equal(lcm.size, 21)
+    assert_equal(haroldlcm(a, compute_multipliers=False).size, 21)
+    # Closely spaced roots should not miss the shared factors
+    lcm = haroldlcm(np.poly([-10.5, -9.5, -2, -0.5]),
+                    np.poly([-10.5, -9.5, -7.5, -2, -1]),
+                    compute_multipliers=False)
+    assert_almost_equal(np.sort(np.roots(lcm).real),
+                        [-10.5, -9.5, -7.5, -2, -1, -0.5])
+    rng = np.random.RandomState(0)
+    grid = -0.5*np.arange(1, 23)
+    for _ in range(20):
+        k1, k2, s = rng.randint(2, 8), rng.randint(2, 8), rng.randint(0, 4)
+        r = rng.choice(grid, k1+k2+s, replace=False)
+        lcm = haroldlcm(np.poly(r[:s+k1]), np.poly(np.r_[r[:s], r[s+k1:]]),
+                        compute_multipliers=False)
+        assert_equal(lcm.size, r.size + 1)
+    # Unverifiable LCMs fall back to a common multiple with a warning
+    a, b = np.poly(-np.arange(1, 25)), np.poly(-np.arange(10, 35))
+    lcm, mults = assert_warns(RuntimeWarning, haroldlcm, a, b)
+    assert_equal(lcm.size, 50)
+    assert_equal([x.size for x in mults], [26, 25])
+
+
+def test_rational_matrix_eval():
+    num, _ = _pad_polynomial_matrix([[[1, 2], [1]], [[3], [1, 0, 0]]])
+    den, _ = _pad_polynomial_matrix([[[1, 2, 3], [1, 4]],
+                                     [[1, 2, 3], [1, 2, 3]]])
+    s = 1j*np.logspace(-2, 3, 11)
+    r = _rational_matrix_eval(num, den, s)
+    assert_almost_equal(r[0, 0], (s+2)/(s**2+2*s+3))
+    assert_almost_equal(r[0, 1], 1/(s+4))
+    assert_almost_equal(r[1, 1], s**2/(s**2+2*s+3))
+    # High degree denominators at large s
+    den = np.poly(-np.arange(1, 31))[None, None, :]
+    r = _rational_matrix_eval(np.ones((1, 1, 1)), den, np.array([100j]))
+    assert_almost_equal(r[0, 0]*np.prod(100j + np.arange(1, 31)), 1.)
+
+
+def test_haroldpolymul_batch():
+    rng = np.random.RandomState(0)
+    a, b = rng.randn(4, 3, 100), rng.randn(3, 90)
+    for method in ('direct', 'fft', 'auto'):
+        p = haroldpolymul_batch(a, b, method=method)
+        assert p.shape == (4, 3, 189)
+        assert_almost_equal(p[2, 1], np.convolve(a[2, 1], b[1]))
+    # Product tree over many factors of different lengths
+    facs = [[1, k] for k in range(1, 8)] + [[1, 2, 5], [2]]
+    p = haroldpolymul_batch(facs)
+    assert_almost_equal(np.trim_zeros(p, 'f'),
+                        2*np.poly(list(range(-1, -8, -1)) + [-1+2j, -1-2j]))
+    assert_almost_equal(haroldpolymul(*facs),
+                        2*np.poly(list(range(-1, -8, -1)) + [-1+2j, -1-2j]))
+    assert_almost_equal(haroldpolymul([0, 2, 0], [0, 0, 0, 1, 3, 3, 1],
+                                      [0, 0.5, 0.5]), [1, 4, 6, 4, 1, 0])
+    assert_raises(ValueError, haroldpolymul_batch, a, b, method='karatsuba')
+
+
+def test_haroldpoly():
+    assert_almost_equal(haroldpoly([1, 2, 3]), [1, -6, 11, -6])
+    assert_almost_equal(haroldpoly([]), [1])
+    # Non-conjugate roots give complex coefficients
+    assert_almost_equal(haroldpoly([1j, 2]), [1, -2-1j, 2j])
+    # Many conjugate pairs are returned as exactly real
+    rng = np.random.RandomState(0)
+    z = rng.randn(50) + 1j*rng.randn(50)
+    r = np.r_[z, rng.randn(25), z.conj()]
+    p = haroldpoly(r)
+    assert p.dtype == float
+    assert p.size == 126
+    q = np.poly(r)
+    assert_almost_equal(p/np.abs(q).max(), np.real(q)/np.abs(q).max())
@@ -0,0 +1,114 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+from harold import State, StateArray, AffineState, system_norm
+from numpy.testing import (assert_equal, assert_array_equal, assert_raises,
+                           assert_almost_equal)
+
+
+def test_StateArray_Instantiations():
+    assert_raises(ValueError, StateArray, np.eye(2), np.ones((2, 1)),
+                  np.ones((1, 2)))
+    assert_raises(ValueError, StateArray, np.zeros((3, 2, 2)),
+                  np.ones((3, 3, 1)), np.ones((1, 2)))
+    G = StateArray(np.zeros((3, 2, 2)), np.ones((2, 1)), np.ones((1, 2)))
+    assert_equal(G.b.shape, (3, 2, 1))
+    assert_equal(G.d.shape, (3, 1, 1))
+    assert_equal(len(G), 3)
+    assert isinstance(G[1], State)
+    assert isinstance(G[1:], StateArray)
+    assert_equal(len(G[[0, 2]]), 2)
+
+    H = StateArray.from_models([State(-1, 1, 1), State(-2, 1, 1, 1)])
+    assert_array_equal(H.d.ravel(), [0., 1.])
+    assert_raises(ValueError, StateArray.from_models,
+                  [State(-1, 1, 1), State(np.eye(2), np.ones((2, 1)),
+                                          np.ones((1, 2)))])
+
+
+def test_StateArray_poles_and_norms():
+    np.random.seed(1234)
+    k, n, p, m = 20, 4, 2, 3
+    a = np.random.randn(k, n, n) - 3*np.eye(n)
+    b = np.random.randn(k, n, m)
+    c = np.random.randn(k, p, n)
+    G = StateArray(a, b, c)
+    assert_almost_equal(np.sort_complex(G.poles),
+                        np.sort_complex(np.linalg.eigvals(a)))
+    h2 = G.norm(p=2)
+    for x in range(k):
+        if G.isstable[x]:
+            assert_almost_equal(h2[x], system_norm(G[x], p=2))
+        else:
+            assert np.isinf(h2[x])
+
+    # Discrete time with feedthrough
+    G = StateArray(0.1*a, b, c, np.ones((p, m)), dt=0.1)
+    h2 = G.norm(p=2)
+    for x in range(k):
+        assert_almost_equal(h2[x], system_norm(G[x], p=2))
+
+    # Lightly damped resonances, peaks are known
+    zeta = np.array([0.1, 0.2, 0.3])
+    a = np.zeros((3, 2, 2))
+    a[:, 0, 1] = 1.
+    a[:, 1, 0] = -1.
+    a[:, 1, 1] = -2*zeta
+    G = StateArray(a, np.array([[0.], [1.]]), np.array([[1., 0.]]))
+    hinf, w = G.norm(p=np.inf, w=np.linspace(0.5, 1.5, 10001))
+    assert_almost_equal(hinf, 1/(2*zeta*np.sqrt(1-zeta**2)), decimal=5)
+    assert_almost_equal(w, np.sqrt(1-2*zeta**2), decimal=3)
+
+
+def test_StateArray_frequency_response():
+    G = StateArray.from_models([State(-1, 1, 1), State(-2, 1, 2, 1)])
+    fr, w = G.frequency_response(w=[0., 1.])
+    assert_equal(fr.shape, (2, 1, 1, 2))
+    assert_almost_equal(fr[:, 0, 0, :], [[1, 1/(1j+1)], [2, 2/(1j+2)+1]])
+
+
+def test_AffineState():
+    np.random.seed(1234)
+    n, p, m = 10, 2, 2
+    a0 = np.random.randn(n, n) - 5*np.eye(n)
+    a1 = np.outer(np.random.randn(n), np.random.randn(n))
+    b = np.random.randn(n, m)
+    c = np.random.randn(p, n)
+    G = AffineState([a0, a1], [b, 2*b], c)
+    assert_equal(G.NumberOfParameters, 1)
+    assert_equal(G.d.shape, (2, p, m))
+    assert_raises(ValueError, AffineState, [a0, a1], [b, b, b], c)
+
+    H = G.evaluate([0.5])
+    assert isinstance(H, State)
+    assert_almost_equal(H.a, a0 + 0.5*a1)
+    assert_almost_equal(H.b, 2*b)
+
+    theta = np.linspace(-0.1, 0.1, 7)[:, None]
+    assert_almost_equal(np.sort_complex(G.poles(theta)),
+                        np.sort_complex(G.evaluate(theta).poles))
+    w = np.logspace(-1, 1, 5)
+    assert_almost_equal(G.frequency_response(theta, w),
+                        G.evaluate(theta).frequency_response(w)[0])
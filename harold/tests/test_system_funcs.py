@@ -0,0 +1,88 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Ilhan Polat
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import numpy as np
+from harold import (staircase, cancellation_distance, minimal_realization,
+                    State, frequency_response)
+from numpy.testing import assert_array_equal, assert_almost_equal
+
+
+def test_staircase():
+    # 4 controllable and 2 uncontrollable modes, rotated with a random Q
+    rng = np.random.RandomState(5)
+    a = np.triu(rng.randn(6, 6))
+    a[:4, :4] = rng.randn(4, 4)
+    b = np.zeros((6, 2))
+    b[:4, :] = rng.randn(4, 2)
+    q = np.linalg.qr(rng.randn(6, 6))[0]
+    A, B, C = q @ a @ q.T, q @ b, rng.randn(1, 6) @ q.T
+
+    for method in ('qr', 'svd'):
+        Ah, Bh, Ch, T, k = staircase(A, B, C, compute_T=True,
+                                     block_indices=True, method=method)
+        assert_array_equal(k, [2, 2])
+        assert_almost_equal(T.T @ T, np.eye(6))
+        assert_almost_equal(T.T @ A @ T, Ah)
+        assert_almost_equal(T.T @ B, Bh)
+        assert_almost_equal(C @ T, Ch)
+        assert_almost_equal(Bh[2:, :], np.zeros((4, 2)))
+        assert_almost_equal(Ah[4:, :4], np.zeros((2, 4)))
+
+    # Observer form blocks
+    *_, k = staircase(A, B, C, form='o', block_indices=True)
+    assert_array_equal(k, [1]*6)
+
+
+def test_cancellation_distance():
+    F = np.array([[1., 2, 0], [3, 4, 0], [0, 0, 5]])
+    G = np.array([[1.], [1], [0]])
+    upper2, upper1, lower0, e_f, radius = cancellation_distance(F, G)
+    assert_almost_equal([upper2, upper1, lower0, radius], [0.]*4)
+    assert_almost_equal(e_f, 5.)
+    # Reproducible results
+    rng = np.random.RandomState(0)
+    F, G = rng.randn(5, 5), rng.randn(5, 1)
+    assert_array_equal(cancellation_distance(F, G),
+                       cancellation_distance(F, G))
+
+
+def test_minimal_realization():
+    # 5 minimal, 2 unobservable and 3 uncontrollable modes
+    rng = np.random.RandomState(7)
+    a = np.triu(rng.randn(10, 10)) - 3*np.eye(10)
+    a[:7, :7] = rng.randn(7, 7) - 4*np.eye(7)
+    a[:5, 5:7] = 0.
+    b = np.zeros((10, 2))
+    b[:7, :] = rng.randn(7, 2)
+    c = np.zeros((2, 10))
+    c[:, :5], c[:, 7:] = rng.randn(2, 5), rng.randn(2, 3)
+    q = np.linalg.qr(rng.randn(10, 10))[0]
+    A, B, C = q @ a @ q.T, q @ b, c @ q.T
+
+    Am, Bm, Cm = minimal_realization(A, B, C)
+    assert Am.shape == (5, 5)
+    w = np.array([0.1, 1., 10.])
+    assert_almost_equal(frequency_response(State(A, B, C), w)[0],
+                        frequency_response(State(Am, Bm, Cm), w)[0])
+    # Nothing to remove
+    assert minimal_realization(Am, Bm, Cm)[0].shape == (5, 5)